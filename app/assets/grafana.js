@@ -0,0 +1,51 @@
+/*
+ * Atualização do painel ao vivo (pages/grafana.py).
+ *
+ * Recebe o vetor compacto com os valores de cada linha e atualiza apenas as células cujo texto,
+ * cor ou tooltip mudaram. As demais recebem no_update e não são renderizadas novamente.
+ */
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    grafana: {
+        update_cells: function (data, texts, styles, labels) {
+            const noUpdate = window.dash_clientside.no_update;
+            const context = window.dash_clientside.callback_context;
+
+            if (!data) {
+                const skip = (values) => values.map(() => noUpdate);
+                return [skip(texts), skip(styles), skip(labels)];
+            }
+
+            // Posição de cada linha e de cada campo no vetor
+            const rows = {};
+            data.linhas.forEach((linha, i) => (rows[linha] = i));
+            const fields = {};
+            data.campos.forEach((campo, i) => (fields[campo] = i));
+            const tooltipFields = { produto: 0, parada: 1 };
+
+            const cell = (matrix, id, columns) => {
+                const row = rows[id.linha];
+                const column = columns[id.campo];
+                return row === undefined || column === undefined ? undefined : matrix[row][column];
+            };
+
+            const newTexts = context.outputs_list[0].map((output, i) => {
+                const text = cell(data.textos, output.id, fields);
+                return text === undefined || text === texts[i] ? noUpdate : text;
+            });
+
+            const newStyles = context.outputs_list[1].map((output, i) => {
+                const color = cell(data.cores, output.id, fields);
+                const current = styles[i] ? styles[i].color : undefined;
+                return !color || color === current ? noUpdate : { color: color };
+            });
+
+            const newLabels = context.outputs_list[2].map((output, i) => {
+                const label = cell(data.tooltips, output.id, tooltipFields);
+                return label === undefined || label === labels[i] ? noUpdate : label;
+            });
+
+            return [newTexts, newStyles, newLabels];
+        },
+    },
+});
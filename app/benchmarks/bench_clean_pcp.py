@@ -0,0 +1,114 @@
+"""
+Benchmark da limpeza do PCP com um semestre de batidas sintéticas.
+
+Compara a atribuição de turno anterior (apply por linha com datetime.strptime) com a leitura
+vetorizada de data, hora e turno do CleanPcpData, e confere que os turnos são iguais.
+
+Uso (a partir da pasta app):
+    python -m benchmarks.bench_clean_pcp
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from benchmarks.bench_join_data import timeit
+from pcp.backend.clean_pcp_data import CleanPcpData
+from pcp.helpers.types_pcp import (
+    MASSADA_BOLINHA,
+    MASSADA_BOLINHA_ATUALIZADA,
+    MASSADA_CHEIA,
+    MASSADA_REPROCESSO,
+)
+
+# cSpell: words usuario
+
+# Misturadoras simuladas e intervalo médio entre batidas de cada uma
+MACHINES = ["AMS001", "AMS002", "AMS003", "AMS004"]
+BATIDA_STEP = pd.Timedelta(minutes=5)
+
+# Quantidade de atropelamento de cada tipo de batida e sua proporção
+QUANTIDADES = [MASSADA_CHEIA, MASSADA_REPROCESSO, MASSADA_BOLINHA, MASSADA_BOLINHA_ATUALIZADA]
+PROPORCOES = [0.7, 0.1, 0.1, 0.1]
+
+
+def generate(days: int = 182, seed: int = 0) -> pd.DataFrame:
+    """
+    Gera batidas de massa no formato retornado pelo GetPcpData (data e hora em texto).
+    """
+
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2024-01-01")
+    steps = int(pd.Timedelta(days=days) / BATIDA_STEP)
+
+    frames = []
+    for machine in MACHINES:
+        jitter = pd.to_timedelta(rng.integers(0, 240, steps), unit="s")
+        data_hora = start + BATIDA_STEP * np.arange(steps) + jitter
+        frames.append(
+            pd.DataFrame(
+                {
+                    "Codigo_Maquina": machine,
+                    "Descricao_Maquina": f"MISTURADORA {machine[-1]}",
+                    "Quantidade_Atropelamento": rng.choice(QUANTIDADES, steps, p=PROPORCOES),
+                    "Produto": rng.choice(["MASSA PAO ALHO", "MASSA PAO DOCE"], steps),
+                    "Data_Registro": data_hora.strftime("%Y%m%d"),
+                    "Hora_Registro": data_hora.strftime("%H:%M:%S"),
+                    "Usuario_Registro": rng.choice(["000101", "000202", "000303"], steps),
+                    "Fabrica": "Fab. 1" if machine < "AMS003" else "Fab. 2",
+                }
+            )
+        )
+
+    df = pd.concat(frames, ignore_index=True)
+    return df.sort_values(by=["Data_Registro", "Codigo_Maquina", "Hora_Registro"])
+
+
+def legacy_shift(df: pd.DataFrame) -> pd.Series:
+    """
+    Atribuição de turno anterior: horário convertido para time e apply com strptime por linha.
+    """
+
+    def get_shift(time):
+        if (
+            time >= datetime.strptime("08:00:00", "%H:%M:%S").time()
+            and time < datetime.strptime("16:00:00", "%H:%M:%S").time()
+        ):
+            return "MAT"
+        if (
+            time >= datetime.strptime("16:00:00", "%H:%M:%S").time()
+            and time < datetime.strptime("23:59:59", "%H:%M:%S").time()
+        ):
+            return "VES"
+        return "NOT"
+
+    hora = pd.to_datetime(df["Hora_Registro"], format="%H:%M:%S").dt.time
+    turno = hora.apply(get_shift)
+
+    return turno
+
+
+def main() -> None:
+    """
+    Executa o benchmark para um semestre de batidas.
+    """
+
+    df = generate()
+    cleaner = CleanPcpData()
+
+    # Parse vetorizado feito pelo CleanPcpData antes das agregações
+    parse = getattr(cleaner, "_CleanPcpData__parse_registro")
+
+    legacy = legacy_shift(df)
+    new = parse(df.copy())["Turno"]
+
+    same = np.array_equal(legacy.to_numpy(), new.to_numpy())
+
+    print(f"Semestre: batidas={len(df):,} turnos iguais={same}")
+    print(f"  apply + strptime:     {timeit(lambda: legacy_shift(df)):.3f}s")
+    print(f"  parse vetorizado:     {timeit(lambda: parse(df.copy())):.3f}s")
+    print(f"  clean_massadas_data:  {timeit(lambda: cleaner.clean_massadas_data(df.copy())):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark do JoinData com dados sintéticos em escala de 1 e 4 meses.
+
+Compara o join por máquina com o merge_asof completo usado anteriormente e confere que os dois
+encontram o mesmo apontamento da IHM para cada registro da info.
+
+Uso (a partir da pasta app):
+    python -m benchmarks.bench_join_data
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+from helpers.df_schema import apply_schema
+from service.join_data import JOIN_TOLERANCE, JoinData
+
+# Máquinas simuladas e intervalo entre registros da info
+MACHINES = 14
+INFO_STEP = pd.Timedelta(minutes=1)
+
+# Proporção de registros da info que geram apontamento na IHM
+IHM_RATE = 0.03
+
+
+def generate(days: int, seed: int = 0) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Gera df_ihm e df_info limpos, ordenados por linha, data e hora como na ingestão.
+    """
+
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2024-01-01")
+    steps = int(pd.Timedelta(days=days) / INFO_STEP)
+
+    info, ihm = [], []
+    for machine in range(MACHINES):
+        jitter = pd.to_timedelta(rng.integers(-3, 4, steps), unit="s")
+        data_hora = start + INFO_STEP * np.arange(steps) + jitter
+        info.append(
+            pd.DataFrame(
+                {
+                    "fabrica": 1 + machine // 7,
+                    "linha": machine + 1,
+                    "maquina_id": f"TMF{machine + 1:03d}",
+                    "turno": np.array(["NOT", "MAT", "VES"])[data_hora.hour // 8],
+                    "status": rng.choice(["true", "false"], steps, p=[0.8, 0.2]),
+                    "contagem_total_ciclos": np.arange(steps) * 20,
+                    "contagem_total_produzido": np.arange(steps) * 18,
+                    "data_hora": data_hora,
+                }
+            )
+        )
+
+        stops = np.sort(rng.choice(steps, int(steps * IHM_RATE), replace=False))
+        offset = pd.to_timedelta(rng.integers(-150, 150, len(stops)), unit="s")
+        ihm_hora = data_hora[stops] + offset
+        ihm.append(
+            pd.DataFrame(
+                {
+                    "linha": machine + 1,
+                    "maquina_id": f"TMF{machine + 1:03d}",
+                    "motivo": rng.choice(["Ajustes", "Manutenção", "Refeição"], len(stops)),
+                    "equipamento": None,
+                    "problema": rng.choice(["Troca de Bobina", "Refeição"], len(stops)),
+                    "causa": rng.choice(["Troca de Bobina Inferior", "Refeição"], len(stops)),
+                    "os_numero": None,
+                    "operador_id": rng.integers(1000, size=len(stops)).astype(str),
+                    "s_backup": None,
+                    "data_hora": ihm_hora,
+                }
+            )
+        )
+
+    def split_data_hora(df: pd.DataFrame) -> pd.DataFrame:
+        df["data_registro"] = df["data_hora"].dt.normalize()
+        df["hora_registro"] = df["data_hora"].dt.floor("s").dt.time
+        return apply_schema(df.drop(columns="data_hora"))
+
+    return split_data_hora(pd.concat(ihm, ignore_index=True)), split_data_hora(
+        pd.concat(info, ignore_index=True)
+    )
+
+
+def legacy_join(df_ihm: pd.DataFrame, df_info: pd.DataFrame) -> pd.DataFrame:
+    """
+    Join anterior: data_hora por texto, ordenação completa e merge_asof de todas as colunas.
+    """
+
+    df_ihm = df_ihm.assign(
+        data_hora=pd.to_datetime(
+            df_ihm["data_registro"].astype(str) + " " + df_ihm["hora_registro"].astype(str)
+        )
+    )
+    df_info = df_info.assign(
+        data_hora=pd.to_datetime(
+            df_info["data_registro"].astype(str) + " " + df_info["hora_registro"].astype(str)
+        )
+    )
+
+    return pd.merge_asof(
+        df_info.sort_values(by="data_hora"),
+        df_ihm.sort_values(by="data_hora"),
+        on="data_hora",
+        by="maquina_id",
+        direction="nearest",
+        tolerance=JOIN_TOLERANCE,
+    ).sort_values(by=["linha_x", "data_registro_x", "hora_registro_x"])
+
+
+def timeit(func, repeat: int = 3) -> float:
+    """
+    Retorna o menor tempo de execução em segundos.
+    """
+
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """
+    Executa o benchmark para 1 e 4 meses.
+    """
+
+    for label, days in (("1 mês", 31), ("4 meses", 122)):
+        df_ihm, df_info = generate(days)
+
+        legacy = legacy_join(df_ihm, df_info)
+        new = JoinData(df_ihm, df_info).join_data()
+        # Compara o horário do apontamento encontrado (empates de horário podem trocar o registro)
+        same = np.array_equal(
+            legacy["hora_registro_y"].astype(str).to_numpy(),
+            new["hora_registro_ihm"].astype(str).to_numpy(),
+        )
+
+        print(f"{label}: info={len(df_info):,} ihm={len(df_ihm):,} iguais={same}")
+        print(f"  merge_asof:        {timeit(lambda: legacy_join(df_ihm, df_info)):.3f}s")
+        for workers in (1, 4):
+            elapsed = timeit(lambda: JoinData(df_ihm, df_info, max_workers=workers).join_data())
+            print(f"  JoinData ({workers} thr): {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""
+Benchmark do backend do PCP com batidas sintéticas no formato da CYV000.
+
+Mede cada etapa da atualização do PCP (PcpDataCache.cache_pcp_data): limpeza (CleanPcpData),
+análises de dia e semana, linhas de total dos turnos, visões por pasta (AnalysisPcpData) e o
+consumo de pães e pasta (AuxFuncPcp). Para cada etapa informa o menor tempo e o pico de memória.
+
+Os resultados podem ser salvos em JSON e comparados com um resultado anterior, assim duas
+implementações são comparadas com os mesmos dados (mesmos parâmetros e seed). O resultado com os
+parâmetros padrão fica em benchmarks/results/pcp_backend_baseline.json.
+
+Uso (a partir da pasta app):
+    python -m benchmarks.bench_pcp_backend
+    python -m benchmarks.bench_pcp_backend --months 12 --batidas-per-shift 40
+    python -m benchmarks.bench_pcp_backend --compare benchmarks/results/pcp_backend_baseline.json
+    python -m benchmarks.bench_pcp_backend --save benchmarks/results/pcp_backend_baseline.json
+"""
+
+import argparse
+import json
+import platform
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+from benchmarks.bench_join_data import timeit
+from pcp.backend.analysis_pcp_data import AnalysisPcpData
+from pcp.backend.clean_pcp_data import CleanPcpData
+from pcp.backend.get_pcp_data import MASSA_MACHINES, PASTA_MACHINES
+from pcp.helpers.functions_pcp import AuxFuncPcp
+from pcp.helpers.types_pcp import (
+    MASSADA_BOLINHA,
+    MASSADA_BOLINHA_ATUALIZADA,
+    MASSADA_CHEIA,
+    MASSADA_REPROCESSO,
+    PAO_POR_BANDEJA,
+)
+
+# cSpell: words usuario
+
+# Quantidade de atropelamento de cada tipo de batida de massa e sua proporção
+QUANTIDADES = [MASSADA_CHEIA, MASSADA_REPROCESSO, MASSADA_BOLINHA, MASSADA_BOLINHA_ATUALIZADA]
+PROPORCOES = [0.7, 0.1, 0.1, 0.1]
+
+# Pastas conhecidas, as demais recebem um nome sequencial (novas colunas no pivot)
+PASTAS = ["ALHO TRADICIONAL", "CEBOLA", "ALHO PICANTE", "DOCE"]
+
+# Peso de uma batida de pasta
+PESO_PASTA = 50.0
+
+# Início de cada turno em segundos (NOT, MAT, VES)
+SHIFT_STARTS = np.array([0, 8, 16]) * 3600
+SHIFT_SECONDS = 8 * 3600
+
+
+def pasta_names(products: int) -> list[str]:
+    """
+    Nomes das pastas como no Protheus (ex.: "PASTA CEBOLA ").
+    """
+
+    names = PASTAS + [f"SABOR {i}" for i in range(len(PASTAS) + 1, products + 1)]
+    return [f"PASTA {name} " for name in names[:products]]
+
+
+def generate(
+    machines: int = 4,
+    pasta_machines: int = 2,
+    batidas_per_shift: int = 30,
+    products: int = 4,
+    months: int = 6,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Gera batidas de massa e de pasta no formato retornado pelo GetPcpData.get_batidas_data
+    (data e hora em texto, na ordem da query).
+
+    Args:
+        machines (int): Quantidade de misturadoras de massa (MASSA_MACHINES).
+        pasta_machines (int): Quantidade de máquinas de pasta (PASTA_MACHINES).
+        batidas_per_shift (int): Batidas de cada máquina por turno.
+        products (int): Quantidade de pastas distintas.
+        months (int): Meses de batidas (a partir de 2024-01-01).
+        seed (int): Seed dos dados aleatórios.
+
+    Returns:
+        pd.DataFrame: As batidas, uma linha por registro da CYV000.
+    """
+
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2024-01-01")
+    days = (start + pd.DateOffset(months=months) - start).days
+    pastas = pasta_names(products)
+
+    # Horário de cada batida: dia, turno e segundo aleatório dentro do turno
+    shifts = days * len(SHIFT_STARTS)
+    shift_day = np.repeat(np.arange(days), len(SHIFT_STARTS) * batidas_per_shift)
+    shift_start = np.tile(np.repeat(SHIFT_STARTS, batidas_per_shift), days)
+
+    frames = []
+    for prefix, count in ((MASSA_MACHINES, machines), (PASTA_MACHINES, pasta_machines)):
+        for machine in range(count):
+            size = shifts * batidas_per_shift
+            seconds = shift_start + rng.integers(0, SHIFT_SECONDS, size)
+            data_hora = start + pd.to_timedelta(shift_day, unit="D") + pd.to_timedelta(seconds, "s")
+            fabrica = "Fab. 1" if machine < count / 2 else "Fab. 2"
+
+            if prefix == MASSA_MACHINES:
+                quantidade = rng.choice(QUANTIDADES, size, p=PROPORCOES)
+                produto = rng.choice(["MASSA PAO ALHO", "MASSA PAO DOCE"], size)
+            else:
+                quantidade = np.full(size, PESO_PASTA)
+                produto = rng.choice(pastas, size)
+
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "Codigo_Maquina": f"{prefix}{machine + 1:03d}",
+                        "Descricao_Maquina": f"MAQUINA {prefix} {machine + 1}",
+                        "Quantidade_Atropelamento": quantidade,
+                        "Produto": produto,
+                        "Data_Registro": data_hora.strftime("%Y%m%d"),
+                        "Hora_Registro": data_hora.strftime("%H:%M:%S"),
+                        "Usuario_Registro": rng.choice(["000101", "000202", "000303"], size),
+                        "Fabrica": fabrica,
+                    }
+                )
+            )
+
+    df = pd.concat(frames, ignore_index=True)
+    return df.sort_values(
+        by=["Data_Registro", "Codigo_Maquina", "Hora_Registro"], ignore_index=True
+    )
+
+
+def generate_caixas(df: pd.DataFrame, seed: int = 0) -> pd.DataFrame:
+    """
+    Gera as caixas por semana, produto e fábrica (CaixasStore.week) do período das batidas.
+    """
+
+    rng = np.random.default_rng(seed)
+    days = pd.to_datetime(df["Data_Registro"].unique(), format="%Y%m%d")
+
+    # Semanas iniciadas no domingo, como a dimensão calendário
+    weeks = pd.DatetimeIndex(days - pd.to_timedelta((days.dayofweek + 1) % 7, unit="D")).unique()
+
+    index = pd.MultiIndex.from_product(
+        [weeks, list(PAO_POR_BANDEJA), ["Fab. 1", "Fab. 2"]],
+        names=["Data_Semana", "PRODUTO", "FABRICA"],
+    )
+    df_caixas = index.to_frame(index=False)
+    iso = (df_caixas["Data_Semana"] + pd.Timedelta(days=1)).dt.isocalendar()
+    df_caixas["year"] = iso.year.astype(int)
+    df_caixas["week"] = iso.week.astype(int)
+    df_caixas["QTD"] = rng.integers(100, 2000, len(df_caixas))
+    df_caixas["Data_Semana"] = df_caixas["Data_Semana"].dt.strftime("%Y-%m-%d")
+
+    return df_caixas[["year", "week", "Data_Semana", "PRODUTO", "FABRICA", "QTD"]]
+
+
+def measure(func: Callable[[], object], repeat: int) -> dict:
+    """
+    Menor tempo (s) e pico de memória (MB) de uma etapa. A memória é medida em uma execução
+    separada, o tracemalloc deixa o código mais lento.
+    """
+
+    seconds = timeit(func, repeat)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": seconds, "peak_mb": peak / 2**20}
+
+
+def stages(df: pd.DataFrame, df_caixas: pd.DataFrame) -> list[tuple[str, Callable[[], object]]]:
+    """
+    Etapas da atualização do PCP, na ordem do PcpDataCache.cache_pcp_data. As entradas de cada
+    etapa são calculadas antes, assim cada medida inclui apenas a própria etapa.
+    """
+
+    clean = CleanPcpData()
+    analysis = AnalysisPcpData()
+
+    machine = df["Codigo_Maquina"].astype(str)
+    massa = df[machine.str.startswith(MASSA_MACHINES)].reset_index(drop=True)
+    pasta = df[machine.str.startswith(PASTA_MACHINES)].reset_index(drop=True)
+
+    # Massa
+    massa_cleaned = clean.clean_massadas_data(massa.copy())
+    df_sum = analysis.get_massa_sum(massa_cleaned)
+    df_week = analysis.get_week_data(df_sum)
+    df_week_total = analysis.add_shift_total(df_week, ["year", "week", "Data_Semana", "Fabrica"])
+
+    # Pasta
+    pasta_cleaned = clean.clean_pasta_data(pasta.copy())
+    df_pasta = analysis.get_pasta_analysis(pasta_cleaned)
+    df_pasta_week = analysis.get_pasta_week_analysis(df_pasta)
+    df_pasta_week_total = analysis.add_shift_total(
+        df_pasta_week, ["year", "week", "Data_Semana", "Fabrica", "Produto"]
+    )
+
+    # Consumo
+    df_paes = AuxFuncPcp.adjust_prod(df_caixas)
+
+    return [
+        ("clean_massadas_data", lambda: clean.clean_massadas_data(massa.copy())),
+        ("get_massa_sum", lambda: analysis.get_massa_sum(massa_cleaned)),
+        ("get_week_data", lambda: analysis.get_week_data(df_sum)),
+        (
+            "add_shift_total (massa)",
+            lambda: analysis.add_shift_total(df_week, ["year", "week", "Data_Semana", "Fabrica"]),
+        ),
+        ("clean_pasta_data", lambda: clean.clean_pasta_data(pasta.copy())),
+        ("get_pasta_analysis", lambda: analysis.get_pasta_analysis(pasta_cleaned)),
+        ("get_pasta_week_analysis", lambda: analysis.get_pasta_week_analysis(df_pasta)),
+        (
+            "add_shift_total (pasta)",
+            lambda: analysis.add_shift_total(
+                df_pasta_week, ["year", "week", "Data_Semana", "Fabrica", "Produto"]
+            ),
+        ),
+        ("pasta_pivot", lambda: AnalysisPcpData.pasta_pivot(df_pasta_week_total)),
+        ("adjust_prod", lambda: AuxFuncPcp.adjust_prod(df_caixas)),
+        ("get_massa_analysis", lambda: analysis.get_massa_analysis(df_week_total, df_paes)),
+        (
+            "get_pasta_consumption",
+            lambda: analysis.get_pasta_consumption(df_pasta_week_total, df_paes),
+        ),
+    ]
+
+
+def run(params: dict, repeat: int = 3) -> dict:
+    """
+    Gera os dados e mede todas as etapas.
+
+    Args:
+        params (dict): Parâmetros do generate.
+        repeat (int): Execuções de cada etapa (vale o menor tempo).
+
+    Returns:
+        dict: Parâmetros, ambiente e o resultado de cada etapa.
+    """
+
+    df = generate(**params)
+    df_caixas = generate_caixas(df, params.get("seed", 0))
+
+    results = {name: measure(func, repeat) for name, func in stages(df, df_caixas)}
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "params": params,
+        "rows": len(df),
+        "stages": results,
+    }
+
+
+def report(result: dict, baseline: dict = None) -> None:
+    """
+    Imprime o resultado de cada etapa e, com baseline, quantas vezes a etapa ficou mais rápida
+    (x1.00 = mesmo tempo, abaixo de 1 = mais lenta).
+    """
+
+    print(f"Batidas: {result['rows']:,} {result['params']}")
+
+    if baseline and baseline["params"] != result["params"]:
+        print(f"  Aviso: baseline com outros parâmetros {baseline['params']}")
+
+    total = 0.0
+    for name, stage in result["stages"].items():
+        total += stage["seconds"]
+        line = f"  {name:<26} {stage['seconds']:8.3f}s {stage['peak_mb']:9.1f} MB"
+
+        old = (baseline or {}).get("stages", {}).get(name)
+        if old:
+            line += f"   x{old['seconds'] / stage['seconds']:.2f} ({old['seconds']:.3f}s)"
+        print(line)
+
+    print(f"  {'total':<26} {total:8.3f}s")
+
+
+def main() -> None:
+    """
+    Executa o benchmark com os parâmetros da linha de comando.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--machines", type=int, default=4, help="misturadoras de massa")
+    parser.add_argument("--pasta-machines", type=int, default=2, help="máquinas de pasta")
+    parser.add_argument("--batidas-per-shift", type=int, default=30, help="batidas por turno")
+    parser.add_argument("--products", type=int, default=4, help="pastas distintas")
+    parser.add_argument("--months", type=int, default=6, help="meses de batidas")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="execuções de cada etapa")
+    parser.add_argument("--save", type=Path, help="salva o resultado em JSON")
+    parser.add_argument("--compare", type=Path, help="resultado em JSON para comparação")
+    args = parser.parse_args()
+
+    params = {
+        "machines": args.machines,
+        "pasta_machines": args.pasta_machines,
+        "batidas_per_shift": args.batidas_per_shift,
+        "products": args.products,
+        "months": args.months,
+        "seed": args.seed,
+    }
+
+    baseline = json.loads(args.compare.read_text(encoding="utf-8")) if args.compare else None
+
+    result = run(params, args.repeat)
+    report(result, baseline)
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@
 @Date: 28/02/2024
 """
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objs as go
 from dash import dcc
@@ -26,10 +27,26 @@ class Heatmap:
         self.danger = BSColorsEnum.DANGER_COLOR.value
         self.success = BSColorsEnum.SUCCESS_COLOR.value
 
+    @staticmethod
+    def __text_matrix(values: np.ndarray) -> np.ndarray:
+        """
+        Create the text matrix of the heatmap cells ("92.2%"), empty where the value is NaN.
+
+        Args:
+            values (np.ndarray): The heatmap values.
+
+        Returns:
+            np.ndarray: The formatted text of each cell.
+        """
+
+        values = values.astype(float)
+        text = np.char.mod("%.1f%%", np.nan_to_num(values) * 100)
+
+        return np.where(np.isnan(values), "", text)
+
     def create_heatmap(
         self,
         dataframe: pd.DataFrame,
-        annotations: list,
         indicator: IndicatorType,
         meta: int,
         template: str = None,
@@ -40,7 +57,6 @@ class Heatmap:
 
         Args:
             dataframe (pd.DataFrame): The data to be visualized in the heatmap.
-            annotations (list): List of annotations to be displayed on the heatmap.
             indicator (IndicatorType): The type of indicator to be visualized.
             meta (int): The meta value for the indicator.
             template (str, optional): The template to be used for the graph. Defaults to None.
@@ -99,6 +115,9 @@ class Heatmap:
                 zmax=1,
                 hoverongaps=False,
                 hovertemplate=hover_data,
+                text=self.__text_matrix(dataframe.values),
+                texttemplate="%{text}",
+                textfont=dict(size=10, color="white"),
                 showscale=False,
                 xgap=1,
                 ygap=1,
@@ -118,7 +137,6 @@ class Heatmap:
                 yaxis=dict(title="Turno", tickfont=dict(color=tick_color), ticksuffix=" "),
                 font=dict(family="Inter"),
                 margin=dict(t=40, b=40, l=40, r=40),
-                annotations=annotations,
                 template=TemplateType.LIGHT.value if not template else template.value,
                 plot_bgcolor="RGBA(0,0,0,0.01)",
             ),
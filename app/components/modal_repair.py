@@ -62,19 +62,17 @@ layout = [
     [
         Input(f"radio-items-{IndicatorType.REPAIR.value}", "value"),
         Input("store-df_repair_heatmap_tuple", "data"),
-        Input("store-annotations_repair_list_tuple", "data"),
         Input("store-df-repair", "data"),
         Input(ThemeSwitchAIO.ids.switch("theme"), "value"),
     ],
 )
-def spinner_repair(turn, df_heatmap, annotations, df_repair, toggle_theme):
+def spinner_repair(turn, df_heatmap, df_repair, toggle_theme):
     """
     Generates a card containing a heatmap and a line graph based on the provided data.
 
     Args:
         turn (str): The selected turn ('NOT', 'MAT', 'VES', 'TOT').
         df_heatmap (str): The JSON string representing the heatmap data.
-        annotations (str): The JSON string representing the annotations data.
         df_repair (str): The JSON string representing the line graph data.
         toggle_theme (bool): A flag indicating whether to use a light or dark template.
 
@@ -92,26 +90,23 @@ def spinner_repair(turn, df_heatmap, annotations, df_repair, toggle_theme):
     # ---------Heatmap--------- #
     # Carrega o string json em uma lista
     list_heat_json = json.loads(df_heatmap)
-    list_ann_json = json.loads(annotations)
 
-    # Converte o string json em um dataframe e um dicionário
+    # Converte o string json em um dataframe
     df_tuple = [pd.read_json(StringIO(x), orient="split") for x in list_heat_json]
-    ann_tuple = [json.loads(x) for x in list_ann_json]
 
     # Converte em tuplas e desempacota
     noturno, matutino, vespertino, total, _ = tuple(df_tuple)
-    ann_noturno, ann_matutino, ann_vespertino, ann_total, _ = tuple(ann_tuple)
 
-    # Cria um dicionário com os dataframes e as anotações
+    # Cria um dicionário com os dataframes
     repair_heatmap_dict = {
-        "NOT": (noturno, ann_noturno),
-        "MAT": (matutino, ann_matutino),
-        "VES": (vespertino, ann_vespertino),
-        "TOT": (total, ann_total),
+        "NOT": noturno,
+        "MAT": matutino,
+        "VES": vespertino,
+        "TOT": total,
     }
 
-    # Seleciona o dataframe e as anotações com base no turno
-    df_heatmap, annotations = repair_heatmap_dict[turn]
+    # Seleciona o dataframe com base no turno
+    df_heatmap = repair_heatmap_dict[turn]
 
     # ---------Line--------- #
     # Carrega o string json em um dataframe
@@ -123,7 +118,7 @@ def spinner_repair(turn, df_heatmap, annotations, df_repair, toggle_theme):
 
     return dbc.Card(
         [
-            hm.create_heatmap(df_heatmap, annotations, IndicatorType.REPAIR, 4, template, turn),
+            hm.create_heatmap(df_heatmap, IndicatorType.REPAIR, 4, template, turn),
             lg.create_line_graph(df_line, IndicatorType.REPAIR, 4, template, turn),
         ],
         class_name="p-1",
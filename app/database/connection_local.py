@@ -56,3 +56,17 @@ class ConnectionLocal:
             None
         """
         df.to_sql(table_name, self._conn, if_exists="append", index=False)
+
+    def execute(self, query: str, params: tuple = ()):
+        """
+        Executa uma instrução SQL (ex.: DELETE) e confirma a transação.
+
+        Args:
+            query (str): A instrução SQL a ser executada.
+            params (tuple, optional): Os parâmetros da instrução.
+
+        Returns:
+            None
+        """
+        self._conn.execute(query, params)
+        self._conn.commit()
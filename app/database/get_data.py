@@ -370,23 +370,17 @@ class GetData:
         return df
 
     # cSpell: words fabr emissao hrrpbg ccca nrrpet cdmq codbem usuario usrf
-    def get_protheus_caixas_data(self) -> pd.DataFrame:
+    def get_protheus_caixas_data(self, since: str) -> pd.DataFrame:
         """
         Retrieves data from the Protheus system for caixas.
 
+        Args:
+            since (str): Primeiro dia lido (D3_EMISSAO, YYYYMMDD).
+
         Returns:
-            pandas.DataFrame: The retrieved data from the Protheus system.
+            pandas.DataFrame: The retrieved data from the Protheus system (None on error).
         """
 
-        # Dia de hoje
-        now = pd.to_datetime("today")
-
-        # Encontrando primeiro dia do mês atual
-        first_day = now.replace(day=1)
-
-        # Mantendo apenas a data no formato yyyymmdd
-        first_day = first_day.strftime("%Y%m%d")
-
         query = self.db_read.create_totvsdb_query(
             select=(
                 "T9_NOME AS MAQUINA, "
@@ -418,16 +412,14 @@ class GetData:
             ),
             where=(
                 "D3_FILIAL = '0101' AND D3_LOCAL='CF' AND B1_TIPO = 'PA' AND D3_CF = 'PR0' "
-                "AND D3_ESTORNO <> 'S' AND D3_EMISSAO >= '20240101' AND SD3.D_E_L_E_T_<>'*'"
+                f"AND D3_ESTORNO <> 'S' AND D3_EMISSAO >= '{since}' AND SD3.D_E_L_E_T_<>'*'"
             ),
             orderby="D3_EMISSAO DESC, CYV_HRRPBG DESC",
         )
 
+        # None se a leitura falhar, a leitura incremental pode não ter registros novos
         df = self.db_read.get_totvsdb_data(query)
 
-        if df.empty:
-            raise ValueError("* --> Erro na leitura dos dados do DB TOTVSDB.")
-
         return df
 
     def get_protheus_total_caixas(self) -> pd.DataFrame:
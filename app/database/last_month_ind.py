@@ -10,6 +10,7 @@ import numpy as np
 import pandas as pd
 from database.connection_local import ConnectionLocal
 from database.get_data import GetData
+from helpers.df_schema import apply_schema, drop_categories
 from service.data_analysis import DataAnalysis
 
 
@@ -106,6 +107,7 @@ class LastMonthInd:
         # ====================== Top 5 Motivos De Paradas E Seu Tempo Total ====================== #
 
         # Se motivo nome for null, substitui por "Motivo não apontado"
+        df_stops = drop_categories(df_stops, ["motivo", "problema"])
         df_stops["motivo"] = df_stops["motivo"].fillna("Não apontado")
         df_stops["problema"] = df_stops["problema"].fillna("Não apontado")
 
@@ -153,4 +155,9 @@ class LastMonthInd:
             df_working = conn.get_query("SELECT * FROM time_working")
             df_prod = conn.get_query("SELECT * FROM info_production_cleaned")
 
+        # O DB local guarda texto, reaplica os tipos compactos
+        df_stops = apply_schema(df_stops)
+        df_working = apply_schema(df_working)
+        df_prod = apply_schema(df_prod)
+
         return df_stops, df_working, df_prod
@@ -7,27 +7,35 @@ Este módulo cria um cache para armazenar os dados do banco de dados.
 
 import json
 from threading import Lock
+from time import time
 
-import numpy as np
 import pandas as pd
 from database.get_data import GetData
 from flask_caching import Cache
 from helpers.my_types import IndicatorType
 from helpers.path_config import DF_CAIXAS
-from service.data_analysis import DataAnalysis
+from service.caixas_store import CaixasStore
 from service.df_for_indicators import DFIndicators
-
-
-class MyEncoder(json.JSONEncoder):
-    """
-    Classe que codifica objetos para JSON.
-    """
-
-    def default(self, o):
-        # if isinstance(o, np.int64) or isinstance(o, np.int32):
-        if isinstance(o, (np.int64, np.int32)):
-            return int(o)
-        return super(MyEncoder, self).default(o)
+from service.indicator_store import IndicatorStore
+
+# Store do layout que recebe cada chave do cache
+CACHE_STORES = {
+    "df1": "store-info",
+    "df2": "store-prod",
+    "df_eff": "store-df-eff",
+    "df_perf": "store-df-perf",
+    "df_repair": "store-df-repair",
+    "df_eff_heatmap_tuple": "store-df_eff_heatmap_tuple",
+    "df_perf_heatmap_tuple": "store-df_perf_heatmap_tuple",
+    "df_repair_heatmap_tuple": "store-df_repair_heatmap_tuple",
+    "df_working_time": "store-df_working_time",
+    "df_caixas_cf": "store-df-caixas-cf",
+    "df_caixas_cf_tot": "store-df-caixas-cf-tot",
+    "df_info_pure": "store-df-info-pure",
+}
+
+# Chave com a versão dos dados, muda a cada atualização do cache
+CACHE_VERSION_KEY = "cache_version"
 
 
 class CacheManager:
@@ -58,18 +66,6 @@ class CacheManager:
         """
         return [df.to_json(date_format="iso", orient="split") for df in df_tuple]
 
-    def _tuple_list_to_list(self, tuple_list: tuple) -> list[str]:
-        """
-        Função que transforma um tuple de listas de Dict em uma lista de strings JSON.
-
-        Args:
-            tuple_list (tuple): O tuple contendo as listas de Dict a serem transformadas.
-
-        Returns:
-            list[str]: A lista de strings JSON resultante da transformação.
-        """
-        return [json.dumps(lst, cls=MyEncoder) for lst in tuple_list]
-
 
 class MainDataCache(CacheManager):
     """
@@ -92,6 +88,8 @@ class MainDataCache(CacheManager):
             app: Instância da aplicação Flask.
         """
         self.__get_data = GetData()
+        self.__indicator_store = IndicatorStore()
+        self.__caixas_store = CaixasStore(self.__get_data.get_protheus_caixas_data)
         self.__lock = Lock()
         super().__init__(app)
 
@@ -110,22 +108,34 @@ class MainDataCache(CacheManager):
         Agiliza o carregamento dos dados na aplicação.
         """
         with self.__lock:
+            # Versão lida antes dos dados, para não congelar turnos invalidados durante a leitura
+            store_version = IndicatorStore.version
+
             df1, df2, df_working_time, df_info_pure = self.__get_data.get_cleaned_data()
-            df_caixas_cf = self.__get_data.get_protheus_caixas_data()
+            # Caixas por dia e turno (gerenciamento) e por semana (PCP)
+            df_caixas_cf, df_caixas_week = self.__caixas_store.load()
             df_caixas_cf_tot = pd.read_csv(DF_CAIXAS, index_col=0)
 
             # Criar dataframes auxiliares com os df do banco de dados
-            df_ind = DFIndicators(df1, df2)
-            analysis = DataAnalysis(df1, df2)
+            df_ind = DFIndicators(df1, df2, self.__indicator_store)
+            analysis = df_ind.data_analysis
             df_eff = analysis.get_eff_data()
             df_perf = analysis.get_perf_data()
             df_repair = analysis.get_repair_data()
+
+            # Congela os turnos encerrados
+            self.__indicator_store.save(
+                {
+                    IndicatorType.EFFICIENCY: df_eff,
+                    IndicatorType.PERFORMANCE: df_perf,
+                    IndicatorType.REPAIR: df_repair,
+                },
+                store_version,
+                analysis.get_source_fingerprint(),
+            )
             df_eff_heatmap_tuple = df_ind.get_heatmap_data(IndicatorType.EFFICIENCY)
-            annotations_eff_list_tuple = df_ind.get_annotations(IndicatorType.EFFICIENCY)
             df_perf_heatmap_tuple = df_ind.get_heatmap_data(IndicatorType.PERFORMANCE)
-            annotations_perf_list_tuple = df_ind.get_annotations(IndicatorType.PERFORMANCE)
             df_repair_heatmap_tuple = df_ind.get_heatmap_data(IndicatorType.REPAIR)
-            annotations_repair_list_tuple = df_ind.get_annotations(IndicatorType.REPAIR)
 
             # Atualizar o cache
             self.cache.set("df1", df1.to_json(date_format="iso", orient="split"))
@@ -136,6 +146,9 @@ class MainDataCache(CacheManager):
                 "df_working_time", df_working_time.to_json(date_format="iso", orient="split")
             )
             self.cache.set("df_caixas_cf", df_caixas_cf.to_json(date_format="iso", orient="split"))
+            self.cache.set(
+                "df_caixas_week", df_caixas_week.to_json(date_format="iso", orient="split")
+            )
             self.cache.set(
                 "df_caixas_cf_tot", df_caixas_cf_tot.to_json(date_format="iso", orient="split")
             )
@@ -147,21 +160,12 @@ class MainDataCache(CacheManager):
             self.cache.set(
                 "df_eff_heatmap_tuple", json.dumps(self._tuple_to_list(df_eff_heatmap_tuple))
             )
-            self.cache.set(
-                "annotations_eff_list_tuple",
-                json.dumps(self._tuple_list_to_list(annotations_eff_list_tuple)),
-            )
             self.cache.set(
                 "df_perf_heatmap_tuple", json.dumps(self._tuple_to_list(df_perf_heatmap_tuple))
             )
-            self.cache.set(
-                "annotations_perf_list_tuple",
-                json.dumps(self._tuple_list_to_list(annotations_perf_list_tuple)),
-            )
             self.cache.set(
                 "df_repair_heatmap_tuple", json.dumps(self._tuple_to_list(df_repair_heatmap_tuple))
             )
-            self.cache.set(
-                "annotations_repair_list_tuple",
-                json.dumps(self._tuple_list_to_list(annotations_repair_list_tuple)),
-            )
+
+            # Nova versão, as abas recarregam os stores na próxima vez que forem abertas
+            self.cache.set(CACHE_VERSION_KEY, time())
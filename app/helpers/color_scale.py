@@ -0,0 +1,90 @@
+"""
+Módulo com a escala de cores do vermelho ao verde (RdYlGn) usada nos dados ao vivo.
+
+A escala é uma tabela com 256 cores em hexadecimal, gerada a partir do colormap RdYlGn do
+matplotlib (python -m helpers.color_scale). Em execução o matplotlib não é importado e a cor de
+cada valor é apenas uma indexação na tabela.
+"""
+
+import numpy as np
+
+# Cor dos valores inválidos (NaN), igual à cor "bad" do matplotlib
+NAN_COLOR = "#000000"
+
+# Tabela RdYlGn com 256 cores, do vermelho (0) ao verde (255)
+# fmt: off
+COLOR_LUT = np.array([
+    "#a50026", "#a60126", "#a80326", "#aa0526", "#ac0726", "#ae0926", "#b00b26", "#b20d26",
+    "#b40f26", "#b61026", "#b81226", "#ba1426", "#bc1626", "#be1826", "#c01a26", "#c21c26",
+    "#c41e26", "#c62026", "#c82126", "#ca2326", "#cc2526", "#ce2726", "#d02926", "#d22b26",
+    "#d42d26", "#d62f26", "#d73127", "#d83328", "#d93529", "#da382a", "#dc3a2b", "#dd3d2d",
+    "#de3f2e", "#df412f", "#e04430", "#e14631", "#e24932", "#e44b33", "#e54d34", "#e65035",
+    "#e75236", "#e85538", "#e95739", "#ea593a", "#ec5c3b", "#ed5e3c", "#ee613d", "#ef633e",
+    "#f0653f", "#f16840", "#f26a41", "#f46d43", "#f46f44", "#f47245", "#f57446", "#f57747",
+    "#f57948", "#f67c4a", "#f67e4b", "#f6814c", "#f7834d", "#f7864e", "#f7894f", "#f88b51",
+    "#f88e52", "#f89053", "#f99354", "#f99555", "#fa9856", "#fa9a58", "#fa9d59", "#fb9f5a",
+    "#fba25b", "#fba55c", "#fca75e", "#fcaa5f", "#fcac60", "#fdae61", "#fdb063", "#fdb265",
+    "#fdb466", "#fdb668", "#fdb86a", "#fdba6b", "#fdbc6d", "#fdbe6e", "#fdc070", "#fdc272",
+    "#fdc473", "#fdc675", "#fdc877", "#fdca78", "#fdcc7a", "#fdce7c", "#fdd07d", "#fdd27f",
+    "#fdd481", "#fdd682", "#fdd884", "#fdda86", "#fddc87", "#fdde89", "#fee08b", "#fee18d",
+    "#fee28f", "#fee391", "#fee493", "#fee695", "#fee797", "#fee899", "#fee99b", "#feea9d",
+    "#feec9f", "#feeda1", "#feeea3", "#feefa5", "#fef1a7", "#fef2a9", "#fef3ab", "#fef4ad",
+    "#fef5af", "#fef7b1", "#fef8b3", "#fef9b5", "#fefab7", "#fefbb9", "#fefdbb", "#fefebd",
+    "#fefebd", "#fcfebb", "#fbfdb9", "#f9fcb7", "#f8fcb5", "#f6fbb3", "#f5fab1", "#f3faaf",
+    "#f2f9ad", "#f0f9ab", "#eff8a9", "#edf7a7", "#ecf7a5", "#eaf6a3", "#e9f5a1", "#e7f59f",
+    "#e6f49d", "#e4f49b", "#e3f399", "#e1f297", "#e0f295", "#def193", "#ddf091", "#dbf08f",
+    "#daef8d", "#d9ef8b", "#d7ee89", "#d5ed88", "#d3ec87", "#d1eb85", "#cfea84", "#cde983",
+    "#cbe881", "#c9e880", "#c7e77f", "#c5e67e", "#c3e57c", "#c1e47b", "#bfe37a", "#bde278",
+    "#bbe277", "#b9e176", "#b7e075", "#b5df73", "#b3de72", "#b1dd71", "#afdc6f", "#addc6e",
+    "#abdb6d", "#a9da6b", "#a7d96a", "#a4d869", "#a2d769", "#9fd669", "#9dd569", "#9ad468",
+    "#98d268", "#95d168", "#93d067", "#90cf67", "#8ece67", "#8bcd67", "#89cc66", "#86cb66",
+    "#84ca66", "#81c966", "#7fc765", "#7cc665", "#7ac565", "#77c464", "#75c364", "#72c264",
+    "#70c164", "#6dc063", "#6bbf63", "#68be63", "#66bd63", "#63bb62", "#60ba61", "#5db860",
+    "#5ab760", "#57b55f", "#54b45e", "#51b25d", "#4eb15d", "#4baf5c", "#48ae5b", "#45ad5a",
+    "#42ab5a", "#3faa59", "#3ca858", "#39a757", "#36a557", "#33a456", "#30a255", "#2da154",
+    "#2a9f54", "#279e53", "#249d52", "#219b51", "#1e9a51", "#1b9850", "#19974f", "#18954e",
+    "#17934d", "#16914c", "#158f4b", "#148d4a", "#138b49", "#128948", "#118847", "#108646",
+    "#0f8445", "#0e8244", "#0d8043", "#0c7e42", "#0b7c41", "#0a7a40", "#09783f", "#08773e",
+    "#07753d", "#06733c", "#05713b", "#046f3a", "#036d39", "#026b38", "#016937", "#006837",
+])
+# fmt: on
+
+
+def value_colors(values, max_value: float) -> np.ndarray:
+    """
+    Retorna a cor de cada valor, normalizado pelo valor máximo.
+    Valores abaixo de 0 ficam vermelhos e acima do máximo ficam verdes.
+
+    Args:
+        values (array-like): Os valores.
+        max_value (float): O valor máximo possível.
+
+    Returns:
+        np.ndarray: Array com a cor hexadecimal de cada valor.
+    """
+
+    normalized = np.asarray(values, dtype=float) / max_value
+    nan = np.isnan(normalized)
+
+    index = np.floor(np.where(nan, 0, normalized) * len(COLOR_LUT))
+    index = np.clip(index, 0, len(COLOR_LUT) - 1).astype(int)
+
+    return np.where(nan, NAN_COLOR, COLOR_LUT[index])
+
+
+def _generate_lut() -> list[str]:
+    # pylint: disable=C0415
+    import matplotlib.pyplot as plt
+
+    cmap = plt.get_cmap("RdYlGn", 256)
+    rgba = cmap(np.arange(cmap.N))
+
+    return [f"#{int(r * 255):02x}{int(g * 255):02x}{int(b * 255):02x}" for r, g, b, _ in rgba]
+
+
+if __name__ == "__main__":
+    # Imprime a tabela para atualizar COLOR_LUT
+    lut = _generate_lut()
+    for start in range(0, len(lut), 8):
+        end = start + 8
+        print("    " + " ".join(f'"{color}",' for color in lut[start:end]))
@@ -0,0 +1,204 @@
+"""
+Módulo com o schema de tipos dos DataFrames de paradas, produção e informações das máquinas.
+
+Colunas de texto com poucos valores distintos (turno, status, motivo...) são convertidas para
+categorias e colunas numéricas pequenas (linha, fábrica, contadores) para inteiros compactos.
+Isso reduz a memória ocupada pelos DataFrames mantidos em memória (ex.: df_big do histórico) e
+agiliza groupby/isin.
+"""
+
+# cSpell: words equipamento reducao
+import logging
+
+import pandas as pd
+
+TURNOS = ["NOT", "MAT", "VES"]
+
+# Turno tem categorias fixas, assim os códigos são iguais em todos os DataFrames e os merges
+# por turno não precisam converter para texto
+TURNO_DTYPE = pd.CategoricalDtype(TURNOS)
+
+# Colunas de texto que se repetem muito
+CATEGORY_COLUMNS = [
+    "turno",
+    "status",
+    "motivo",
+    "equipamento",
+    "problema",
+    "causa",
+    "maquina_id",
+]
+
+# Colunas numéricas pequenas (linha vai de 1 a 14, fábrica 1 ou 2)
+SMALL_INT_COLUMNS = ["linha", "fabrica"]
+
+# Contadores de ciclos e produção
+COUNTER_COLUMNS = [
+    "contagem_total_ciclos",
+    "contagem_total_produzido",
+    "total_ciclos",
+    "total_produzido",
+    "total_produzido_sensor",
+    "bdj_vazias",
+    "bdj_retrabalho",
+]
+
+logger = logging.getLogger(__name__)
+
+
+def _to_int(series: pd.Series, dtype: str) -> pd.Series:
+    """
+    Converte uma série numérica para o inteiro informado.
+    Usa o inteiro nulo do pandas (ex.: Int8) caso existam valores nulos.
+    Se a série não for numérica inteira, é retornada sem alterações.
+    """
+
+    numeric = pd.to_numeric(series, errors="coerce")
+
+    # Valores não numéricos ou com casas decimais não são convertidos
+    if numeric.notna().sum() != series.notna().sum() or (numeric.dropna() % 1 != 0).any():
+        return series
+
+    if numeric.isna().any():
+        return numeric.astype(dtype.capitalize())
+
+    return numeric.astype(dtype)
+
+
+def _apply_categories(df: pd.DataFrame) -> None:
+    """
+    Converte as colunas de texto que se repetem para categorias (turno com categorias fixas).
+    """
+
+    for column in CATEGORY_COLUMNS:
+        if column not in df.columns or isinstance(df[column].dtype, pd.CategoricalDtype):
+            continue
+
+        df[column] = df[column].astype(TURNO_DTYPE if column == "turno" else "category")
+
+
+def _apply_small_ints(df: pd.DataFrame) -> None:
+    """
+    Converte linha e fábrica para int8 (ou categoria quando vêm como texto).
+    """
+
+    for column in SMALL_INT_COLUMNS:
+        if column not in df.columns:
+            continue
+
+        # Fábrica pode vir como texto (ex.: 'Fab. 1')
+        df[column] = _to_int(df[column], "int8")
+        if df[column].dtype == object:
+            df[column] = df[column].astype("category")
+
+
+def _apply_counters(df: pd.DataFrame) -> None:
+    """
+    Converte os contadores de ciclos e produção para int32.
+    """
+
+    for column in COUNTER_COLUMNS:
+        if column in df.columns:
+            df[column] = _to_int(df[column], "int32")
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aplica o schema de tipos ao DataFrame.
+
+    Apenas as colunas presentes no DataFrame são convertidas, então pode ser usado em qualquer
+    etapa do pipeline (limpeza, junção, dados do DB local).
+
+    Args:
+        df (pd.DataFrame): O DataFrame a ser convertido.
+
+    Returns:
+        pd.DataFrame: O DataFrame com os tipos compactos.
+    """
+
+    df = df.copy()
+
+    _apply_categories(df)
+    _apply_small_ints(df)
+    _apply_counters(df)
+
+    return df
+
+
+def drop_categories(df: pd.DataFrame, columns: list[str] = None) -> pd.DataFrame:
+    """
+    Converte as colunas categóricas de volta para texto.
+
+    Usado antes de preencher valores que não existem nas categorias (ex.: "Não apontado"),
+    normalmente já nos dados filtrados para exibição.
+
+    Args:
+        df (pd.DataFrame): O DataFrame a ser convertido.
+        columns (list[str], optional): As colunas a converter. Padrão: todas as categóricas.
+
+    Returns:
+        pd.DataFrame: O DataFrame sem colunas categóricas.
+    """
+
+    columns = [
+        col
+        for col in (columns or df.columns)
+        if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype)
+    ]
+
+    if not columns:
+        return df
+
+    df = df.copy()
+
+    for column in columns:
+        df[column] = df[column].astype(object).where(df[column].notna(), None)
+
+    return df
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compara a memória ocupada por coluna antes e depois da aplicação do schema.
+
+    Args:
+        before (pd.DataFrame): O DataFrame original.
+        after (pd.DataFrame): O DataFrame com o schema aplicado.
+
+    Returns:
+        pd.DataFrame: Tabela com as colunas antes_kb, depois_kb, tipo e reducao.
+    """
+
+    report = pd.DataFrame(
+        {
+            "antes_kb": before.memory_usage(deep=True, index=False) / 1024,
+            "depois_kb": after.memory_usage(deep=True, index=False) / 1024,
+            "tipo": after.dtypes.astype(str),
+        }
+    )
+
+    report.loc["Total"] = [report["antes_kb"].sum(), report["depois_kb"].sum(), ""]
+    report["reducao"] = (1 - report["depois_kb"] / report["antes_kb"]).round(3)
+
+    return report.round({"antes_kb": 1, "depois_kb": 1})
+
+
+def log_memory_report(name: str, before: pd.DataFrame, after: pd.DataFrame) -> None:
+    """
+    Registra no log a memória total antes e depois da aplicação do schema.
+
+    Args:
+        name (str): Nome do DataFrame, usado na mensagem.
+        before (pd.DataFrame): O DataFrame original.
+        after (pd.DataFrame): O DataFrame com o schema aplicado.
+    """
+
+    total = memory_report(before, after).loc["Total"]
+
+    logger.info(
+        "Schema %s: %.1f kB -> %.1f kB (redução de %.1f%%)",
+        name,
+        total["antes_kb"],
+        total["depois_kb"],
+        total["reducao"] * 100,
+    )
@@ -0,0 +1,85 @@
+"""
+Módulo com a normalização dos dados de descarte da qualidade.
+
+Os pesos de bandejas vazias e retrabalho são convertidos em quantidade de bandejas em uma única
+passada vetorizada e o turno é obtido pela hora do registro em segundos, sem apply por linha.
+O mesmo módulo define as colunas usadas no merge com a produção.
+"""
+
+# cSpell: words descarte, paes, retrabalho, vazias
+import numpy as np
+import pandas as pd
+from helpers.my_types import PESO_BANDEJAS, PESO_SACO
+from helpers.shift_clock import seconds_of_day, shift_of_seconds
+
+# Colunas com o peso das bandejas (kg), convertidas em quantidade de bandejas
+TRAY_COLUMNS = ["bdj_vazias", "bdj_retrabalho"]
+
+# Colunas com o peso dos descartes (kg)
+WEIGHT_COLUMNS = ["descarte_paes_pasta", "descarte_paes", "descarte_pasta"]
+
+# Chaves do descarte por turno, usadas também no merge com a produção
+DISCARD_KEYS = ["linha", "maquina_id", "data_registro", "turno"]
+
+
+def trays_from_weight(weight: pd.Series) -> np.ndarray:
+    """
+    Converte o peso das bandejas em quantidade de bandejas.
+    Desconta o peso do saco, arredonda e limita em 0 (pesos zerados ou negativos viram 0).
+
+    Args:
+        weight (pd.Series): Peso em kg.
+
+    Returns:
+        np.ndarray: Quantidade de bandejas (int).
+    """
+
+    weight = weight.to_numpy(dtype=float).round(3)
+    trays = np.where(weight > 0, np.round((weight - PESO_SACO) / PESO_BANDEJAS), 0)
+
+    return np.maximum(trays, 0).astype(int)
+
+
+def normalize_discard(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normaliza os registros de descarte e soma por linha, máquina, data e turno.
+
+    Args:
+        df (pd.DataFrame): Registros de descarte como lidos do banco.
+
+    Returns:
+        pd.DataFrame: Descarte por turno com as bandejas em quantidade e os pesos em kg.
+    """
+
+    data = {key: df[key].to_numpy() for key in DISCARD_KEYS if key != "turno"}
+    data["turno"] = shift_of_seconds(seconds_of_day(df["hora_registro"]))
+
+    for column in TRAY_COLUMNS:
+        data[column] = trays_from_weight(df[column])
+
+    for column in WEIGHT_COLUMNS:
+        data[column] = df[column].to_numpy(dtype=float).round(3)
+
+    return pd.DataFrame(data).groupby(DISCARD_KEYS).sum().round(3).reset_index()
+
+
+def attach_discard(df_production: pd.DataFrame, df_discard: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adiciona as bandejas descartadas à produção de cada turno.
+    Apenas as colunas de bandejas entram no merge e só elas são preenchidas com 0 quando o turno
+    não tem descarte.
+
+    Args:
+        df_production (pd.DataFrame): Produção por turno.
+        df_discard (pd.DataFrame): Descarte por turno (normalize_discard).
+
+    Returns:
+        pd.DataFrame: A produção com as colunas de bandejas.
+    """
+
+    df = df_production.merge(df_discard[DISCARD_KEYS + TRAY_COLUMNS], on=DISCARD_KEYS, how="left")
+
+    for column in TRAY_COLUMNS:
+        df[column] = df[column].fillna(0).astype("int32")
+
+    return df
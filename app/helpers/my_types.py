@@ -2,11 +2,9 @@
 Modulo com tipos de dados utilizados na aplicação.
 """
 
-# cSpell: words eficiencia cmap
+# cSpell: words eficiencia
 from enum import Enum
 
-import matplotlib.pyplot as plt
-
 CICLOS_ESPERADOS = 10.6
 TEMPO_AJUSTE = 10
 PESO_BANDEJAS = 0.028
@@ -114,34 +112,3 @@ GRID_FORMAT_NUMBER_BR = {
         "function": "params.value.toLocaleString('pt-BR')",
     },
 }
-
-
-# Usado nos dados ao vivo do 'grafana'
-def get_color(value, max_value):
-    """
-    Retorna uma cor hexadecimal com base no valor fornecido e no valor máximo.
-        Cor varia do vermelho ao verde.
-
-    Parâmetros:
-    value (float): O valor para o qual a cor será calculada.
-    max_value (float): O valor máximo possível.
-
-    Retorna:
-    str: Uma cor hexadecimal correspondente ao valor fornecido.
-    """
-
-    # Cria um mapa de cores que vai do vermelho ao verde
-    cmap = plt.get_cmap("RdYlGn")
-
-    # Normaliza o valor para um número entre 0 e 1
-    normalized_value = float(value) / max_value
-
-    # Obtém a cor correspondente do mapa de cores
-    rgba_color = cmap(normalized_value)
-
-    # Converte a cor RGBA para uma string de cor hexadecimal
-    hex_color = (
-        f"#{int(rgba_color[0]*255):02x}{int(rgba_color[1]*255):02x}{int(rgba_color[2]*255):02x}"
-    )
-
-    return hex_color
@@ -0,0 +1,136 @@
+"""
+Módulo com o scheduler único das atualizações em background.
+
+Os módulos registram os seus jobs neste scheduler e o main o inicia uma única vez.
+
+As atualizações que leem os bancos e gravam no cache (refresh_job) rodam uma de cada vez, com o
+tempo de cada execução registrado. Um job pode depender de outro (run_after) e rodar logo após
+cada execução dele, assim lê os dados que ele acabou de gravar.
+"""
+
+import logging
+from datetime import datetime
+from threading import Lock
+from time import perf_counter
+from typing import Callable
+
+from apscheduler.schedulers.background import BackgroundScheduler
+
+scheduler = BackgroundScheduler()
+
+# Atualizações do cache não rodam ao mesmo tempo (mesmo banco e mesmo cache)
+refresh_lock = Lock()
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Jobs executados logo após cada execução de um job
+_dependents: dict[str, list[str]] = {}
+
+
+class JobMetrics:
+    """
+    Tempo das execuções de um job.
+
+    Attributes:
+        runs (int): Quantidade de execuções.
+        failures (int): Quantidade de execuções com erro.
+        last_run (datetime): Início da última execução.
+        last_seconds (float): Duração da última execução.
+        max_seconds (float): Maior duração.
+        total_seconds (float): Soma das durações.
+    """
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.failures = 0
+        self.last_run = None
+        self.last_seconds = 0.0
+        self.max_seconds = 0.0
+        self.total_seconds = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        """Duração média das execuções."""
+        return self.total_seconds / self.runs if self.runs else 0.0
+
+    def record(self, start: datetime, seconds: float, failed: bool) -> None:
+        """
+        Registra uma execução.
+
+        Args:
+            start (datetime): Início da execução.
+            seconds (float): Duração da execução.
+            failed (bool): Se a execução terminou com erro.
+        """
+
+        self.runs += 1
+        self.failures += failed
+        self.last_run = start
+        self.last_seconds = seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.total_seconds += seconds
+
+
+# Métricas de cada job de atualização
+job_metrics: dict[str, JobMetrics] = {}
+
+
+def run_after(job_id: str, dependent_id: str) -> None:
+    """
+    Agenda o job dependent_id para rodar logo após cada execução do job job_id (refresh_job),
+    inclusive quando job_id é chamado fora do scheduler (ex.: na inicialização).
+
+    Args:
+        job_id (str): Id do job do qual o outro depende.
+        dependent_id (str): Id do job dependente, já registrado no scheduler.
+    """
+
+    _dependents.setdefault(job_id, []).append(dependent_id)
+
+
+def refresh_job(job_id: str, func: Callable[[], None]) -> Callable[[], None]:
+    """
+    Cria a função de um job de atualização: roda func com o refresh_lock (sem sobreposição com
+    as demais atualizações), registra o tempo em job_metrics e agenda os jobs dependentes.
+    Erros são registrados no log e não interrompem o scheduler.
+
+    Args:
+        job_id (str): Id do job (nome nas métricas e no log).
+        func (Callable): A atualização.
+
+    Returns:
+        Callable: A função para o scheduler.
+    """
+
+    metrics = job_metrics.setdefault(job_id, JobMetrics())
+
+    def run() -> None:
+        with refresh_lock:
+            start = datetime.now()
+            timer = perf_counter()
+            failed = False
+
+            try:
+                func()
+            # pylint: disable=W0718
+            except Exception as err:
+                failed = True
+                logger.error("Erro ao executar %s: %s", job_id, err)
+
+            metrics.record(start, perf_counter() - timer, failed)
+
+        logger.info(
+            "%s: %.1f s (média %.1f s, máximo %.1f s, %d execuções, %d falhas)",
+            job_id,
+            metrics.last_seconds,
+            metrics.mean_seconds,
+            metrics.max_seconds,
+            metrics.runs,
+            metrics.failures,
+        )
+
+        for dependent_id in _dependents.get(job_id, []):
+            scheduler.modify_job(dependent_id, next_run_time=datetime.now())
+
+    return run
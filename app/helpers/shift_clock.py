@@ -0,0 +1,273 @@
+"""
+Módulo com o calendário e o relógio de turnos.
+
+O calendário concentra as regras de turno (NOT 0h-8h, MAT 8h-16h, VES 16h-24h e registros do VES
+logo após a meia-noite pertencendo ao dia anterior) em funções vetorizadas, usadas por todos os
+pontos que precisam do turno, da data de produção ou do início/fim do turno.
+
+O calendário de semanas (week_calendar) define a semana de produção (domingo a sábado) usada
+pelas tabelas semanais.
+
+O relógio centraliza o "agora" usado nos cálculos que dependem do turno atual (tempo decorrido
+do turno, tempo esperado de produção, dados do dia). O relógio pode ser injetado, assim os
+resultados são reproduzíveis em benchmarks e comparações.
+"""
+
+# cSpell: words desconto decorrido
+from datetime import date, datetime
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+from helpers.df_schema import TURNO_DTYPE, TURNOS
+
+# Duração do turno em minutos
+SHIFT_MINUTES = 480
+
+# Registros do VES até 00:05 ainda pertencem ao VES do dia anterior
+VES_OVERFLOW = pd.Timedelta(minutes=5)
+
+_SHIFT_SECONDS = SHIFT_MINUTES * 60
+_VES_CODE = TURNOS.index("VES")
+
+
+def seconds_of_day(hora: pd.Series) -> np.ndarray:
+    """
+    Converte os horários (datetime.time ou texto HH:MM:SS) em segundos desde a meia-noite.
+    A conversão é feita apenas uma vez por horário único.
+
+    Args:
+        hora (pd.Series): Série com os horários.
+
+    Returns:
+        np.ndarray: Segundos (float) de cada linha, NaN para horários nulos.
+    """
+
+    codes, times = pd.factorize(hora)
+    seconds = pd.to_timedelta(pd.Index(times).astype(str)).total_seconds().to_numpy()
+
+    # Horários nulos (código -1 do factorize) ficam com a última posição, NaN
+    return np.append(seconds, np.nan)[codes]
+
+
+def shift_of_seconds(seconds: np.ndarray) -> np.ndarray:
+    """
+    Retorna o turno de cada horário em segundos desde a meia-noite.
+
+    Args:
+        seconds (np.ndarray): Segundos desde a meia-noite.
+
+    Returns:
+        np.ndarray: Array com o turno (NOT, MAT ou VES) de cada linha, None para horários nulos
+        (NaN).
+    """
+
+    codes = _shift_codes(np.asarray(seconds, dtype=float))
+
+    # Código -1 (horário nulo) fica com a última posição, None
+    return np.array(TURNOS + [None], dtype=object)[codes]
+
+
+def _shift_codes(seconds: np.ndarray) -> np.ndarray:
+    """
+    Código do turno (posição em TURNOS) de cada horário em segundos, -1 para NaN.
+    """
+
+    valid = ~np.isnan(seconds)
+
+    return np.where(valid, np.where(valid, seconds, 0) // _SHIFT_SECONDS, -1).astype(np.int8)
+
+
+def shift_calendar(data_hora: pd.Series, turno: pd.Series = None) -> pd.DataFrame:
+    """
+    Calcula o calendário de turnos de cada registro.
+
+    Sem turno informado o turno é o do horário. Com turno informado (ex.: o turno apontado pela
+    máquina) ele prevalece, e registros do VES entre 00:00 e 00:05 ficam na data anterior.
+
+    Args:
+        data_hora (pd.Series): Data e hora dos registros.
+        turno (pd.Series, optional): Turno apontado de cada registro.
+
+    Returns:
+        pd.DataFrame: DataFrame com o mesmo índice e as colunas data_producao, turno
+        (categoria), inicio_turno e fim_turno.
+    """
+
+    data_hora = pd.to_datetime(pd.Series(data_hora))
+    day = data_hora.dt.normalize()
+    seconds = (data_hora - day).dt.total_seconds().to_numpy()
+
+    codes = _shift_codes(seconds)
+
+    if turno is not None:
+        reported = pd.Series(turno).astype(object).astype(TURNO_DTYPE).cat.codes.to_numpy()
+        codes = np.where(reported >= 0, reported, codes)
+
+        # VES que passou da meia-noite pertence ao dia anterior
+        overflow = (
+            (reported == _VES_CODE) & (seconds > 0) & (seconds < VES_OVERFLOW.total_seconds())
+        )
+        day = day - pd.to_timedelta(overflow.astype(int), unit="D")
+
+    start = day + pd.to_timedelta(codes * SHIFT_MINUTES, unit="min")
+
+    return pd.DataFrame(
+        {
+            "data_producao": day,
+            "turno": pd.Categorical.from_codes(codes, dtype=TURNO_DTYPE),
+            "inicio_turno": start,
+            "fim_turno": start + pd.Timedelta(minutes=SHIFT_MINUTES),
+        },
+        index=data_hora.index,
+    )
+
+
+def week_calendar(dates: pd.Series, date_format: str = None) -> pd.DataFrame:
+    """
+    Dimensão calendário das semanas de produção (domingo a sábado).
+
+    Cada data única é convertida uma única vez e as linhas recebem a semana da sua data pelo
+    código inteiro da data (factorize), sem isocalendar por linha.
+
+    Args:
+        dates (pd.Series): Datas dos registros (datetime ou texto no formato date_format).
+        date_format (str, optional): Formato das datas em texto (ex.: "%Y%m%d").
+
+    Returns:
+        pd.DataFrame: DataFrame com o mesmo índice e as colunas year e week (ano e semana ISO do
+        início da semana) e Data_Semana (domingo da semana), nulas para datas nulas.
+    """
+
+    codes, days = pd.factorize(dates)
+    days = pd.DatetimeIndex(pd.to_datetime(days, format=date_format))
+
+    # Semana começando no domingo
+    start = days - pd.to_timedelta((days.weekday + 1) % 7, unit="D")
+    iso = start.isocalendar()
+
+    dim = pd.DataFrame({"year": iso["year"], "week": iso["week"], "Data_Semana": start})
+
+    # Datas nulas (código -1 do factorize) ficam sem semana
+    return dim.reset_index(drop=True).reindex(codes).set_index(dates.index)
+
+
+class ShiftClock:
+    """
+    Relógio de turnos.
+
+    Args:
+        clock (Callable[[], datetime], optional): Função que retorna o agora.
+            Padrão: datetime.now.
+    """
+
+    def __init__(self, clock: Callable[[], datetime] = None):
+        self.clock = clock or datetime.now
+
+    def now(self) -> pd.Timestamp:
+        """
+        Retorna o agora do relógio.
+        """
+
+        return pd.Timestamp(self.clock())
+
+    def today(self) -> date:
+        """
+        Retorna a data de hoje do relógio.
+        """
+
+        return self.now().date()
+
+    @staticmethod
+    def shift_of(now: pd.Timestamp) -> str:
+        """
+        Retorna o turno de um horário.
+        """
+
+        return TURNOS[now.hour // 8]
+
+    def current_shift(self) -> str:
+        """
+        Retorna o turno atual.
+        """
+
+        return self.shift_of(self.now())
+
+    def calendar(
+        self, data_hora: pd.Series, turno: pd.Series = None, now: pd.Timestamp = None
+    ) -> pd.DataFrame:
+        """
+        Calendário de turnos (shift_calendar) com o tempo decorrido de cada turno até o agora.
+
+        Args:
+            data_hora (pd.Series): Data e hora dos registros.
+            turno (pd.Series, optional): Turno apontado de cada registro.
+            now (pd.Timestamp, optional): O agora. Padrão: o agora do relógio.
+
+        Returns:
+            pd.DataFrame: As colunas de shift_calendar e decorrido, os minutos decorridos do
+            turno (entre 0 e a duração do turno).
+        """
+
+        now = now if now is not None else self.now()
+        df = shift_calendar(data_hora, turno)
+
+        elapsed = (now - df["inicio_turno"]).dt.total_seconds() / 60
+        df["decorrido"] = elapsed.clip(0, SHIFT_MINUTES)
+
+        return df
+
+    def expected_production_time(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Calcula o tempo esperado de produção.
+        No dia atual é o tempo decorrido do turno menos o desconto, nos demais dias é o turno
+        completo menos o desconto. Turnos do dia atual que ainda não começaram também contam o
+        turno completo.
+
+        Args:
+            df (pd.DataFrame): DataFrame com data_registro, turno e desconto.
+
+        Returns:
+            np.ndarray: Tempo esperado de produção por linha.
+        """
+
+        now = self.now()
+        desconto = df["desconto"].to_numpy()
+        calendar = self.calendar(df["data_registro"], df["turno"], now)
+        is_today = (calendar["data_producao"] == now.normalize()).to_numpy()
+        started = (calendar["inicio_turno"] <= now).to_numpy()
+        decorrido = np.where(started, calendar["decorrido"].to_numpy(), SHIFT_MINUTES)
+
+        return np.where(
+            is_today,
+            np.floor(decorrido - desconto),
+            SHIFT_MINUTES - desconto,
+        )
+
+    @staticmethod
+    def shift_end(df: pd.DataFrame) -> pd.Series:
+        """
+        Calcula o horário de término do turno de cada linha.
+
+        Args:
+            df (pd.DataFrame): DataFrame com data_registro e turno.
+
+        Returns:
+            pd.Series: Data e hora de término do turno.
+        """
+
+        return shift_calendar(df["data_registro"], df["turno"])["fim_turno"]
+
+    def is_closed(self, df: pd.DataFrame, delay: pd.Timedelta = pd.Timedelta(0)) -> np.ndarray:
+        """
+        Indica se o turno de cada linha já terminou há pelo menos delay.
+
+        Args:
+            df (pd.DataFrame): DataFrame com data_registro e turno.
+            delay (pd.Timedelta, optional): Tempo após o término do turno. Padrão: 0.
+
+        Returns:
+            np.ndarray: Array booleano, True onde o turno está fechado.
+        """
+
+        return (self.shift_end(df) + delay <= self.now()).to_numpy()
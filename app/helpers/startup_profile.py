@@ -0,0 +1,98 @@
+"""
+Módulo com o perfil de inicialização da aplicação (python main.py --profile-startup).
+
+A importação do main é refeita em um interpretador limpo com -X importtime, assim o relatório
+mostra o tempo de importação e de inicialização (código executado no nível do módulo) de cada
+módulo. O scheduler e a primeira atualização do cache (main.start_background) não rodam ao
+importar o main, então o perfil não lê os bancos.
+"""
+
+import subprocess
+import sys
+
+from helpers.path_config import PARENT_DIR
+
+# Pacotes da aplicação, exibidos com o tempo próprio de cada módulo
+APP_PACKAGES = (
+    "main",
+    "app",
+    "components",
+    "database",
+    "helpers",
+    "management",
+    "pages",
+    "pcp",
+    "service",
+)
+
+# Prefixo das linhas do relatório do -X importtime
+IMPORTTIME_PREFIX = "import time:"
+
+
+def _parse_importtime(stderr: str) -> list[tuple[str, int, float, float]]:
+    """
+    Lê o relatório do -X importtime: nome, profundidade, tempo próprio e cumulativo (ms) de
+    cada módulo.
+    """
+
+    modules = []
+
+    for line in stderr.splitlines():
+        if not line.startswith(IMPORTTIME_PREFIX) or "imported package" in line:
+            continue
+
+        self_us, cumulative_us, name = line.removeprefix(IMPORTTIME_PREFIX).split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((name.strip(), depth, int(self_us) / 1000, int(cumulative_us) / 1000))
+
+    return modules
+
+
+def profile_startup(module: str = "main", top: int = 20) -> int:
+    """
+    Importa o módulo em um novo processo e imprime o tempo de importação por módulo.
+
+    Args:
+        module (str, optional): Módulo de entrada. Padrão: main.
+        top (int, optional): Quantidade de módulos em cada lista. Padrão: 20.
+
+    Returns:
+        int: O código de saída do processo.
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=PARENT_DIR,
+        check=False,
+    )
+
+    modules = _parse_importtime(result.stderr)
+    # Pacotes de primeiro nível em qualquer profundidade: o cumulativo é o custo do pacote
+    packages = sorted(
+        (m for m in modules if "." not in m[0] and m[0] not in APP_PACKAGES),
+        key=lambda m: m[3],
+        reverse=True,
+    )
+    app_modules = sorted(
+        (m for m in modules if m[0].split(".")[0] in APP_PACKAGES),
+        key=lambda m: m[2],
+        reverse=True,
+    )
+
+    total = sum(m[3] for m in modules if m[1] == 0)
+    print(f"Inicialização de {module}: {total:.0f} ms")
+
+    print("\nPacotes importados (cumulativo):")
+    for name, _, _, cumulative in packages[:top]:
+        print(f"{cumulative:10.1f} ms  {name}")
+
+    print("\nMódulos da aplicação (tempo próprio, inclui a inicialização do módulo):")
+    for name, _, self_ms, cumulative in app_modules[:top]:
+        print(f"{self_ms:10.1f} ms  {name} (cumulativo {cumulative:.1f} ms)")
+
+    if result.returncode != 0:
+        print(result.stderr.splitlines()[-1] if result.stderr else "Erro na inicialização")
+
+    return result.returncode
@@ -9,23 +9,33 @@
 
 import logging
 import os
+import sys
 from threading import Lock
 
+# O perfil de inicialização é feito antes de qualquer importação ou leitura da aplicação, o
+# processo filho apenas importa o main (sem scheduler nem leituras do banco)
+if __name__ == "__main__" and "--profile-startup" in sys.argv:
+    # pylint: disable=C0413
+    from helpers.startup_profile import profile_startup
+
+    sys.exit(profile_startup())
+
 import dash_bootstrap_components as dbc
 import dash_mantine_components as dmc
 import pandas as pd
-from apscheduler.schedulers.background import BackgroundScheduler
-from dash import callback, dcc, html
-from dash.dependencies import Input, Output
+from dash import callback, dcc, html, no_update
+from dash.dependencies import Input, Output, State
 from dash.exceptions import PreventUpdate
 from dash_bootstrap_templates import ThemeSwitchAIO
 
 # pylint: disable=E0401
 from database.last_month_ind import LastMonthInd
-from helpers.cache import MainDataCache
+from helpers.cache import CACHE_STORES, CACHE_VERSION_KEY, MainDataCache
 from helpers.path_config import UrlPath
+from helpers.scheduler import refresh_job, scheduler
 from pages import grafana, hour_prod, main_page, management, pcp
 from service.big_data import BigData
+from service.live_view import LIVE_POLL_SECONDS, live_snapshot
 from waitress import serve
 
 from app import app
@@ -44,6 +54,16 @@ logging.getLogger("apscheduler").setLevel(logging.DEBUG)
 URL_BOOTS = dbc.themes.BOOTSTRAP  # para o switch
 URL_DARKY = dbc.themes.DARKLY
 
+# Abas do App - cada página declara em DATA_KEYS os dados do cache que usa
+TABS_INFO = [
+    (grafana, "Ao Vivo", "tab-grafana"),
+    (main_page, "SFM Dashboard", "tab-sfm-dashboard"),
+    (management, "Gestão de Produção", "tab-management"),
+    (hour_prod, "Produção por Hora", "tab-hour-prod"),
+    (pcp, "PCP", "tab-pcp"),
+]
+TAB_DATA_KEYS = {tab_id: page.DATA_KEYS for page, _, tab_id in TABS_INFO}
+
 
 # ================================== Atualizações Em Background ================================== #
 def get_current_time():
@@ -93,34 +113,51 @@ def update_cache():
     """
     Atualiza cache
     """
-    try:
-        cache.update_cache()
-    # pylint: disable=W0718
-    except Exception as err:
-        logging.error("Erro ao executar update de cache: %s", err)
+    cache.update_cache()
 
 
 def cache_daily_data():
     """
     Função que atualiza o cache diariamente.
     """
-    try:
-        cache.cache_daily_data()
-    # pylint: disable=W0718
-    except Exception as err:
-        logging.error("Erro ao executar update daily data: %s", err)
+    cache.cache_daily_data()
 
 
-scheduler = BackgroundScheduler()
+# Atualizações do cache, sem sobreposição entre si nem com a do PCP (helpers.scheduler)
+refresh_cache = refresh_job("update_cache", update_cache)
+refresh_daily_data = refresh_job("cache_daily_data", cache_daily_data)
+
+# Scheduler único, as páginas registram os seus jobs ao serem importadas
 scheduler.add_job(func=get_current_time, trigger="interval", minutes=1)
-scheduler.add_job(func=update_cache, trigger="interval", minutes=5)
+scheduler.add_job(
+    func=refresh_cache,
+    trigger="interval",
+    minutes=5,
+    id="update_cache",
+    max_instances=1,
+    coalesce=True,
+)
 scheduler.add_job(func=update_big_data, trigger="cron", hour=5)
-scheduler.add_job(func=cache_daily_data, trigger="cron", hour=0, minute=1)
+scheduler.add_job(func=refresh_daily_data, trigger="cron", hour=0, minute=1)
 scheduler.add_job(func=update_last_month, trigger="cron", hour=1)  # Atualiza a cada 24 horas
+scheduler.add_job(
+    func=live_snapshot.refresh,
+    trigger="interval",
+    seconds=LIVE_POLL_SECONDS,
+    max_instances=1,
+    coalesce=True,
+)
 
-scheduler.start()
 
-update_cache()
+def start_background() -> None:
+    """
+    Inicia o scheduler e faz a primeira atualização do cache.
+    Executado apenas ao rodar a aplicação, não ao importar o main.
+    """
+    scheduler.start()
+
+    refresh_cache()
+
 
 # ============================================ Layout ============================================ #
 
@@ -137,15 +174,13 @@ app.layout = dmc.MantineProvider(
                 dcc.Store(id="store-df-perf"),
                 dcc.Store(id="store-df-repair"),
                 dcc.Store(id="store-df_eff_heatmap_tuple"),
-                dcc.Store(id="store-annotations_eff_list_tuple"),
                 dcc.Store(id="store-df_perf_heatmap_tuple"),
-                dcc.Store(id="store-annotations_perf_list_tuple"),
                 dcc.Store(id="store-df_repair_heatmap_tuple"),
-                dcc.Store(id="store-annotations_repair_list_tuple"),
                 dcc.Store(id="store-df_working_time"),
                 dcc.Store(id="store-df-caixas-cf"),
                 dcc.Store(id="store-df-caixas-cf-tot"),
                 dcc.Store(id="store-df-info-pure"),
+                dcc.Store(id="store-loaded"),
                 dcc.Store(id="is-data-store", storage_type="session", data=False),
                 # ---------------------- Main Layout ---------------------- #
                 dbc.Row(
@@ -219,16 +254,10 @@ def update_tabs(pathname):
     """
     # cSpell: words lider
 
-    tabs_info = [
-        (grafana.layout, "Ao Vivo", "tab-grafana"),
-        (main_page.layout, "SFM Dashboard", "tab-sfm-dashboard"),
-        (management.layout, "Gestão de Produção", "tab-management"),
-        (hour_prod.layout, "Produção por Hora", "tab-hour-prod"),
-        (pcp.layout, "PCP", "tab-pcp"),
+    all_tabs = [
+        dbc.Tab(page.layout, label=label, tab_id=tab_id) for page, label, tab_id in TABS_INFO
     ]
 
-    all_tabs = [dbc.Tab(layout, label=label, tab_id=tab_id) for layout, label, tab_id in tabs_info]
-
     tabs = {
         "/": all_tabs[:3],
         UrlPath.LIDER.value: all_tabs[:2],
@@ -238,7 +267,10 @@ def update_tabs(pathname):
         UrlPath.MAIN.value: all_tabs,
     }
 
-    return dbc.Tabs(tabs.get(pathname, all_tabs), id="dbc-tabs")
+    path_tabs = tabs.get(pathname, all_tabs)
+
+    # A aba ativa é explícita, os dados dela são carregados assim que as abas aparecem
+    return dbc.Tabs(path_tabs, id="dbc-tabs", active_tab=path_tabs[0].tab_id)
 
 
 @callback(
@@ -297,67 +329,34 @@ def update_mantine_color_schema(light_theme):
 
 # ===================================== Atualizações Do Store ==================================== #
 @callback(
-    [
-        Output("store-info", "data"),
-        Output("store-prod", "data"),
-        Output("store-df-eff", "data"),
-        Output("store-df-perf", "data"),
-        Output("store-df-repair", "data"),
-        Output("store-df_eff_heatmap_tuple", "data"),
-        Output("store-annotations_eff_list_tuple", "data"),
-        Output("store-df_perf_heatmap_tuple", "data"),
-        Output("store-annotations_perf_list_tuple", "data"),
-        Output("store-df_repair_heatmap_tuple", "data"),
-        Output("store-annotations_repair_list_tuple", "data"),
-        Output("store-df_working_time", "data"),
-        Output("store-df-caixas-cf", "data"),
-        Output("store-df-caixas-cf-tot", "data"),
-        Output("store-df-info-pure", "data"),
-    ],
-    Input("store-info", "data"),
+    [Output(store, "data") for store in CACHE_STORES.values()] + [Output("store-loaded", "data")],
+    Input("dbc-tabs", "active_tab"),
+    State("store-loaded", "data"),
 )
-def update_store(_data):
+def update_store(active_tab, loaded):
     """
-    Função que atualiza o store com os dados do banco de dados.
-    Utiliza dados do cache para agilizar o carregamento.
+    Função que atualiza os stores com os dados do cache.
+    Carrega apenas os dados da aba ativa que ainda não foram carregados na versão atual do cache,
+    assim as abas que o usuário não abre não recebem nem decodificam os dados.
     """
 
-    if cache.cache.get("df1") is None or cache.cache.get("df2") is None:
+    version = cache.cache.get(CACHE_VERSION_KEY)
+
+    if version is None:
         raise PreventUpdate
 
-    df_maq_info_cadastro = cache.cache.get("df1")
-    df_maq_info_prod_cad = cache.cache.get("df2")
-    df_eff = cache.cache.get("df_eff")
-    df_perf = cache.cache.get("df_perf")
-    df_repair = cache.cache.get("df_repair")
-    df_eff_heatmap_tuple = cache.cache.get("df_eff_heatmap_tuple")
-    annotations_eff_turn_list_tuple = cache.cache.get("annotations_eff_list_tuple")
-    df_perf_heatmap_tuple = cache.cache.get("df_perf_heatmap_tuple")
-    annotations_perf_turn_list_tuple = cache.cache.get("annotations_perf_list_tuple")
-    df_repair_heatmap_tuple = cache.cache.get("df_repair_heatmap_tuple")
-    annotations_repair_turn_list_tuple = cache.cache.get("annotations_repair_list_tuple")
-    df_working_time = cache.cache.get("df_working_time")
-    df_caixas_cf = cache.cache.get("df_caixas_cf")
-    df_caixas_cf_tot = cache.cache.get("df_caixas_cf_tot")
-    df_info_pure = cache.cache.get("df_info_pure")
-
-    return (
-        df_maq_info_cadastro,
-        df_maq_info_prod_cad,
-        df_eff,
-        df_perf,
-        df_repair,
-        df_eff_heatmap_tuple,
-        annotations_eff_turn_list_tuple,
-        df_perf_heatmap_tuple,
-        annotations_perf_turn_list_tuple,
-        df_repair_heatmap_tuple,
-        annotations_repair_turn_list_tuple,
-        df_working_time,
-        df_caixas_cf,
-        df_caixas_cf_tot,
-        df_info_pure,
-    )
+    # Dados de outra versão do cache são recarregados
+    if not loaded or loaded["version"] != version:
+        loaded = {"version": version, "keys": []}
+
+    missing = [key for key in TAB_DATA_KEYS.get(active_tab, []) if key not in loaded["keys"]]
+
+    if not missing:
+        raise PreventUpdate
+
+    data = [cache.cache.get(key) if key in missing else no_update for key in CACHE_STORES]
+
+    return data + [{"version": version, "keys": loaded["keys"] + missing}]
 
 
 # ================================================================================================ #
@@ -365,6 +364,8 @@ def update_store(_data):
 # ================================================================================================ #
 # ============================================ Run App =========================================== #
 if __name__ == "__main__":
+    start_background()
+
     try:
         if os.getenv("APP_ENV") == "production":
             print("Starting the server on port 8080 in production mode...")
@@ -9,6 +9,7 @@ from dash import html
 from dash.exceptions import PreventUpdate
 from dash_iconify import DashIconify
 from database.insert_data import InsertData
+from service.indicator_store import IndicatorStore
 
 # cSpell:words termoformadoras lamecação kaizen
 
@@ -593,6 +594,9 @@ def insert_stop(  # noqa: C901
             time,
         )
 
+    # A parada altera os indicadores já congelados da linha
+    IndicatorStore.invalidate(line, date)
+
     return notification_ok, "", None, None, None, None, None, "", "", None, ""
 
 
@@ -10,6 +10,7 @@ import dash_bootstrap_components as dbc
 import numpy as np
 import pandas as pd
 from dash import html
+from helpers.df_schema import TURNO_DTYPE
 from helpers.my_types import CICLOS_ESPERADOS
 
 
@@ -70,7 +71,8 @@ class ProductionCards:
         Prepares the data for CXS (Card X System) production cards.
 
         Args:
-            df_cxs (pd.DataFrame): The input DataFrame containing the production data.
+            df_cxs (pd.DataFrame): The input DataFrame containing the production data
+                per day and shift.
 
         Returns:
             tuple: A tuple containing the following production values:
@@ -80,24 +82,8 @@ class ProductionCards:
                 - producao_not (str): The production value for the night shift.
         """
 
-        # Identifica o turno
-        # df_cxs.loc[:, "HORA"] = pd.to_datetime(df_cxs["HORA"], format="%H:%M:%S").dt.hour
-        # df_cxs.loc[:, "TURNO"] = pd.cut(
-        #     df_cxs["HORA"],
-        #     bins=[0, 8, 16, 24],
-        #     labels=["NOT", "MAT", "VES"],
-        #     right=False,
-        # )
-
-        df_cxs = df_cxs.assign(
-            HORA=pd.to_datetime(df_cxs["HORA"], format="%H:%M:%S").dt.hour,
-            TURNO=pd.cut(
-                pd.to_datetime(df_cxs["HORA"], format="%H:%M:%S").dt.hour,
-                bins=[0, 8, 16, 24],
-                labels=["NOT", "MAT", "VES"],
-                right=False,
-            ),
-        )
+        # Caixas já agregadas por dia e turno (CaixasStore.day_shift)
+        df_cxs = df_cxs.assign(TURNO=pd.Categorical(df_cxs["TURNO"], dtype=TURNO_DTYPE))
 
         # Agrupa a produção por turno
         df_cxs = (
@@ -19,7 +19,6 @@ class BigStopsDataManager:
         self.lock = Lock()
         self.lm = LastMonthInd()
         self.bg = BigData()
-        self.get_big_stops_if_needed()
 
     def get_big_stops(self):
         """
@@ -34,7 +33,7 @@ class BigStopsDataManager:
     def get_big_stops_if_needed(self):
         """
         Recupera os grandes dados e os dados históricos de paradas se
-        a última atualização foi há mais de 24 horas.
+        a última atualização foi há mais de 24 horas (ou na primeira vez em que são usados).
         """
         with self.lock:
             if datetime.now() - self.last_update_time > timedelta(days=1):
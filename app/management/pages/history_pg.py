@@ -6,11 +6,8 @@ import textwrap
 
 import dash_bootstrap_components as dbc
 import dash_mantine_components as dmc
-import matplotlib.colors as mcolors
 import pandas as pd
 import plotly.express as px
-import seaborn as sns
-from babel.dates import format_date
 from components import bar_chart_details, date_picker_dmc, grid_aggrid, icicle_chart, segmented_btn
 from dash import Input, Output, callback, dcc, html
 from dash.exceptions import PreventUpdate
@@ -254,6 +251,11 @@ def update_graph_history_pg(_, light_theme):
         lambda x: "<br>".join(textwrap.wrap(x, width=10))
     )
 
+    # Seaborn e babel são importados apenas aqui, não pesam na inicialização da aplicação
+    # pylint: disable=C0415
+    import seaborn as sns
+    from babel.dates import format_date
+
     # Cria uma paleta de cores com os valores únicos na coluna 'problema'
     palette = (
         sns.dark_palette("gray", df_top_stops["problema"].nunique(), reverse=True)
@@ -262,7 +264,7 @@ def update_graph_history_pg(_, light_theme):
     )
 
     # Converte as cores RGB para hexadecimal
-    palette_hex = [mcolors.to_hex(color) for color in palette]
+    palette_hex = palette.as_hex()
 
     # Cria um dicionário que mapeia cada valor único na coluna 'problema' para uma cor na paleta
     color_map = dict(zip(df_top_stops["problema"].unique(), palette_hex))
@@ -310,6 +312,10 @@ def update_table_history_pg(light_theme):
     if df_history.empty:
         raise PreventUpdate
 
+    # Babel é importado apenas aqui, não pesa na inicialização da aplicação
+    # pylint: disable=C0415
+    from babel.dates import format_date
+
     # Transforma 2024-01 em Jan/2024
     df_history["data_registro"] = pd.to_datetime(df_history["data_registro"], format="%Y-%m")
     df_history["data_registro"] = df_history["data_registro"].apply(
@@ -5,12 +5,26 @@
 # cSpell:words eficiencia
 import dash_bootstrap_components as dbc
 import dash_mantine_components as dmc
-from dash import callback, dcc, html
-from dash.dependencies import Input, Output
-from database.get_data import GetData
-from helpers.my_types import get_color
+from dash import ALL, ClientsideFunction, callback, clientside_callback, dcc, html
+from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
+from service.live_view import LIVE_FIELDS, LIVE_POLL_SECONDS, TOOLTIP_FIELDS, live_snapshot
 
-get_data = GetData()
+# Dados do cache usados pela aba (lê direto do banco)
+DATA_KEYS = []
+
+# Cabeçalho, largura, classe do texto e propriedades do cabeçalho de cada campo
+TRUNCATE = {"class_name": "truncate"}
+CARDS = {
+    "status": ("Status", 2, "fs-3", {}),
+    "produto": ("Produto", 2, "fs-5", {}),
+    "eficiencia_15min": ("Eficiência 15min", 1, "fs-4", {"style": {"font-size": "0.9rem"}}),
+    "ciclos": ("Ciclos", 1, "fs-4", TRUNCATE),
+    "producao": ("Produção", 1, "fs-4", TRUNCATE),
+    "eficiencia": ("Eficiência", 1, "fs-4", TRUNCATE),
+    "tempo_parada": ("Tempo Parada", 1, "fs-4", TRUNCATE),
+    "parada": ("Motivo da Parada", 2, "fs-4", TRUNCATE),
+}
 
 # ========================================= Layout ========================================= #
 
@@ -18,224 +32,144 @@ layout = html.Div(
     [
         html.H1("Dados do Grafana", className="text-center"),
         html.Div(id="grafana-content"),
-        dcc.Interval(id="grafana-interval", interval=1000 * 60 * 2, n_intervals=0),
+        dcc.Store(id="grafana-data"),
+        dcc.Store(id="grafana-lines"),
+        dcc.Interval(id="grafana-interval", interval=1000 * LIVE_POLL_SECONDS, n_intervals=0),
     ]
 )
 
+
+# ========================================== Cards ========================================== #
+def value_id(linha, campo) -> dict:
+    """
+    Id do texto de um campo da linha (atualizado no navegador).
+    """
+    return {"type": "grafana-value", "linha": linha, "campo": campo}
+
+
+def tooltip_id(linha, campo) -> dict:
+    """
+    Id do tooltip de um campo da linha (atualizado no navegador).
+    """
+    return {"type": "grafana-tooltip", "linha": linha, "campo": campo}
+
+
+def _tooltip(linha: int, campo: str, child, label: str) -> dmc.Tooltip:
+    return dmc.Tooltip(
+        children=[child],
+        label=label,
+        position="top",
+        transitionProps={
+            "transition": "slide-down",
+            "duration": 400,
+        },
+        closeDelay=500,
+        boxWrapperProps={"className": "truncate"},
+        id=tooltip_id(linha, campo),
+    )
+
+
+def _card_body(linha: int, campo: str, text: str, color: str, tooltip: str) -> dbc.CardBody:
+    class_name = f"card-body-modal-style {CARDS[campo][2]}"
+
+    if campo == "produto":
+        child = html.Div(text, className="truncate", id=value_id(linha, campo))
+        return dbc.CardBody(_tooltip(linha, campo, child, tooltip), class_name=class_name)
+
+    if campo == "parada":
+        child = dmc.Center(
+            dmc.Text(text, truncate=True, className="fs-4", id=value_id(linha, campo)),
+        )
+        return dbc.CardBody(_tooltip(linha, campo, child, tooltip), class_name=class_name)
+
+    return dbc.CardBody(
+        text, style={"color": color}, class_name=class_name, id=value_id(linha, campo)
+    )
+
+
+def _card(header: dbc.CardHeader, body: dbc.CardBody, width: int) -> dbc.Col:
+    return dbc.Col(dbc.Card([header, body], class_name="h-100"), md=width, class_name="p-1")
+
+
+def create_cards(data: dict) -> list:
+    """
+    Cria uma row para cada linha e um card para cada campo, com os valores atuais.
+
+    Args:
+        data (dict): O vetor do painel ao vivo (build_live_vector).
+
+    Returns:
+        list: As rows das linhas.
+    """
+
+    rows = []
+
+    for linha, texts, colors, tooltips in zip(
+        data["linhas"], data["textos"], data["cores"], data["tooltips"]
+    ):
+        tooltips = dict(zip(TOOLTIP_FIELDS, tooltips))
+        linha_body = dbc.CardBody(f"{linha}", class_name="card-body-modal-style fs-3")
+
+        cards = [_card(dbc.CardHeader("Linha", **TRUNCATE), linha_body, 1)]
+        for campo, text, color in zip(LIVE_FIELDS, texts, colors):
+            header, width, _, header_props = CARDS[campo]
+            body = _card_body(linha, campo, text, color, tooltips.get(campo))
+            cards.append(_card(dbc.CardHeader(header, **header_props), body, width))
+
+        rows.append(dbc.Row(cards, className="mb-0 p-0"))
+
+    return rows
+
+
 # ========================================= Callbacks ========================================= #
 
 
+@callback(
+    Output("grafana-data", "data"),
+    Input("grafana-interval", "n_intervals"),
+    State("grafana-data", "data"),
+)
+def update_grafana_data(_n_intervals, data):
+    """
+    Função que atualiza o vetor com os dados do grafana.
+    Lê o snapshot compartilhado (o banco é lido apenas pelo poller do servidor) e só envia
+    quando há uma versão nova.
+    """
+
+    snapshot = live_snapshot.get()
+
+    if snapshot is None or (data is not None and data.get("versao") == snapshot["versao"]):
+        raise PreventUpdate
+
+    return snapshot
+
+
 @callback(
     Output("grafana-content", "children"),
-    [Input("grafana-content", "children"), Input("grafana-interval", "n_intervals")],
+    Output("grafana-lines", "data"),
+    Input("grafana-data", "data"),
+    State("grafana-lines", "data"),
 )
-def update_grafana(_n, _n_intervals):
+def update_grafana(data, lines):
     """
-    Função que atualiza o conteúdo do grafana.
+    Função que monta os cards do grafana.
+    Os cards são recriados apenas quando as linhas mudam, nas demais atualizações apenas as
+    células alteradas são atualizadas no navegador (grafana.update_cells).
     """
 
-    # Busca os dados do grafana no banco de dados maquina_tela
-    grafana_content = get_data.get_maq_tela()
-
-    # Ordenar por linha
-    grafana_content = grafana_content.sort_values(by="linha")
-
-    # Remove a linha 0
-    grafana_content = grafana_content[grafana_content.linha != 0]
-
-    cards = []
-
-    # Cria uma row para cada linha e um card para as colunas linha, status e Produto
-    for row in grafana_content.iterrows():
-        eff_15_min = round((float(row[1]["ciclo_15_min"]) / float(150)) * 100)
-        ciclo = round(float(row[1]["ciclo_1_min"]) * 10)
-
-        cards.append(
-            dbc.Row(
-                [
-                    dbc.Col(
-                        dbc.Card(
-                            [
-                                dbc.CardHeader("Linha", class_name="truncate"),
-                                dbc.CardBody(
-                                    f"{row[1]['linha']}",
-                                    class_name="card-body-modal-style fs-3",
-                                ),
-                            ],
-                            class_name="h-100",
-                        ),
-                        md=1,
-                        class_name="p-1",
-                    ),
-                    dbc.Col(
-                        dbc.Card(
-                            [
-                                dbc.CardHeader("Status"),
-                                dbc.CardBody(
-                                    "Rodando" if row[1]["status"] == "true" else "Parada",
-                                    style={
-                                        "color": ("green" if row[1]["status"] == "true" else "red")
-                                    },
-                                    class_name="card-body-modal-style fs-3",
-                                ),
-                            ],
-                            class_name="h-100",
-                        ),
-                        md=2,
-                        class_name="p-1",
-                    ),
-                    dbc.Col(
-                        dbc.Card(
-                            [
-                                dbc.CardHeader("Produto"),
-                                dbc.CardBody(
-                                    dmc.Tooltip(
-                                        children=[
-                                            html.Div(
-                                                f"{row[1]['produto_nome']}",
-                                                className="truncate",
-                                                id=f"produto-{row[1]['linha']}",
-                                            ),
-                                        ],
-                                        label=f"{row[1]['produto_nome']}",
-                                        position="top",
-                                        transitionProps={
-                                            "transition": "slide-down",
-                                            "duration": 400,
-                                        },
-                                        closeDelay=500,
-                                        boxWrapperProps={"className": "truncate"},
-                                    ),
-                                    class_name="card-body-modal-style fs-5",
-                                ),
-                            ],
-                            class_name="h-100",
-                        ),
-                        md=2,
-                        class_name="p-1",
-                    ),
-                    dbc.Col(
-                        dbc.Card(
-                            [
-                                dbc.CardHeader("Eficiência 15min", style={"font-size": "0.9rem"}),
-                                dbc.CardBody(
-                                    f"{eff_15_min}%",
-                                    style=({"color": get_color(eff_15_min, 100)}),
-                                    class_name="card-body-modal-style fs-4",
-                                ),
-                            ],
-                            class_name="h-100",
-                            id=f"eficiencia-15min-{row[1]['linha']}",
-                        ),
-                        md=1,
-                        class_name="p-1",
-                    ),
-                    dbc.Col(
-                        dbc.Card(
-                            [
-                                dbc.CardHeader("Ciclos", class_name="truncate"),
-                                dbc.CardBody(
-                                    f"{ciclo}%",
-                                    style=({"color": get_color(ciclo, 100)}),
-                                    class_name="card-body-modal-style fs-4",
-                                ),
-                            ],
-                            class_name="h-100",
-                        ),
-                        md=1,
-                        class_name="p-1",
-                    ),
-                    dbc.Col(
-                        dbc.Card(
-                            [
-                                dbc.CardHeader("Produção", class_name="truncate"),
-                                dbc.CardBody(
-                                    f"{round(float(row[1]['total_produzido']))}",
-                                    style=(
-                                        {"color": get_color(float(row[1]["total_produzido"]), 7200)}
-                                    ),
-                                    class_name="card-body-modal-style fs-4",
-                                ),
-                            ],
-                            class_name="h-100",
-                        ),
-                        md=1,
-                        class_name="p-1",
-                    ),
-                    dbc.Col(
-                        dbc.Card(
-                            [
-                                dbc.CardHeader("Eficiência", class_name="truncate"),
-                                dbc.CardBody(
-                                    f"{round(float(row[1]['eficiencia']))}%",
-                                    style=({"color": get_color(float(row[1]["eficiencia"]), 100)}),
-                                    class_name="card-body-modal-style fs-4",
-                                ),
-                            ],
-                            class_name="h-100",
-                            id=f"eficiencia-{row[1]['linha']}",
-                        ),
-                        md=1,
-                        class_name="p-1",
-                    ),
-                    dbc.Col(
-                        dbc.Card(
-                            [
-                                dbc.CardHeader("Tempo Parada", class_name="truncate"),
-                                dbc.CardBody(
-                                    f"{round(float(row[1]['tempo_parada']))}",
-                                    style=(
-                                        {
-                                            "color": (
-                                                "green" if row[1]["tempo_parada"] < 20 else "red"
-                                            )
-                                        }
-                                    ),
-                                    class_name="card-body-modal-style fs-4",
-                                ),
-                            ],
-                            class_name="h-100",
-                            id=f"tempo_parada-{row[1]['linha']}",
-                        ),
-                        md=1,
-                        class_name="p-1",
-                    ),
-                    dbc.Col(
-                        dbc.Card(
-                            [
-                                dbc.CardHeader("Motivo da Parada", class_name="truncate"),
-                                dbc.CardBody(
-                                    dmc.Tooltip(
-                                        children=[
-                                            dmc.Center(
-                                                dmc.Text(
-                                                    (f"{row[1]['parada_nome']}").upper(),
-                                                    truncate=True,
-                                                    className="fs-4",
-                                                ),
-                                            ),
-                                        ],
-                                        label=f"{row[1]['parada_nome']}",
-                                        position="top",
-                                        transitionProps={
-                                            "transition": "slide-down",
-                                            "duration": 400,
-                                        },
-                                        closeDelay=500,
-                                        boxWrapperProps={"className": "truncate"},
-                                    ),
-                                    class_name="card-body-modal-style fs-4",
-                                    id=f"parada_nome-{row[1]['linha']}",
-                                ),
-                            ],
-                            class_name="h-100",
-                        ),
-                        md=2,
-                        class_name="p-1",
-                    ),
-                ],
-                className="mb-0 p-0",
-            ),
-        )
+    if data is None or data["linhas"] == lines:
+        raise PreventUpdate
+
+    return create_cards(data), data["linhas"]
 
-    return cards
+
+clientside_callback(
+    ClientsideFunction(namespace="grafana", function_name="update_cells"),
+    Output(value_id(ALL, ALL), "children"),
+    Output(value_id(ALL, ALL), "style"),
+    Output(tooltip_id(ALL, ALL), "label"),
+    Input("grafana-data", "data"),
+    State(value_id(ALL, ALL), "children"),
+    State(value_id(ALL, ALL), "style"),
+    State(tooltip_id(ALL, ALL), "label"),
+)
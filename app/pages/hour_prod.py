@@ -11,8 +11,13 @@ import pandas as pd
 from components import grid_aggrid
 from dash import Input, Output, callback, html
 from dash_bootstrap_templates import ThemeSwitchAIO
+from helpers.shift_clock import ShiftClock
 
 gag = grid_aggrid.GridAgGrid()
+shift_clock = ShiftClock()
+
+# Dados do cache usados pela aba
+DATA_KEYS = ["df_info_pure"]
 
 # ================================================================================================ #
 #                                              LAYOUT                                              #
@@ -48,7 +53,7 @@ def update_hour_prod_table(data, theme):
     if data is None:
         return dbc.Col("Sem dados de produção")
 
-    today = pd.to_datetime("today").date()
+    today = shift_clock.today()
 
     # Filtra pela data de hoje
     df = pd.DataFrame(pd.read_json(StringIO(data), orient="split"))
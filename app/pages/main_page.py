@@ -16,6 +16,18 @@ from dash_bootstrap_templates import ThemeSwitchAIO
 from database.last_month_ind import LastMonthInd
 from helpers.my_types import IndicatorType, TemplateType
 
+# Dados do cache usados pela aba (inclui os modais de eficiência, performance e reparo)
+DATA_KEYS = [
+    "df1",
+    "df2",
+    "df_eff",
+    "df_perf",
+    "df_repair",
+    "df_eff_heatmap_tuple",
+    "df_perf_heatmap_tuple",
+    "df_repair_heatmap_tuple",
+]
+
 # ======================================== Layout ======================================== #
 
 layout = [
@@ -351,25 +363,17 @@ def update_last_gauge(df_1, toggle_theme):
         Input("store-df_eff_heatmap_tuple", "data"),
         Input("store-df_perf_heatmap_tuple", "data"),
         Input("store-df_repair_heatmap_tuple", "data"),
-        Input("store-annotations_eff_list_tuple", "data"),
-        Input("store-annotations_perf_list_tuple", "data"),
-        Input("store-annotations_repair_list_tuple", "data"),
         Input(ThemeSwitchAIO.ids.switch("theme"), "value"),
     ],
 )
-def update_heatmap(
-    df_eff, df_perf, df_repair, annotations_eff, annotations_perf, annotations_repair, toggle_theme
-):
+def update_heatmap(df_eff, df_perf, df_repair, toggle_theme):
     """
-    Update the heatmap based on the provided data and annotations.
+    Update the heatmap based on the provided data.
 
     Args:
         df_eff (str): JSON string representing the efficiency data.
         df_perf (str): JSON string representing the performance data.
         df_repair (str): JSON string representing the repair data.
-        annotations_eff (str): JSON string representing the annotations for efficiency data.
-        annotations_perf (str): JSON string representing the annotations for performance data.
-        annotations_repair (str): JSON string representing the annotations for repair data.
         toggle_theme (bool): Flag indicating whether to use a light or dark template.
 
     Returns:
@@ -385,29 +389,15 @@ def update_heatmap(
     df_perf_json = json.loads(df_perf)
     df_repair_json = json.loads(df_repair)
 
-    annotations_eff_json = json.loads(annotations_eff)
-    annotations_perf_json = json.loads(annotations_perf)
-    annotations_repair_json = json.loads(annotations_repair)
-
     df_eff_heat = [pd.read_json(StringIO(df), orient="split") for df in df_eff_json]
     df_perf_heat = [pd.read_json(StringIO(df), orient="split") for df in df_perf_json]
     df_repair_heat = [pd.read_json(StringIO(df), orient="split") for df in df_repair_json]
 
-    annotations_eff_heat = [json.loads(annotations) for annotations in annotations_eff_json]
-    annotations_perf_heat = [json.loads(annotations) for annotations in annotations_perf_json]
-    annotations_repair_heat = [json.loads(annotations) for annotations in annotations_repair_json]
-
     hm = heatmap.Heatmap()
 
-    heatmap_eff = hm.create_heatmap(
-        df_eff_heat[-1], annotations_eff_heat[-1], IndicatorType.EFFICIENCY, 90, template
-    )
-    heatmap_perf = hm.create_heatmap(
-        df_perf_heat[-1], annotations_perf_heat[-1], IndicatorType.PERFORMANCE, 4, template
-    )
-    heatmap_repair = hm.create_heatmap(
-        df_repair_heat[-1], annotations_repair_heat[-1], IndicatorType.REPAIR, 4, template
-    )
+    heatmap_eff = hm.create_heatmap(df_eff_heat[-1], IndicatorType.EFFICIENCY, 90, template)
+    heatmap_perf = hm.create_heatmap(df_perf_heat[-1], IndicatorType.PERFORMANCE, 4, template)
+    heatmap_repair = hm.create_heatmap(df_repair_heat[-1], IndicatorType.REPAIR, 4, template)
 
     return (
         dbc.Button(
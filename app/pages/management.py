@@ -13,6 +13,9 @@ from dash_iconify import DashIconify
 from management.components import modal_estoque
 from management.pages import dashboards_pg, history_pg, production_cards_pg, tables_management_pg
 
+# Dados do cache usados pela aba (inclui as páginas e o modal de estoque)
+DATA_KEYS = ["df1", "df2", "df_eff", "df_working_time", "df_caixas_cf", "df_caixas_cf_tot"]
+
 # ================================================================================================ #
 #                                              LAYOUT                                              #
 # ================================================================================================ #
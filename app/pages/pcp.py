@@ -2,14 +2,16 @@
 Módulo com dados de Batidas de massa.
 """
 
+from datetime import datetime
+
 import dash_bootstrap_components as dbc
 import dash_mantine_components as dmc
-from apscheduler.schedulers.background import BackgroundScheduler
 from components.grid_aggrid import GridAgGrid
-from dash import Input, Output, callback, dcc
+from dash import Input, Output, State, callback, dcc
 from dash.exceptions import PreventUpdate
 from dash_bootstrap_templates import ThemeSwitchAIO
 from dash_iconify import DashIconify
+from helpers.scheduler import refresh_job, run_after, scheduler
 from pcp.frontend import (
     massa_analysis_pcp,
     massa_batidas_pcp,
@@ -17,37 +19,40 @@ from pcp.frontend import (
     pasta_batidas_pcp,
     producao_pcp,
 )
-from pcp.helpers.cache_pcp import PcpDataCache
-
-from app import app
+from pcp.helpers.cache_pcp import PCP_VERSION_KEY, pcp_data
 
 # =========================================== Variáveis ========================================== #
-pcp_data = PcpDataCache(app)
-update_massa_cache = pcp_data.cache_massa_data
-update_pasta_cache = pcp_data.cache_pasta_data
-scheduler = BackgroundScheduler()
+update_pcp_cache = refresh_job("update_pcp_cache", pcp_data.cache_pcp_data)
 pcp_builder = GridAgGrid()
 
+# Dados do cache principal usados pela aba (os dados do PCP têm cache próprio, com as caixas
+# já processadas na atualização)
+DATA_KEYS = []
 
-# ====================================== Cache Em Background ===================================== #
 
-scheduler.add_job(update_massa_cache, "interval", minutes=5)
-scheduler.add_job(update_pasta_cache, "interval", minutes=5)
-scheduler.start()
+# ====================================== Cache Em Background ===================================== #
 
-#  DEV HACK  O código a seguir deve ser removido ao fazer a integração com o código existente
-update_massa_cache()
-update_pasta_cache()
+# Job no scheduler principal, a primeira leitura roda em background logo após o início.
+# Também roda logo após cada atualização do cache principal (caixas usadas no consumo de pães).
+scheduler.add_job(
+    update_pcp_cache,
+    "interval",
+    minutes=5,
+    id="update_pcp_cache",
+    next_run_time=datetime.now(),
+    max_instances=1,
+    coalesce=True,
+)
+run_after("update_cache", "update_pcp_cache")
 
 # ================================================================================================ #
 #                                              LAYOUT                                              #
 # ================================================================================================ #
 layout = [
-    dcc.Store(id="df_sum", storage_type="local"),
-    dcc.Store(id="df_week", storage_type="local"),
-    dcc.Store(id="df_pasta", storage_type="local"),
-    dcc.Store(id="df_pasta_week", storage_type="local"),
-    dcc.Interval(id="interval-component-pcp", interval=1000 * 60 * 5, n_intervals=0),
+    # Apenas a versão das tabelas, os dados ficam no servidor (pcp_data)
+    dcc.Store(id="pcp-version"),
+    # A versão é conferida a cada minuto, as tabelas só são relidas quando mudam
+    dcc.Interval(id="interval-component-pcp", interval=1000 * 60, n_intervals=0),
     dcc.Location(id="pcp-url"),
     # ============================================ Btn =========================================== #
     dbc.Button(
@@ -110,30 +115,30 @@ layout = [
 
 # ===================================== Atualização Do Store ===================================== #
 @callback(
-    Output("df_sum", "data"),
-    Output("df_week", "data"),
-    Output("df_pasta", "data"),
-    Output("df_pasta_week", "data"),
+    Output("pcp-version", "data"),
     Input("interval-component-pcp", "n_intervals"),
+    State("pcp-version", "data"),
 )
-def update_store(_):
+def update_store(_, current_version):
     """
-    Atualiza o store.
+    Atualiza a versão das tabelas do PCP.
 
-    Retorna um tuple contendo os dados do cache "df_sum" e "df_week".
+    Os callbacks das páginas leem as tabelas no servidor quando a versão muda, o navegador
+    recebe apenas o recorte exibido.
 
     Parâmetros:
     _ (qualquer): Parâmetro não utilizado.
+    current_version (float): Versão já recebida pelo navegador.
 
     Retorno:
-    tuple: Um tuple contendo os dados do cache "df_sum" e "df_week".
+    float: A versão atual das tabelas no cache.
     """
-    return (
-        pcp_data.cache.get("df_sum"),
-        pcp_data.cache.get("df_week"),
-        pcp_data.cache.get("df_pasta"),
-        pcp_data.cache.get("df_pasta_week"),
-    )
+    version = pcp_data.cache.get(PCP_VERSION_KEY)
+
+    if version is None or version == current_version:
+        raise PreventUpdate
+
+    return version
 
 
 # ============================================ Drawer ============================================ #
@@ -2,14 +2,25 @@
 Módulo de análise dos dados do PCP
 """
 
+import numpy as np
 import pandas as pd
+from helpers.shift_clock import week_calendar
 from pcp.helpers.types_pcp import (
     RENDIMENTO_BOLINHA,
     RENDIMENTO_BOLINHA_ATUALIZADO,
     RENDIMENTO_CHEIA,
+    RENDIMENTO_PASTA_PAO,
     RENDIMENTO_REPROCESSO,
+    TOTAL_SHIFT,
 )
 
+# Chaves das tabelas semanais
+WEEK_KEYS = ["year", "week", "Data_Semana"]
+
+# Chaves e valores da tabela de fatos da pasta (além do Produto)
+PASTA_KEYS = ["Data_Registro", "Turno", "Fabrica"]
+PASTA_VALUES = ["Batidas", "Peso"]
+
 
 class AnalysisPcpData:
     """
@@ -18,6 +29,12 @@ class AnalysisPcpData:
     Métodos:
     - get_massa_sum: Calcula a soma da massa batida a partir de um DataFrame fornecido.
     - get_week_data: Retorna os dados agrupados por semana, fabrica e turno.
+    - get_pasta_analysis: Cria a tabela de fatos da pasta (data, turno, fábrica e pasta).
+    - get_pasta_week_analysis: Agrupa a tabela de fatos da pasta por semana.
+    - pasta_pivot: Visão da tabela de fatos da pasta com colunas por pasta.
+    - add_shift_total: Adiciona as linhas com o total dos turnos.
+    - get_massa_analysis: Compara a massa batida com o consumo de pães por semana.
+    - get_pasta_consumption: Compara a pasta batida com o consumo de pasta por semana.
     """
 
     def __init__(self) -> None:
@@ -118,26 +135,12 @@ class AnalysisPcpData:
         - Bolinha_Total: Total de pães bolinha produzidos.
         """
 
-        df = df.copy()
-
-        # Ajustar o dia da semana para começar no domingo
-        df["Dia_Semana"] = df["Data_Registro"].dt.weekday
-        df["Dia_Semana"] = (df["Dia_Semana"] + 1) % 7
-
-        # Criar uma nova coluna com a data da semana
-        df["Data_Semana"] = df["Data_Registro"] - pd.to_timedelta(df["Dia_Semana"], unit="d")
+        # Semana (iniciada no domingo) de cada data, pela dimensão calendário
+        df = pd.concat([df, week_calendar(df["Data_Registro"])], axis=1)
 
         # Criar uma nova tabela com os dados agrupados por semana, fabrica e turno
         df_paes = (
-            df.groupby(
-                [
-                    df["Data_Semana"].dt.isocalendar().year,
-                    df["Data_Semana"].dt.isocalendar().week,
-                    "Data_Semana",
-                    "Turno",
-                    "Fabrica",
-                ]
-            )
+            df.groupby(WEEK_KEYS + ["Turno", "Fabrica"])
             .agg(
                 Qtd_Batidas_Cheias=("Qtd_Batidas_Cheias", "sum"),
                 Peso_Batidas_Cheias=("Peso_Batidas_Cheias", "sum"),
@@ -155,100 +158,225 @@ class AnalysisPcpData:
 
     def get_pasta_analysis(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Realiza a análise dos dados de pasta.
+        Cria a tabela de fatos da pasta (formato longo), uma linha por data, turno, fábrica e
+        pasta, em uma única agregação. Novas pastas entram como novas linhas, sem colunas fixas.
 
         Args:
             df (pd.DataFrame): O DataFrame contendo os dados de pasta.
 
         Returns:
-            pd.DataFrame: O DataFrame resultante da análise dos dados de pasta.
+            pd.DataFrame: Data_Registro, Turno, Fabrica, Produto (nome da pasta), Batidas e Peso.
         """
 
-        # Remove espaço em branco do Produto
-        df.Produto = df.Produto.str.strip()
+        # Nome de cada pasta calculado uma vez por produto (ex.: "PASTA DOCE " -> "Doce")
+        codes, names = pd.factorize(df["Produto"])
+        pastas = names.str.strip().str.title().str.removeprefix("Pasta ").str.replace(" ", "_")
 
-        # Substitui o espaço por _
-        df.Produto = df.Produto.str.replace(" ", "_")
+        df_pasta = (
+            df.assign(Produto=pastas.take(codes, allow_fill=True, fill_value=np.nan))
+            .groupby(PASTA_KEYS + ["Produto"])
+            .agg(Batidas=("Batidas_Pasta", "sum"), Peso=("Peso_Pasta", "sum"))
+            .reset_index()
+        )
 
-        # Cria colunas auxiliares para pivotar
-        df["Produto_Batidas"] = df.Produto.str.title() + "_Batidas"
-        df["Produto_Peso"] = df.Produto.str.title() + "_Peso"
+        return df_pasta
 
-        # Pivotar Produto Batidas
-        df_pivot_batidas = df.pivot_table(
-            index=["Data_Registro", "Turno", "Fabrica"],
-            columns="Produto_Batidas",
-            values="Batidas_Pasta",
-            aggfunc="sum",
-            fill_value=0,
-        )
+    def get_pasta_week_analysis(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Agrupa a tabela de fatos da pasta por semana, turno, fábrica e pasta.
 
-        # Pivotar Produto Peso
-        df_pivot_peso = df.pivot_table(
-            index=["Data_Registro", "Turno", "Fabrica"],
-            columns="Produto_Peso",
-            values="Peso_Pasta",
-            aggfunc="sum",
-            fill_value=0,
-        )
+        Args:
+            df (pd.DataFrame): A tabela de fatos da pasta (get_pasta_analysis).
+
+        Returns:
+            pd.DataFrame: year, week, Data_Semana, Turno, Fabrica, Produto, Batidas e Peso.
+        """
 
-        # Merge dos DataFrames
-        df_pasta = pd.concat([df_pivot_batidas, df_pivot_peso], axis=1).reset_index()
+        # Semana (iniciada no domingo) de cada data, pela dimensão calendário
+        df = pd.concat([df, week_calendar(df["Data_Registro"])], axis=1)
+
+        # Criar uma nova tabela com os dados agrupados por semana, fabrica, turno e pasta
+        df_pasta = (
+            df.groupby(WEEK_KEYS + ["Turno", "Fabrica", "Produto"])[PASTA_VALUES]
+            .sum()
+            .reset_index()
+        )
 
         return df_pasta
 
-    def get_pasta_week_analysis(self, df: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def pasta_pivot(df: pd.DataFrame) -> pd.DataFrame:
         """
-        Retorna uma tabela com os dados de análise semanal das pastas.
+        Visão da tabela de fatos da pasta com uma coluna de batidas e uma de peso por pasta.
 
         Args:
-            df (pd.DataFrame): O dataframe contendo os dados de registro das pastas.
+            df (pd.DataFrame): Tabela de fatos da pasta, por dia ou semana.
 
         Returns:
-            pd.DataFrame: Um dataframe contendo os dados agrupados por semana, fabrica e turno,
-            com as seguintes colunas:
+            pd.DataFrame: As chaves da tabela seguidas das colunas {Pasta}_Batidas e {Pasta}_Peso
+            (em ordem alfabética), com 0 para as pastas sem batidas.
+        """
+
+        index = [column for column in df.columns if column not in ["Produto"] + PASTA_VALUES]
 
-            - Tradicional_Peso: Soma dos pesos das pastas tradicionais.
-            - Tradicional_Batidas: Soma das batidas das pastas tradicionais.
-            - Picante_Batidas: Soma das batidas das pastas picantes.
-            - Picante_Peso: Soma dos pesos das pastas picantes.
-            - Cebola_Batidas: Soma das batidas das pastas de cebola.
-            - Cebola_Peso: Soma dos pesos das pastas de cebola.
-            - Pasta_Doce_Batidas: Soma das batidas das pastas doces.
-            - Pasta_Doce_Peso: Soma dos pesos das pastas doces.
+        df = df.set_index(index)
+
+        # Linhas na ordem da tabela de fatos (turnos seguidos dos totais), pastas em ordem
+        # alfabética
+        df_pivot = (
+            df.set_index("Produto", append=True)[PASTA_VALUES]
+            .unstack("Produto", fill_value=0)
+            .reindex(df.index.unique())
+        )
+        df_pivot.columns = [f"{pasta}_{value}" for value, pasta in df_pivot.columns]
+
+        return df_pivot.reset_index()
+
+    @staticmethod
+    def add_shift_total(df: pd.DataFrame, keys: list[str]) -> pd.DataFrame:
         """
+        Adiciona as linhas com o total dos turnos (Turno = TOTAL_SHIFT), assim as visões por
+        turno e total são apenas filtros da mesma tabela.
 
-        df = df.copy()
+        Args:
+            df (pd.DataFrame): Tabela por turno.
+            keys (list[str]): Chaves da tabela, sem o turno.
 
-        # Ajustar o dia da semana para começar no domingo
-        df["Dia_Semana"] = df["Data_Registro"].dt.weekday
-        df["Dia_Semana"] = (df["Dia_Semana"] + 1) % 7
+        Returns:
+            pd.DataFrame: A tabela por turno seguida das linhas de total.
+        """
 
-        # Criar uma nova coluna com a data da semana
-        df["Data_Semana"] = df["Data_Registro"] - pd.to_timedelta(df["Dia_Semana"], unit="d")
+        df_total = df.drop(columns="Turno").groupby(keys).sum().reset_index()
+        df_total["Turno"] = TOTAL_SHIFT
 
-        # Criar uma nova tabela com os dados agrupados por semana, fabrica e turno
-        df_pasta = (
-            df.groupby(
-                [
-                    df["Data_Semana"].dt.isocalendar().year,
-                    df["Data_Semana"].dt.isocalendar().week,
-                    "Data_Semana",
-                    "Turno",
-                    "Fabrica",
-                ]
-            )
-            .agg(
-                Tradicional_Peso=("Tradicional_Peso", "sum"),
-                Tradicional_Batidas=("Tradicional_Batidas", "sum"),
-                Picante_Batidas=("Picante_Batidas", "sum"),
-                Picante_Peso=("Picante_Peso", "sum"),
-                Cebola_Batidas=("Cebola_Batidas", "sum"),
-                Cebola_Peso=("Cebola_Peso", "sum"),
-                Doce_Batidas=("Pasta_Doce_Batidas", "sum"),
-                Doce_Peso=("Pasta_Doce_Peso", "sum"),
-            )
+        return pd.concat([df, df_total[df.columns]], ignore_index=True)
+
+    @staticmethod
+    def __week_total(df_week: pd.DataFrame, columns: list[str] = None) -> pd.DataFrame:
+        """
+        Linhas de total dos turnos de uma tabela semanal, sem a coluna de turno.
+        """
+
+        df_week = df_week[df_week["Turno"] == TOTAL_SHIFT].drop(columns="Turno")
+        df_week = df_week[columns] if columns else df_week
+        df_week["Data_Semana"] = pd.to_datetime(df_week["Data_Semana"])
+
+        return df_week
+
+    def get_massa_analysis(self, df_week: pd.DataFrame, df_paes: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compara os pães produzidos pela massa batida com os pães consumidos por semana e fábrica.
+        Usada pela tabela e pelo gráfico da análise de massa.
+
+        Args:
+            df_week (pd.DataFrame): Massa por semana (get_week_data com add_shift_total).
+            df_paes (pd.DataFrame): Pães produzidos por semana (AuxFuncPcp.adjust_prod).
+
+        Returns:
+            pd.DataFrame: Tabela por semana e fábrica com a produção, o consumo, a sobra e a
+            perda (%) de baguetes e bolinhas.
+        """
+
+        df = df_paes.copy()
+
+        # Consumo de bolinhas separado do consumo de baguetes
+        mask = df["PRODUTO"].str.contains("BOL ").astype(int)
+        df["QTD_BOL"] = mask * df["QTD"]
+        df["QTD"] = (1 - mask) * df["QTD"]
+
+        df = (
+            df.groupby(WEEK_KEYS + ["FABRICA"])[["QTD", "QTD_BOL"]]
+            .sum()
             .reset_index()
+            .rename(columns={"FABRICA": "Fabrica"})
         )
+        df["Data_Semana"] = pd.to_datetime(df["Data_Semana"])
 
-        return df_pasta
+        df_week = self.__week_total(
+            df_week, WEEK_KEYS + ["Fabrica", "Baguete_Total", "Bolinha_Total"]
+        )
+        df = df.merge(df_week, on=WEEK_KEYS + ["Fabrica"], how="outer")
+
+        # Sobra e perda de pães
+        df["baguete_sobra"] = df["Baguete_Total"] - df["QTD"]
+        df["bolinha_sobra"] = df["Bolinha_Total"] - df["QTD_BOL"]
+        df["perda_bag"] = df["baguete_sobra"] / df["Baguete_Total"] * 100
+        df["perda_bol"] = (df["bolinha_sobra"] / df["Bolinha_Total"] * 100).fillna(0)
+        df["perda_bol"] = df["perda_bol"].replace(-np.inf, 0)
+
+        # Perda de baguete de cada fábrica
+        df["perda_bag_fab1"] = np.where(df["Fabrica"] == "Fab. 1", df["perda_bag"], 0)
+        df["perda_bag_fab2"] = np.where(df["Fabrica"] == "Fab. 2", df["perda_bag"], 0)
+
+        return df.sort_values(["year", "week", "Fabrica"], ascending=[False, False, True])
+
+    def get_pasta_consumption(
+        self, df_pasta_week: pd.DataFrame, df_paes: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Compara a pasta batida com a pasta consumida nos pães por semana e fábrica.
+        Usada pela tabela e pelo gráfico da análise de pasta.
+
+        Args:
+            df_pasta_week (pd.DataFrame): Pasta por semana (get_pasta_week_analysis com
+                add_shift_total).
+            df_paes (pd.DataFrame): Pães produzidos por semana (AuxFuncPcp.adjust_prod).
+
+        Returns:
+            pd.DataFrame: Tabela por semana e fábrica com a pasta produzida, consumida, a sobra e
+            a perda (%) de cada tipo de pasta.
+        """
+
+        df = df_paes.copy()
+
+        # Calcula quantidade de pasta gasta por produto (produtos sem rendimento ficam fora)
+        df["QTD"] = df["QTD"] * df["PRODUTO"].map(RENDIMENTO_PASTA_PAO)
+        df = df.dropna(subset="QTD")
+
+        # Tipo de pasta de cada produto
+        prod_dict = {
+            r".*TRD.*": "Tradicional",
+            r".*CEB.*": "Cebola",
+            r".*PIC.*": "Picante",
+            r".*DOCE.*": "Doce",
+        }
+        df["PRODUTO"] = df["PRODUTO"].replace(prod_dict, regex=True)
+
+        df = df.groupby(WEEK_KEYS + ["FABRICA", "PRODUTO"])["QTD"].sum().reset_index()
+        df["QTD"] = df["QTD"].astype(int)
+
+        # Os tipos de pasta em colunas
+        df = df.pivot_table(
+            index=WEEK_KEYS + ["FABRICA"], columns="PRODUTO", values="QTD", fill_value=0
+        ).reset_index()
+        df.columns = df.columns.str.title()
+        df["Data_Semana"] = pd.to_datetime(df["Data_Semana"])
+
+        # Pasta batida no total dos turnos, uma coluna de peso por pasta
+        df_week = df_pasta_week[df_pasta_week["Turno"] == TOTAL_SHIFT]
+        df_week = df_week.set_index(WEEK_KEYS + ["Fabrica", "Produto"])["Peso"].unstack(
+            "Produto", fill_value=0
+        )
+        df_week.columns = [f"{pasta}_Peso" for pasta in df_week.columns]
+        df_week = df_week.reset_index().rename(columns={"year": "Year", "week": "Week"})
+        df_week["Data_Semana"] = pd.to_datetime(df_week["Data_Semana"])
+
+        # Pastas consumidas ou batidas (uma pasta sem consumo ou sem batidas fica com 0)
+        produced = [column.removesuffix("_Peso") for column in df_week.columns[4:]]
+        pastas = sorted(set(df.columns[4:]) | set(produced))
+
+        df = df.merge(df_week, on=["Year", "Week", "Data_Semana", "Fabrica"], how="outer")
+
+        for pasta in pastas:
+            for column in (pasta, f"{pasta}_Peso"):
+                if column not in df.columns:
+                    df[column] = 0
+
+        # Sobra e perda de cada tipo de pasta
+        for col in pastas:
+            df[f"{col} Sobra"] = df[f"{col}_Peso"] - df[col]
+            df[f"{col}_%"] = (df[f"{col} Sobra"] / df[f"{col}_Peso"] * 100).replace(
+                [np.inf, -np.inf, np.nan], 0
+            )
+
+        return df.sort_values(["Year", "Week", "Fabrica"], ascending=[False, False, True])
@@ -2,9 +2,8 @@
 Limpa os dados do PCP
 """
 
-from datetime import datetime
-
 import pandas as pd
+from helpers.shift_clock import seconds_of_day, shift_of_seconds
 from pcp.helpers.types_pcp import (
     MASSADA_BOLINHA,
     MASSADA_BOLINHA_ATUALIZADA,
@@ -14,6 +13,27 @@ from pcp.helpers.types_pcp import (
 
 # cSpell: words codigo descricao usuario
 
+# Tipo de batida de cada quantidade de atropelamento
+BATIDA_TYPES = {
+    MASSADA_CHEIA: "Cheia",
+    MASSADA_REPROCESSO: "Reprocesso",
+    MASSADA_BOLINHA: "Bolinha",
+    MASSADA_BOLINHA_ATUALIZADA: "Bolinha",
+}
+
+# Colunas de batidas e peso de cada tipo, na ordem da saída
+BATIDA_COLUMNS = {
+    "Cheia": ("Batidas_Cheia", "Peso_Massa_BC"),
+    "Reprocesso": ("Batidas_Reprocesso", "Peso_Massa_BR"),
+    "Bolinha": ("Batidas_Bolinha", "Peso_Massa_BB"),
+}
+
+# Último segundo do dia, que o PCP sempre contou no NOT (o VES ia até 23:59:58)
+LAST_SECOND = 24 * 3600 - 1
+
+# Chaves das agregações de massa
+MASSA_KEYS = ["Codigo_Maquina", "Descricao_Maquina", "Data_Registro", "Turno", "Fabrica"]
+
 
 class CleanPcpData:
     """
@@ -24,8 +44,7 @@ class CleanPcpData:
 
     Methods:
         __init__: Inicializa a classe CleanPcpData.
-        __get_shift: Retorna o turno com base no horário fornecido.
-        __total_mass: Calcula a massa total com base nos dados fornecidos.
+        __parse_registro: Lê a data e a hora dos registros e atribui o turno.
         clean_massadas_data: Limpa os dados relacionados às massadas no dataframe fornecido.
     """
 
@@ -33,68 +52,28 @@ class CleanPcpData:
         pass
 
     @staticmethod
-    def __get_shift(time: str) -> str:
+    def __parse_registro(df: pd.DataFrame) -> pd.DataFrame:
         """
-        Retorna o turno com base no horário fornecido.
+        Lê a data e a hora dos registros uma única vez (cada valor único é convertido apenas
+        uma vez) e atribui o turno pelo horário, sem apply por linha.
 
         Args:
-            time (str): O horário no formato "HH:MM:SS".
+            df (pd.DataFrame): O dataframe com Data_Registro (YYYYMMDD) e Hora_Registro.
 
         Returns:
-            str: O turno correspondente ao horário fornecido.
-        """
-        if (
-            time >= datetime.strptime("08:00:00", "%H:%M:%S").time()
-            and time < datetime.strptime("16:00:00", "%H:%M:%S").time()
-        ):
-            return "MAT"
-        elif (
-            time >= datetime.strptime("16:00:00", "%H:%M:%S").time()
-            and time < datetime.strptime("23:59:59", "%H:%M:%S").time()
-        ):
-            return "VES"
-        else:
-            return "NOT"
-
-    @staticmethod
-    def __total_mass(df: pd.DataFrame, position: int = None) -> pd.DataFrame:
+            pd.DataFrame: O dataframe com Data_Registro em datetime, Data_Hora (data e hora do
+            registro) e Turno.
         """
-        Calcula a massa total com base nos dados fornecidos.
-
-        Args:
-            df (pd.DataFrame): O dataframe contendo os dados.
-            position (int, optional): A posição dos dados. Padrão é None.
-
-        Returns:
-            pd.DataFrame: O dataframe com a massa total calculada.
-        """
-        df_massadas_total = (
-            df.groupby(["Codigo_Maquina", "Descricao_Maquina", "Data_Registro", "Turno", "Fabrica"])
-            .agg(
-                Usuario_Registro=("Usuario_Registro", "first"),
-                Batidas_Cheia=("Quantidade_Atropelamento", "count"),
-                Peso_Massa_BC=("Quantidade_Atropelamento", "sum"),
-            )
-            .reset_index()
-        )
+        codes, dates = pd.factorize(df["Data_Registro"])
+        day = pd.to_datetime(dates, format="%Y%m%d")[codes]
+        seconds = seconds_of_day(df["Hora_Registro"])
 
-        # Cria um dict para renomear colunas
-        rename_columns = {
-            1: {
-                "Batidas_Cheia": "Batidas_Reprocesso",
-                "Peso_Massa_BC": "Peso_Massa_BR",
-            },
-            2: {
-                "Batidas_Cheia": "Batidas_Bolinha",
-                "Peso_Massa_BC": "Peso_Massa_BB",
-            },
-        }
-
-        # Renomeia as colunas
-        if position is not None:
-            df_massadas_total.rename(columns=rename_columns[position], inplace=True)
+        df["Data_Registro"] = day
+        df["Data_Hora"] = day + pd.to_timedelta(seconds, unit="s")
+        df["Turno"] = shift_of_seconds(seconds)
+        df.loc[seconds == LAST_SECOND, "Turno"] = "NOT"
 
-        return df_massadas_total
+        return df
 
     def clean_massadas_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -106,53 +85,37 @@ class CleanPcpData:
         Returns:
             pd.DataFrame: O dataframe com os dados das massadas limpos.
         """
-        # Atribuir coluna turno com base no horário
-        df["Hora_Registro"] = pd.to_datetime(df["Hora_Registro"], format="%H:%M:%S").dt.time
-        df["Turno"] = df["Hora_Registro"].apply(self.__get_shift)
-
-        # Separando o dataframe conforme a quantidade de atropelamentos
-        df_massadas_cheias = df[df["Quantidade_Atropelamento"] == MASSADA_CHEIA]
-        df_massadas_reprocesso = df[df["Quantidade_Atropelamento"] == MASSADA_REPROCESSO]
-        df_massadas_bolinha = df[
-            (df["Quantidade_Atropelamento"] == (MASSADA_BOLINHA))
-            | (df["Quantidade_Atropelamento"] == (MASSADA_BOLINHA_ATUALIZADA))
-        ]
+        # Data, hora e turno de cada registro
+        df = self.__parse_registro(df)
 
-        # Soma os valores por maquina, data e turno
-        df_massadas_cheias = self.__total_mass(df_massadas_cheias)
-        df_massadas_reprocesso = self.__total_mass(df_massadas_reprocesso, 1)
-        df_massadas_bolinha = self.__total_mass(df_massadas_bolinha, 2)
-
-        # Unir os dataframes de massadas cheias e reprocesso
-        df_massadas = df_massadas_cheias.merge(
-            df_massadas_reprocesso,
-            how="outer",
-            on=[
-                "Codigo_Maquina",
-                "Descricao_Maquina",
-                "Data_Registro",
-                "Turno",
-                "Fabrica",
-                "Usuario_Registro",
-            ],
+        # Tipo de cada batida pela quantidade de atropelamento (outras quantidades são ignoradas)
+        df["Tipo_Batida"] = df["Quantidade_Atropelamento"].map(BATIDA_TYPES)
+
+        # Soma os valores por maquina, data, turno e tipo de batida em uma única agregação
+        # (batidas sem tipo ficam fora, o groupby descarta chaves nulas)
+        df_massadas_total = (
+            df.groupby(MASSA_KEYS + ["Tipo_Batida"])
+            .agg(
+                Usuario_Registro=("Usuario_Registro", "first"),
+                Batidas=("Quantidade_Atropelamento", "count"),
+                Peso=("Quantidade_Atropelamento", "sum"),
+            )
+            .reset_index()
         )
 
-        # Unir o dataframe de massadas com o dataframe de bolinha
-        df_massadas = df_massadas.merge(
-            df_massadas_bolinha,
-            how="outer",
-            on=[
-                "Codigo_Maquina",
-                "Descricao_Maquina",
-                "Data_Registro",
-                "Turno",
-                "Fabrica",
-                "Usuario_Registro",
-            ],
+        # Uma coluna de batidas e peso por tipo (o usuário é o primeiro de cada tipo, como na
+        # junção das agregações separadas)
+        df_massadas = df_massadas_total.pivot(
+            index=MASSA_KEYS + ["Usuario_Registro"],
+            columns="Tipo_Batida",
+            values=["Batidas", "Peso"],
         )
 
-        # Transformar data_registro em datetime no formato ano-mes-dia
-        df_massadas["Data_Registro"] = pd.to_datetime(df_massadas["Data_Registro"], format="%Y%m%d")
+        columns = [(value, tipo) for tipo in BATIDA_COLUMNS for value in ("Batidas", "Peso")]
+        df_massadas = df_massadas.reindex(columns=columns)
+        df_massadas.columns = [name for names in BATIDA_COLUMNS.values() for name in names]
+
+        df_massadas = df_massadas.reset_index()
 
         return df_massadas
 
@@ -167,9 +130,8 @@ class CleanPcpData:
             pd.DataFrame: O dataframe com os dados da pasta limpos.
         """
 
-        # Atribuir coluna turno com base no horário
-        df["Hora_Registro"] = pd.to_datetime(df["Hora_Registro"], format="%H:%M:%S").dt.time
-        df["Turno"] = df["Hora_Registro"].apply(self.__get_shift)
+        # Data, hora e turno de cada registro
+        df = self.__parse_registro(df)
 
         # Soma os valores por maquina, data e turno
         df_massadas_total = (
@@ -191,9 +153,4 @@ class CleanPcpData:
             .reset_index()
         )
 
-        # Transformar data_registro em datetime no formato ano-mes-dia
-        df_massadas_total["Data_Registro"] = pd.to_datetime(
-            df_massadas_total["Data_Registro"], format="%Y%m%d"
-        )
-
         return df_massadas_total
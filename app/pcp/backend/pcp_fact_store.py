@@ -0,0 +1,46 @@
+"""
+Módulo com a tabela de batidas do PCP salva no DB local.
+
+As batidas já lidas do Protheus ficam no DB local e em memória. A cada atualização são lidos
+apenas os registros a partir da última batida (CYV_DTRPBG, CYV_HRRPBG) menos uma janela de
+releitura, que substitui os registros da janela para incluir correções e exclusões tardias.
+"""
+
+# cSpell: words usuario
+from typing import Callable
+
+import pandas as pd
+from pcp.backend.get_pcp_data import semester_start
+from service.fact_store import RESCAN_WINDOW, FactStore
+
+# Ordem das batidas, a mesma da query (CYV_DTRPBG, CYV_CDMQ, CYV_HRRPBG)
+SORT_COLUMNS = ["Data_Registro", "Codigo_Maquina", "Hora_Registro"]
+
+
+class PcpFactStore(FactStore):
+    """
+    Tabela de batidas do semestre com leitura incremental.
+
+    Args:
+        table (str): Tabela do DB local.
+        fetch (Callable): Função de leitura do Protheus, recebe since (data e hora) ou None
+            para ler o semestre inteiro (ex.: GetPcpData().get_batidas_data).
+        rescan_window (pd.Timedelta, optional): Janela relida a cada atualização.
+            Padrão: RESCAN_WINDOW.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        fetch: Callable[[tuple[str, str]], pd.DataFrame],
+        rescan_window: pd.Timedelta = RESCAN_WINDOW,
+    ):
+        super().__init__(
+            table,
+            fetch,
+            date_column="Data_Registro",
+            hour_column="Hora_Registro",
+            sort_columns=SORT_COLUMNS,
+            first_day=semester_start,
+            rescan_window=rescan_window,
+        )
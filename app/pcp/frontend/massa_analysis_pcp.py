@@ -2,11 +2,8 @@
 Módulo para Análise de Massadas e pães e suas perdas ou sobras
 """
 
-from io import StringIO
-
 import dash_bootstrap_components as dbc
 import dash_mantine_components as dmc
-import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -19,11 +16,10 @@ from helpers.my_types import (
     GRID_STR_NUM_COLS,
     TemplateType,
 )
-from pcp.helpers.functions_pcp import AuxFuncPcp
+from pcp.helpers.cache_pcp import pcp_data
 
 # =========================================== Variáveis ========================================== #
 pcp_builder = GridAgGrid()
-afc = AuxFuncPcp()
 
 # ================================================================================================ #
 #                                              LAYOUT                                              #
@@ -43,81 +39,32 @@ layout = dbc.Stack(
     Output("pcp-paes-analysis", "children"),
     [
         Input(ThemeSwitchAIO.ids.switch("theme"), "value"),
-        Input("store-df-caixas-cf", "data"),
-        Input("df_week", "data"),
+        Input("pcp-version", "data"),
     ],
 )
-def update_paes(theme, prod_recheio, week_massa):
+def update_paes(theme, _version):
     """
     Atualiza o card análise de pães.
 
     Args:
         theme (str): O tema atual do dashboard.
-        data (str): Os dados no formato JSON para atualizar o card.
+        _version (float): Versão das tabelas do PCP (atualiza o card quando muda).
 
     Returns:
         dbc.Table: A tabela gerada a partir dos dados fornecidos.
-        Retorna a mensagem "Sem dados disponíveis." se data for None.
+        Retorna a mensagem "Sem dados disponíveis." se a tabela ainda não foi calculada.
     """
 
-    if prod_recheio is None or week_massa is None:
-        return "Sem dados disponíveis."
-
-    # Carregar os dados
-    # pylint: disable=no-member
-    df = pd.read_json(StringIO(prod_recheio), orient="split")
-    df_week = pd.read_json(StringIO(week_massa), orient="split")
-
-    # =============================== Lidando Com Dados Do Recheio =============================== #
-    # Ajustar os dados
-    df_prod_recheio = afc.adjust_prod(df)
-
-    # Cria uma coluna para a quantidade caso o produto contenha "BOL", e a coluna QTD passa a ser 0
-    mask = df_prod_recheio["PRODUTO"].str.contains("BOL ")
-    df_prod_recheio["QTD_BOL"] = mask.astype(int) * df_prod_recheio["QTD"]  # True = 1, False = 0
-    df_prod_recheio["QTD"] = (1 - mask.astype(int)) * df_prod_recheio["QTD"]
-
-    # Agrupar por semana, fabrica
-    df_prod_recheio = (
-        df_prod_recheio.groupby(["year", "week", "Data_Semana", "FABRICA"])
-        .sum()
-        .drop(columns="PRODUTO")
-        .reset_index()
-    )
-
-    # Renomear as colunas
-    df_prod_recheio = df_prod_recheio.rename(columns={"FABRICA": "Fabrica"})
-
-    # =============================== Lidando Com Dados Das Massas =============================== #
-    df_week = (
-        df_week.groupby(["year", "week", "Data_Semana", "Fabrica"])
-        .sum()
-        .drop(columns="Turno")
-        .reset_index()
-    )
-
-    # Reordenar colunas
-    cols = df_week.columns.tolist()
-    cols = cols[:4] + cols[-2:]
-    df_week = df_week[cols]
-
-    # =================================== Unir As Duas Tabelas =================================== #
-    # Garantir que as duas datas sejam datetime
-    df_prod_recheio["Data_Semana"] = pd.to_datetime(df_prod_recheio["Data_Semana"])
-    df_week["Data_Semana"] = pd.to_datetime(df_week["Data_Semana"])
+    df_prod_recheio = pcp_data.get_df("df_massa_analysis")
 
-    df_prod_recheio = df_prod_recheio.merge(
-        df_week, on=["year", "week", "Data_Semana", "Fabrica"], how="outer"
-    )
-
-    # Cria coluna com a diferença entre as quantidades entre baguete e QTD
-    df_prod_recheio["baguete_sobra"] = df_prod_recheio["Baguete_Total"] - df_prod_recheio["QTD"]
-    df_prod_recheio["bolinha_sobra"] = df_prod_recheio["Bolinha_Total"] - df_prod_recheio["QTD_BOL"]
+    if df_prod_recheio is None:
+        return "Sem dados disponíveis."
 
-    # Ordenar a tabela
-    df_prod_recheio = df_prod_recheio.sort_values(
-        ["year", "week", "Fabrica"], ascending=[False, False, True]
-    )
+    # Apenas as colunas exibidas na tabela
+    df_prod_recheio = df_prod_recheio[
+        ["year", "week", "Data_Semana", "Fabrica"]
+        + ["Baguete_Total", "QTD", "baguete_sobra", "Bolinha_Total", "QTD_BOL", "bolinha_sobra"]
+    ]
 
     # Formatar a data para dd/mm
     df_prod_recheio.Data_Semana = df_prod_recheio.Data_Semana.dt.strftime("%d/%m")
@@ -217,100 +164,29 @@ def update_paes(theme, prod_recheio, week_massa):
     Output("pcp-graph-analysis", "children"),
     [
         Input(ThemeSwitchAIO.ids.switch("theme"), "value"),
-        Input("store-df-caixas-cf", "data"),
-        Input("df_week", "data"),
+        Input("pcp-version", "data"),
     ],
 )
-def graph_paes(theme, prod_recheio, week_massa):
+def graph_paes(theme, _version):
     """
     Atualiza o card análise de pães.
 
     Args:
         theme (str): O tema atual do dashboard.
-        data (str): Os dados no formato JSON para atualizar o card.
+        _version (float): Versão das tabelas do PCP (atualiza o card quando muda).
 
     Returns:
         dbc.Table: A tabela gerada a partir dos dados fornecidos.
-        Retorna a mensagem "Sem dados disponíveis." se data for None.
+        Retorna a mensagem "Sem dados disponíveis." se a tabela ainda não foi calculada.
     """
 
-    if prod_recheio is None or week_massa is None:
+    df_prod_recheio = pcp_data.get_df("df_massa_analysis")
+
+    if df_prod_recheio is None:
         return "Sem dados disponíveis."
 
     template = TemplateType.LIGHT if theme else TemplateType.DARK
 
-    # Carregar os dados
-    # pylint: disable=no-member
-    df = pd.read_json(StringIO(prod_recheio), orient="split")
-    df_week = pd.read_json(StringIO(week_massa), orient="split")
-
-    # =============================== Lidando Com Dados Do Recheio =============================== #
-    # Ajustar os dados
-    df_prod_recheio = afc.adjust_prod(df)
-
-    # Cria uma coluna para a quantidade caso o produto contenha "BOL", e a coluna QTD passa a ser 0
-    mask = df_prod_recheio["PRODUTO"].str.contains("BOL ")
-    df_prod_recheio["QTD_BOL"] = mask.astype(int) * df_prod_recheio["QTD"]  # True = 1, False = 0
-    df_prod_recheio["QTD"] = (1 - mask.astype(int)) * df_prod_recheio["QTD"]
-
-    # Agrupar por semana, fabrica
-    df_prod_recheio = (
-        df_prod_recheio.groupby(["year", "week", "Data_Semana", "FABRICA"])
-        .sum()
-        .drop(columns="PRODUTO")
-        .reset_index()
-    )
-
-    # Renomear as colunas
-    df_prod_recheio = df_prod_recheio.rename(columns={"FABRICA": "Fabrica"})
-
-    # =============================== Lidando Com Dados Das Massas =============================== #
-    df_week = (
-        df_week.groupby(["year", "week", "Data_Semana", "Fabrica"])
-        .sum()
-        .drop(columns="Turno")
-        .reset_index()
-    )
-
-    # =================================== Unir As Duas Tabelas =================================== #
-    # Garantir que as duas datas sejam datetime
-    df_prod_recheio["Data_Semana"] = pd.to_datetime(df_prod_recheio["Data_Semana"])
-    df_week["Data_Semana"] = pd.to_datetime(df_week["Data_Semana"])
-
-    df_prod_recheio = df_prod_recheio.merge(
-        df_week, on=["year", "week", "Data_Semana", "Fabrica"], how="outer"
-    )
-
-    # Cria coluna com a diferença entre as quantidades entre baguete e QTD
-    df_prod_recheio["baguete_sobra"] = df_prod_recheio["Baguete_Total"] - df_prod_recheio["QTD"]
-    df_prod_recheio["bolinha_sobra"] = df_prod_recheio["Bolinha_Total"] - df_prod_recheio["QTD_BOL"]
-
-    df_prod_recheio["perda_bag"] = (
-        df_prod_recheio.baguete_sobra / df_prod_recheio.Baguete_Total * 100
-    )
-    df_prod_recheio["perda_bol"] = (
-        df_prod_recheio.bolinha_sobra / df_prod_recheio.Bolinha_Total * 100
-    )
-
-    # Separar a perda de baguete da fábrica 1 e 2
-    df_prod_recheio["perda_bag_fab1"] = np.where(
-        df_prod_recheio["Fabrica"] == "Fab. 1", df_prod_recheio["perda_bag"], 0
-    )
-    df_prod_recheio["perda_bag_fab2"] = np.where(
-        df_prod_recheio["Fabrica"] == "Fab. 2", df_prod_recheio["perda_bag"], 0
-    )
-
-    # Preencher os valores nulos com 0
-    df_prod_recheio["perda_bol"] = df_prod_recheio["perda_bol"].fillna(0)
-
-    # Em perda_bol, lidar com valores -inf
-    df_prod_recheio["perda_bol"] = df_prod_recheio["perda_bol"].replace(-np.inf, 0)
-
-    # Ordenar a tabela
-    df_prod_recheio = df_prod_recheio.sort_values(
-        ["year", "week", "Fabrica"], ascending=[False, False, True]
-    )
-
     # Filtrar os dados mantendo apenas os últimos 3 meses
     df_prod_recheio = df_prod_recheio[
         df_prod_recheio["Data_Semana"] >= pd.Timestamp.now() - pd.DateOffset(months=3)
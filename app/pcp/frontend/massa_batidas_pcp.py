@@ -2,8 +2,6 @@
 Módulo com dados de Batidas de massa.
 """
 
-from io import StringIO
-
 import dash_bootstrap_components as dbc
 import dash_mantine_components as dmc
 import pandas as pd
@@ -11,10 +9,13 @@ from components import segmented_btn
 from components.grid_aggrid import GridAgGrid
 from dash import Input, Output, callback, html
 from dash_bootstrap_templates import ThemeSwitchAIO
+from pcp.helpers.cache_pcp import pcp_data
+from pcp.helpers.functions_pcp import AuxFuncPcp
 
 # =========================================== Variáveis ========================================== #
 pcp_builder = GridAgGrid()
 seg_btn = segmented_btn.SegmentedBtn()
+afc = AuxFuncPcp()
 
 # ================================================================================================ #
 #                                              LAYOUT                                              #
@@ -53,29 +54,27 @@ layout = dbc.Stack(
 @callback(
     Output("massadas", "children"),
     [
-        Input("df_sum", "data"),
+        Input("pcp-version", "data"),
         Input(ThemeSwitchAIO.ids.switch("theme"), "value"),
         Input("btn-pcp-batidas", "value"),
     ],
 )
-def update_massadas_card(data, theme, choice):
+def update_massadas_card(_version, theme, choice):
     """
     Atualiza o conteúdo do card de massadas.
 
     Args:
-        data (str): Os dados no formato JSON para atualizar o card.
+        _version (float): Versão das tabelas do PCP (atualiza o card quando muda).
 
     Returns:
         dbc.Table: A tabela gerada a partir dos dados fornecidos.
-        Retorna a mensagem "Sem dados disponíveis." se data for None.
+        Retorna a mensagem "Sem dados disponíveis." se a tabela ainda não foi calculada.
     """
 
-    if data is None:
-        return "Sem dados disponíveis."
+    df = pcp_data.get_df("df_sum")
 
-    # Carregar os dados
-    # pylint: disable=no-member
-    df = pd.read_json(StringIO(data), orient="split")
+    if df is None:
+        return "Sem dados disponíveis."
 
     # Renomear as colunas
     df.columns = [
@@ -93,11 +92,8 @@ def update_massadas_card(data, theme, choice):
     ]
 
     # ----------------------- Filtro ----------------------- #
-    df_filter = {
-        "Turno": df,
-        "Total": df.groupby(["Data", "Fábrica"]).sum().drop(columns="Turno").reset_index(),
-    }
-    df = df_filter[choice]
+    # Turnos ou total dos turnos (linhas pré-calculadas no cache)
+    df = afc.shift_view(df, choice)
 
     # Ordenar por data desc e fabrica crescente
     df = df.sort_values(["Data", "Fábrica"], ascending=[False, True])
@@ -115,27 +111,27 @@ def update_massadas_card(data, theme, choice):
 @callback(
     Output("massadas-week", "children"),
     [
-        Input("df_week", "data"),
+        Input("pcp-version", "data"),
         Input(ThemeSwitchAIO.ids.switch("theme"), "value"),
         Input("btn-pcp-batidas", "value"),
     ],
 )
-def update_massadas_week_card(data, theme, choice):
+def update_massadas_week_card(_version, theme, choice):
     """
     Atualiza o cartão de semana de massadas com os dados fornecidos.
 
     Parâmetros:
-    - data: str ou None. Os dados a serem exibidos no cartão.
-        Se for None, exibe a mensagem "Sem dados disponíveis."
+    - _version: float. Versão das tabelas do PCP (atualiza o card quando muda).
+        Se a tabela ainda não foi calculada, exibe a mensagem "Sem dados disponíveis."
 
     Retorna:
     - table: dbc.Table. A tabela gerada a partir dos dados fornecidos.
     """
 
-    if data is None:
-        return "Sem dados disponíveis."
+    df = pcp_data.get_df("df_week")
 
-    df = pd.read_json(StringIO(data), orient="split")
+    if df is None:
+        return "Sem dados disponíveis."
 
     df.columns = [
         "Ano",
@@ -154,15 +150,8 @@ def update_massadas_week_card(data, theme, choice):
     ]
 
     # ----------------------- Filtro ----------------------- #
-    # pylint: disable=no-member
-    df_filter = {
-        "Turno": df,
-        "Total": df.groupby(["Ano", "Semana", "Data Inicial", "Fábrica"])
-        .sum()
-        .drop(columns="Turno")
-        .reset_index(),
-    }
-    df = df_filter[choice]
+    # Turnos ou total dos turnos (linhas pré-calculadas no cache)
+    df = afc.shift_view(df, choice)
 
     # Ordenar por ano, semana e fábrica
     df = df.sort_values(["Ano", "Semana", "Fábrica"], ascending=[False, False, True])
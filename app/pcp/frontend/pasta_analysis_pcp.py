@@ -1,11 +1,7 @@
 """Módulo para Análise de Pasta."""
 
-import time
-from io import StringIO
-
 import dash_bootstrap_components as dbc
 import dash_mantine_components as dmc
-import numpy as np
 import pandas as pd
 import plotly.express as px
 from components.grid_aggrid import GridAgGrid
@@ -17,13 +13,79 @@ from helpers.my_types import (
     GRID_STR_NUM_COLS,
     TemplateType,
 )
-from pcp.helpers.functions_pcp import AuxFuncPcp
-from pcp.helpers.types_pcp import RENDIMENTO_PASTA_PAO
+from pcp.helpers.cache_pcp import pcp_data
 
 # =========================================== Variáveis ========================================== #
 
 pcp_builder = GridAgGrid()
-afc = AuxFuncPcp()
+
+# Ordem das pastas na tabela e no gráfico, as demais pastas vêm em seguida
+PASTA_ORDER = ["Tradicional", "Picante", "Cebola", "Doce"]
+
+# ============================================ Funções =========================================== #
+
+
+def _pasta_names(df: pd.DataFrame) -> list[str]:
+    """
+    Pastas presentes na análise de pasta (uma coluna "{Pasta} Sobra" por pasta).
+
+    Args:
+        df (pd.DataFrame): A análise de pasta (AnalysisPcpData.get_pasta_consumption).
+
+    Returns:
+        list[str]: Os nomes das pastas, na ordem de PASTA_ORDER.
+    """
+
+    pastas = [column.removesuffix(" Sobra") for column in df.columns if column.endswith(" Sobra")]
+    order = {pasta: position for position, pasta in enumerate(PASTA_ORDER)}
+
+    return sorted(pastas, key=lambda pasta: order.get(pasta, len(order)))
+
+
+def _pasta_group(pasta: str, class_rules: dict) -> dict:
+    """
+    Grupo de colunas (produzido, consumido e diferença) de uma pasta na tabela.
+
+    Args:
+        pasta (str): Nome da pasta (ex.: "Tradicional").
+        class_rules (dict): Regras de estilo da coluna de diferença.
+
+    Returns:
+        dict: A definição do grupo de colunas.
+    """
+
+    name = pasta.replace("_", " ")
+
+    return {
+        "headerName": name,
+        "headerTooltip": f"Produção de pasta {name.lower()}",
+        "headerClass": "center-aligned-group-header",
+        "children": [
+            {
+                "headerName": "Produzido",
+                "field": f"{pasta}_Peso",
+                "headerTooltip": f"Produção de pasta {name.lower()}(kg)",
+                **GRID_FORMAT_NUMBER_BR,
+                **GRID_STR_NUM_COLS,
+            },
+            {
+                "headerName": "Consumido",
+                "field": pasta,
+                "headerTooltip": f"Consumo de pasta {name.lower()}(kg)",
+                **GRID_FORMAT_NUMBER_BR,
+                **GRID_STR_NUM_COLS,
+            },
+            {
+                "headerName": "Diferença",
+                "field": f"{pasta} Sobra",
+                "headerTooltip": f"Diferença de pasta {name.lower()}(kg)",
+                **GRID_FORMAT_NUMBER_BR,
+                **GRID_STR_NUM_COLS,
+                **class_rules,
+            },
+        ],
+    }
+
 
 # ================================================================================================ #
 #                                              LAYOUT                                              #
@@ -45,103 +107,34 @@ layout = dbc.Stack(
     Output("pcp-pasta-analysis", "children"),
     [
         Input(ThemeSwitchAIO.ids.switch("theme"), "value"),
-        Input("store-df-caixas-cf", "data"),
-        Input("df_pasta_week", "data"),
+        Input("pcp-version", "data"),
     ],
 )
-def func_name(theme, prod_recheio, week_massa):
+def func_name(theme, _version):
     """
     Atualiza o card análise de pasta.
 
     Args:
         theme (str): O tema atual do dashboard.
-        data (str): Os dados no formato JSON para atualizar o card.
+        _version (float): Versão das tabelas do PCP (atualiza o card quando muda).
 
     Returns:
         dbc.Table: A tabela gerada a partir dos dados fornecidos.
-        Retorna a mensagem "Sem dados disponíveis." se data for None.
+        Retorna a mensagem "Sem dados disponíveis." se a tabela ainda não foi calculada.
     """
 
-    if prod_recheio is None or week_massa is None:
-        return "Sem dados disponíveis."
-
-    # Carregar os dados
-    # pylint: disable=no-member
-    df_prod = pd.read_json(StringIO(prod_recheio), orient="split")
-    df_week = pd.read_json(StringIO(week_massa), orient="split")
-
-    # =============================== Lidando Com Dados Do Recheio =============================== #
-    # Ajustar os dados de produção
-    df_prod_recheio = afc.adjust_prod(df_prod)
-
-    # Calcula quantidade de massa gasta por produto
-    df_prod_recheio.QTD = df_prod_recheio.QTD * df_prod_recheio.PRODUTO.map(RENDIMENTO_PASTA_PAO)
-
-    # Mapeamento de substituições
-    prod_dict = {
-        r".*TRD.*": "Tradicional",
-        r".*CEB.*": "Cebola",
-        r".*PIC.*": "Picante",
-        r".*DOCE.*": "Doce",
-    }
-
-    # Usar expressão regular para substituir com base no mapeamento
-    df_prod_recheio.PRODUTO = df_prod_recheio.PRODUTO.replace(prod_dict, regex=True)
-
-    # Agrupar por semana, fabrica, dia, produto
-    df_prod_recheio = (
-        df_prod_recheio.groupby(["year", "week", "Data_Semana", "FABRICA", "PRODUTO"])
-        .sum()
-        .reset_index()
-    )
-
-    # Transformar coluna QTD em inteiro
-    df_prod_recheio.QTD = df_prod_recheio.QTD.astype(int)
-
-    # Transformar os produtos em colunas
-    df_prod_recheio = df_prod_recheio.pivot_table(
-        index=["year", "week", "Data_Semana", "FABRICA"],
-        columns="PRODUTO",
-        values="QTD",
-        fill_value=0,
-    ).reset_index()
-
-    # Renomear colunas com capitalização
-    df_prod_recheio.columns = df_prod_recheio.columns.str.title()
-
-    # =================================== Lidando Com Bisnagas =================================== #
-
-    # ================================= Dados De Batidas De Pasta ================================ #
-    df_week = (
-        df_week.groupby(["year", "week", "Data_Semana", "Fabrica"])
-        .sum()
-        .drop(columns="Turno")
-        .reset_index()
-    )
-
-    df_week.columns = df_week.columns.str.title()
+    df_prod_recheio = pcp_data.get_df("df_pasta_analysis")
 
-    # ==================================== Junção Das Tabelas ==================================== #
-    # Garantir que as duas datas sejam datetime
-    df_prod_recheio.Data_Semana = pd.to_datetime(df_prod_recheio.Data_Semana)
-    df_week.Data_Semana = pd.to_datetime(df_week.Data_Semana)
-
-    # Unir as duas tabelas
-    df_prod_recheio = df_prod_recheio.merge(
-        df_week, on=["Year", "Week", "Data_Semana", "Fabrica"], how="outer"
-    )
-
-    time.sleep(1)
+    if df_prod_recheio is None:
+        return "Sem dados disponíveis."
 
-    # ============================ Diferença Entre Produção E Consumo ============================ #
-    # Cria coluna com a diferença entre as quantidades produzidas e consumidas
-    for col in df_prod_recheio.columns[4:8]:
-        df_prod_recheio[f"{col} Sobra"] = df_prod_recheio[f"{col}_Peso"] - df_prod_recheio[col]
+    pastas = _pasta_names(df_prod_recheio)
 
-    # Ordenar a tabela
-    df_prod_recheio = df_prod_recheio.sort_values(
-        ["Year", "Week", "Fabrica"], ascending=[False, False, True]
-    )
+    # Apenas as colunas exibidas na tabela
+    df_prod_recheio = df_prod_recheio[
+        ["Year", "Week", "Data_Semana", "Fabrica"]
+        + [f"{pasta}{suffix}" for pasta in pastas for suffix in ["_Peso", "", " Sobra"]]
+    ]
 
     # ============================== Definições De Estilo E Colunas ============================== #
     # Ajustar a data para dd/mm
@@ -182,122 +175,7 @@ def func_name(theme, prod_recheio, week_massa):
             "maxWidth": 125,
             "minWidth": 100,
         },
-        {
-            "headerName": "Tradicional",
-            "headerTooltip": "Produção de pasta tradicional",
-            "headerClass": "center-aligned-group-header",
-            "children": [
-                {
-                    "headerName": "Produzido",
-                    "field": "Tradicional_Peso",
-                    "headerTooltip": "Produção de pasta tradicional(kg)",
-                    **GRID_FORMAT_NUMBER_BR,
-                    **GRID_STR_NUM_COLS,
-                },
-                {
-                    "headerName": "Consumido",
-                    "field": "Tradicional",
-                    "headerTooltip": "Consumo de pasta tradicional(kg)",
-                    **GRID_FORMAT_NUMBER_BR,
-                    **GRID_STR_NUM_COLS,
-                },
-                {
-                    "headerName": "Diferença",
-                    "field": "Tradicional Sobra",
-                    "headerTooltip": "Diferença de pasta tradicional(kg)",
-                    **GRID_FORMAT_NUMBER_BR,
-                    **GRID_STR_NUM_COLS,
-                    **class_rules,
-                },
-            ],
-        },
-        {
-            "headerName": "Picante",
-            "headerTooltip": "Produção de pasta picante",
-            "headerClass": "center-aligned-group-header",
-            "children": [
-                {
-                    "headerName": "Produzido",
-                    "field": "Picante_Peso",
-                    "headerTooltip": "Produção de pasta picante(kg)",
-                    **GRID_FORMAT_NUMBER_BR,
-                    **GRID_STR_NUM_COLS,
-                },
-                {
-                    "headerName": "Consumido",
-                    "field": "Picante",
-                    "headerTooltip": "Consumo de pasta picante(kg)",
-                    **GRID_FORMAT_NUMBER_BR,
-                    **GRID_STR_NUM_COLS,
-                },
-                {
-                    "headerName": "Diferença",
-                    "field": "Picante Sobra",
-                    "headerTooltip": "Diferença de pasta picante(kg)",
-                    **GRID_FORMAT_NUMBER_BR,
-                    **GRID_STR_NUM_COLS,
-                    **class_rules,
-                },
-            ],
-        },
-        {
-            "headerName": "Cebola",
-            "headerTooltip": "Produção de pasta de cebola",
-            "headerClass": "center-aligned-group-header",
-            "children": [
-                {
-                    "headerName": "Produzido",
-                    "field": "Cebola_Peso",
-                    "headerTooltip": "Produção de pasta de cebola(kg)",
-                    **GRID_FORMAT_NUMBER_BR,
-                    **GRID_STR_NUM_COLS,
-                },
-                {
-                    "headerName": "Consumido",
-                    "field": "Cebola",
-                    "headerTooltip": "Consumo de pasta de cebola(kg)",
-                    **GRID_FORMAT_NUMBER_BR,
-                    **GRID_STR_NUM_COLS,
-                },
-                {
-                    "headerName": "Diferença",
-                    "field": "Cebola Sobra",
-                    "headerTooltip": "Diferença de pasta de cebola(kg)",
-                    **GRID_FORMAT_NUMBER_BR,
-                    **GRID_STR_NUM_COLS,
-                    **class_rules,
-                },
-            ],
-        },
-        {
-            "headerName": "Doce",
-            "headerTooltip": "Produção de pasta doce",
-            "headerClass": "center-aligned-group-header",
-            "children": [
-                {
-                    "headerName": "Produzido",
-                    "field": "Doce_Peso",
-                    "headerTooltip": "Produção de pasta doce(kg)",
-                    **GRID_FORMAT_NUMBER_BR,
-                    **GRID_STR_NUM_COLS,
-                },
-                {
-                    "headerName": "Consumido",
-                    "field": "Doce",
-                    "headerTooltip": "Consumo de pasta doce(kg)",
-                    **GRID_FORMAT_NUMBER_BR,
-                    **GRID_STR_NUM_COLS,
-                },
-                {
-                    "headerName": "Diferença",
-                    "field": "Doce Sobra",
-                    "headerTooltip": "Diferença de pasta doce(kg)",
-                    **GRID_FORMAT_NUMBER_BR,
-                    **GRID_STR_NUM_COLS,
-                    **class_rules,
-                },
-            ],
-        },
+        *[_pasta_group(pasta, class_rules) for pasta in pastas],
     ]
 
     # Título da tabela
@@ -314,113 +192,29 @@ def func_name(theme, prod_recheio, week_massa):
     Output("pcp-pasta-analysis-graph", "children"),
     [
         Input(ThemeSwitchAIO.ids.switch("theme"), "value"),
-        Input("store-df-caixas-cf", "data"),
-        Input("df_pasta_week", "data"),
+        Input("pcp-version", "data"),
     ],
 )
-def graph(theme, prod_recheio, week_massa):
+def graph(theme, _version):
     """
     Atualiza o card análise de pasta.
 
     Args:
         theme (str): O tema atual do dashboard.
-        data (str): Os dados no formato JSON para atualizar o card.
+        _version (float): Versão das tabelas do PCP (atualiza o card quando muda).
 
     Returns:
         dbc.Table: A tabela gerada a partir dos dados fornecidos.
-        Retorna a mensagem "Sem dados disponíveis." se data for None.
+        Retorna a mensagem "Sem dados disponíveis." se a tabela ainda não foi calculada.
     """
 
-    if prod_recheio is None or week_massa is None:
+    df_prod_recheio = pcp_data.get_df("df_pasta_analysis")
+
+    if df_prod_recheio is None:
         return "Sem dados disponíveis."
 
     template = TemplateType.LIGHT if theme else TemplateType.DARK
 
-    # Carregar os dados
-    # pylint: disable=no-member
-    df_prod = pd.read_json(StringIO(prod_recheio), orient="split")
-    df_week = pd.read_json(StringIO(week_massa), orient="split")
-
-    # =============================== Lidando Com Dados Do Recheio =============================== #
-    # Ajustar os dados de produção
-    df_prod_recheio = afc.adjust_prod(df_prod)
-
-    # Calcula quantidade de massa gasta por produto
-    df_prod_recheio.QTD = df_prod_recheio.QTD * df_prod_recheio.PRODUTO.map(RENDIMENTO_PASTA_PAO)
-
-    # Mapeamento de substituições
-    prod_dict = {
-        r".*TRD.*": "Tradicional",
-        r".*CEB.*": "Cebola",
-        r".*PIC.*": "Picante",
-        r".*DOCE.*": "Doce",
-    }
-
-    # Usar expressão regular para substituir com base no mapeamento
-    df_prod_recheio.PRODUTO = df_prod_recheio.PRODUTO.replace(prod_dict, regex=True)
-
-    # Agrupar por semana, fabrica, dia, produto
-    df_prod_recheio = (
-        df_prod_recheio.groupby(["year", "week", "Data_Semana", "FABRICA", "PRODUTO"])
-        .sum()
-        .reset_index()
-    )
-
-    # Transformar coluna QTD em inteiro
-    df_prod_recheio.QTD = df_prod_recheio.QTD.astype(int)
-
-    # Transformar os produtos em colunas
-    df_prod_recheio = df_prod_recheio.pivot_table(
-        index=["year", "week", "Data_Semana", "FABRICA"],
-        columns="PRODUTO",
-        values="QTD",
-        fill_value=0,
-    ).reset_index()
-
-    # Renomear colunas com capitalização
-    df_prod_recheio.columns = df_prod_recheio.columns.str.title()
-
-    # =================================== Lidando Com Bisnagas =================================== #
-
-    # ================================= Dados De Batidas De Pasta ================================ #
-    df_week = (
-        df_week.groupby(["year", "week", "Data_Semana", "Fabrica"])
-        .sum()
-        .drop(columns="Turno")
-        .reset_index()
-    )
-
-    df_week.columns = df_week.columns.str.title()
-
-    # ==================================== Junção Das Tabelas ==================================== #
-    # Garantir que as duas datas sejam datetime
-    df_prod_recheio.Data_Semana = pd.to_datetime(df_prod_recheio.Data_Semana)
-    df_week.Data_Semana = pd.to_datetime(df_week.Data_Semana)
-
-    # Unir as duas tabelas
-    df_prod_recheio = df_prod_recheio.merge(
-        df_week, on=["Year", "Week", "Data_Semana", "Fabrica"], how="outer"
-    )
-
-    time.sleep(1)
-
-    # ============================ Diferença Entre Produção E Consumo ============================ #
-    # Cria coluna com a diferença entre as quantidades produzidas e consumidas
-    for col in df_prod_recheio.columns[4:8]:
-        df_prod_recheio[f"{col} Sobra"] = df_prod_recheio[f"{col}_Peso"] - df_prod_recheio[col]
-        df_prod_recheio[f"{col}_%"] = (
-            df_prod_recheio[f"{col} Sobra"] / df_prod_recheio[f"{col}_Peso"] * 100
-        )
-        # Remover os possíveis valores infinitos ou NaN
-        df_prod_recheio[f"{col}_%"] = df_prod_recheio[f"{col}_%"].replace(
-            [np.inf, -np.inf, np.nan], 0
-        )
-
-    # Ordenar a tabela
-    df_prod_recheio = df_prod_recheio.sort_values(
-        ["Year", "Week", "Fabrica"], ascending=[False, False, True]
-    )
-
     # Filtrar os dados mantendo apenas os últimos 3 meses
     df_prod_recheio = df_prod_recheio[
         df_prod_recheio["Data_Semana"] >= pd.Timestamp.now() - pd.DateOffset(months=3)
@@ -434,7 +228,7 @@ def graph(theme, prod_recheio, week_massa):
     fig = px.bar(
         df_prod_recheio,
         x="Data_Semana",
-        y=["Tradicional_%", "Picante_%", "Cebola_%", "Doce_%"],
+        y=[f"{pasta}_%" for pasta in _pasta_names(df_prod_recheio)],
         barmode="group",
         title="Perda de Pasta por Tipo de Pasta",
         labels={
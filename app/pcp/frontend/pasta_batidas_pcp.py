@@ -1,7 +1,5 @@
 """Módulo com dados de Batidas de Pasta."""
 
-from io import StringIO
-
 import dash_bootstrap_components as dbc
 import dash_mantine_components as dmc
 import pandas as pd
@@ -9,10 +7,13 @@ from components import segmented_btn
 from components.grid_aggrid import GridAgGrid
 from dash import Input, Output, callback, html
 from dash_bootstrap_templates import ThemeSwitchAIO
+from pcp.helpers.cache_pcp import pcp_data
+from pcp.helpers.functions_pcp import AuxFuncPcp
 
 # =========================================== Variáveis ========================================== #
 create_grid = GridAgGrid()
 seg_btn = segmented_btn.SegmentedBtn()
+afc = AuxFuncPcp()
 
 # ================================================================================================ #
 #                                              LAYOUT                                              #
@@ -50,42 +51,26 @@ layout = dmc.Stack(
 @callback(
     Output("batidas-pasta", "children"),
     [
-        Input("df_pasta", "data"),
+        Input("pcp-version", "data"),
         Input(ThemeSwitchAIO.ids.switch("theme"), "value"),
         Input("btn-pcp-batidas", "value"),
     ],
 )
-def update_batidas_pasta(data, theme, choice):
+def update_batidas_pasta(_version, theme, choice):
     """
     Atualiza o conteúdo do card de batidas de pasta.
     """
-    if data is None:
+    df = pcp_data.get_pasta_pivot("df_pasta")
+
+    if df is None:
         return "Sem dados disponíveis"
 
-    # pylint: disable=no-member
-    df = pd.read_json(StringIO(data), orient="split")
-
-    # Renomear colunas
-    df.columns = [
-        "Data",
-        "Turno",
-        "Fabrica",
-        "Cebola Batidas",
-        "Doce Batidas",
-        "Picante Batidas",
-        "Tradicional Batidas",
-        "Cebola Peso",
-        "Doce Peso",
-        "Picante Peso",
-        "Tradicional Peso",
-    ]
+    # Renomear colunas (uma coluna de batidas e uma de peso por pasta)
+    df = df.rename(columns={"Data_Registro": "Data"})
+    df.columns = [column.replace("_", " ") for column in df.columns]
 
-    # Filtrar por escolha
-    filter_choice = {
-        "Turno": df,
-        "Total": df.groupby(["Data", "Fabrica"]).sum().drop(columns="Turno").reset_index(),
-    }
-    df = filter_choice[choice]
+    # Filtrar por escolha (turnos ou total dos turnos, pré-calculados no cache)
+    df = afc.shift_view(df, choice)
 
     # Ajustar o formato da data
     df["Data"] = pd.to_datetime(df["Data"]).dt.strftime("%d/%m")
@@ -102,20 +87,19 @@ def update_batidas_pasta(data, theme, choice):
 @callback(
     Output("batidas-pasta-week", "children"),
     [
-        Input("df_pasta_week", "data"),
+        Input("pcp-version", "data"),
         Input(ThemeSwitchAIO.ids.switch("theme"), "value"),
         Input("btn-pcp-batidas", "value"),
     ],
 )
-def update_pasta_week(data, theme, choice):
+def update_pasta_week(_version, theme, choice):
     """
     Atualiza o conteúdo do card de batidas de pasta semanal.
     """
-    if data is None:
-        return "Sem dados disponíveis"
+    df = pcp_data.get_pasta_pivot("df_pasta_week")
 
-    # pylint: disable=no-member
-    df = pd.read_json(StringIO(data), orient="split")
+    if df is None:
+        return "Sem dados disponíveis"
 
     # Renomear colunas substituindo _ por espaço
     df.columns = [column.replace("_", " ") for column in df.columns]
@@ -131,16 +115,8 @@ def update_pasta_week(data, theme, choice):
         inplace=True,
     )
 
-    # Filtrar por escolha
-    filter_choice = {
-        "Turno": df,
-        "Total": df.groupby(["Ano", "Semana", "Data Inicial", "Fábrica"])
-        .sum()
-        .drop(columns="Turno")
-        .reset_index(),
-    }
-
-    df = filter_choice[choice]
+    # Filtrar por escolha (turnos ou total dos turnos, pré-calculados no cache)
+    df = afc.shift_view(df, choice)
 
     # Ordenar por Ano e Semana e Fábrica
     df = df.sort_values(["Ano", "Semana", "Fábrica"], ascending=[False, False, True])
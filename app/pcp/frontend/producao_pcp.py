@@ -2,19 +2,15 @@
 Módulo para Análise de Massadas e pães e suas perdas ou sobras
 """
 
-from io import StringIO
-
 import dash_bootstrap_components as dbc
 import dash_mantine_components as dmc
-import pandas as pd
 from components.grid_aggrid import GridAgGrid
 from dash import Input, Output, callback, html
 from dash_bootstrap_templates import ThemeSwitchAIO
-from pcp.helpers.functions_pcp import AuxFuncPcp
+from pcp.helpers.cache_pcp import pcp_data
 
 # =========================================== Variáveis ========================================== #
 pcp_builder = GridAgGrid()
-afc = AuxFuncPcp()
 
 # ================================================================================================ #
 #                                              LAYOUT                                              #
@@ -37,30 +33,25 @@ layout = dbc.Stack(
 # ========================================= Pães ======================================== #
 @callback(
     Output("pcp-paes-prod", "children"),
-    [Input(ThemeSwitchAIO.ids.switch("theme"), "value"), Input("store-df-caixas-cf", "data")],
+    [Input(ThemeSwitchAIO.ids.switch("theme"), "value"), Input("pcp-version", "data")],
 )
-def update_paes(theme, data):
+def update_paes(theme, _version):
     """
     Atualiza o card de teste de pães.
 
     Args:
         theme (str): O tema atual do dashboard.
-        data (str): Os dados no formato JSON para atualizar o card.
+        _version (float): Versão das tabelas do PCP (atualiza o card quando muda).
 
     Returns:
         dbc.Table: A tabela gerada a partir dos dados fornecidos.
-        Retorna a mensagem "Sem dados disponíveis." se data for None.
+        Retorna a mensagem "Sem dados disponíveis." se a tabela ainda não foi calculada.
     """
 
-    if data is None:
-        return "Sem dados disponíveis."
-
-    # Carregar os dados
-    # pylint: disable=no-member
-    df = pd.read_json(StringIO(data), orient="split")
+    df_cleaned = pcp_data.get_df("df_paes_week")
 
-    # Limpar os dados
-    df_cleaned = afc.adjust_prod(df)
+    if df_cleaned is None:
+        return "Sem dados disponíveis."
 
     # Cria coluna com caixas de pães
     df_cleaned["Pães(cx)"] = df_cleaned.QTD / 10
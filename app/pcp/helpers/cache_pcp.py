@@ -1,11 +1,32 @@
 """
 Este módulo cria uma classe para armazenar os dados de massa do PCP.
+
+A cada atualização as batidas de massa e de pasta são lidas juntas (uma única leitura do
+Protheus) e as tabelas usadas pelas páginas do PCP são calculadas uma única vez (dia e semana,
+por turno e com as linhas de total, e as análises de consumo), assim os callbacks apenas filtram
+tabelas prontas.
+
+As tabelas ficam no servidor (cache + cópia em memória por versão). O navegador recebe apenas a
+versão dos dados e o recorte exibido por cada callback.
 """
 
+from io import StringIO
+from threading import Lock
+from time import time
+from typing import Callable
+
+import pandas as pd
 from helpers.cache import CacheManager
 from pcp.backend.analysis_pcp_data import AnalysisPcpData
 from pcp.backend.clean_pcp_data import CleanPcpData
-from pcp.backend.get_pcp_data import GetPcpData
+from pcp.backend.get_pcp_data import MASSA_MACHINES, PASTA_MACHINES, GetPcpData
+from pcp.backend.pcp_fact_store import PcpFactStore
+from pcp.helpers.functions_pcp import AuxFuncPcp
+
+from app import app
+
+# Chave com a versão das tabelas do PCP, muda a cada atualização
+PCP_VERSION_KEY = "pcp_version"
 
 
 class PcpDataCache(CacheManager):
@@ -16,31 +37,106 @@ class PcpDataCache(CacheManager):
         app: Instância da aplicação Flask.
 
     Attributes:
-        __get_data: Método para obter os dados do PCP.
+        __get_data: Tabela incremental das batidas de massa e de pasta.
         __get_analysis: Instância da classe AnalysisPcpData para análise dos dados.
         __clean_data: Método para limpar os dados do PCP.
 
     Methods:
-        cache_massa_data: Método para armazenar os dados do PCP no cache.
+        get_df: Retorna uma tabela do PCP da versão atual.
+        get_pasta_pivot: Retorna uma tabela de pasta com colunas por pasta da versão atual.
+        cache_pcp_data: Método para armazenar os dados de massa e de pasta no cache.
     """
 
     def __init__(self, app) -> None:
-        self.__get_data = GetPcpData().get_massa_data
-        self.__get_pasta_data = GetPcpData().get_pasta_data
+        get_pcp_data = GetPcpData()
+        self.__get_data = PcpFactStore("pcp_batidas", get_pcp_data.get_batidas_data).load
         self.__get_analysis = AnalysisPcpData()
         self.__clean_data = CleanPcpData().clean_massadas_data
         self.__clean_pasta_data = CleanPcpData().clean_pasta_data
+        self.__frames = {}
+        self.__frames_lock = Lock()
         super().__init__(app)
 
-    def cache_massa_data(self) -> None:
+    def __frame(
+        self, key: str, view: Callable[[pd.DataFrame], pd.DataFrame] = None
+    ) -> pd.DataFrame | None:
+        """
+        Tabela (ou visão da tabela) da versão atual, mantida em memória até a próxima versão.
+        """
+
+        version = self.cache.get(PCP_VERSION_KEY)
+        name = key if view is None else (key, view.__name__)
+
+        with self.__frames_lock:
+            frame_version, df = self.__frames.get(name, (None, None))
+
+            if df is None or frame_version != version:
+                df = self.cache.get(key)
+                if df is not None and view is not None:
+                    df = view(df)
+                self.__frames[name] = (version, df)
+
+        return df
+
+    def get_df(self, key: str) -> pd.DataFrame | None:
+        """
+        Retorna uma tabela do PCP. A tabela é lida do cache apenas uma vez por versão, as leituras
+        seguintes usam a cópia em memória.
+
+        Args:
+            key (str): Chave da tabela no cache (ex.: "df_sum").
+
+        Returns:
+            pd.DataFrame | None: Cópia da tabela (os callbacks podem alterá-la) ou None se ainda
+            não foi calculada.
+        """
+
+        df = self.__frame(key)
+
+        return df.copy() if df is not None else None
+
+    def get_pasta_pivot(self, key: str) -> pd.DataFrame | None:
+        """
+        Retorna uma tabela de fatos da pasta com uma coluna de batidas e uma de peso por pasta
+        (AnalysisPcpData.pasta_pivot). O pivot é feito sob demanda, uma vez por versão.
+
+        Args:
+            key (str): Chave da tabela de fatos no cache ("df_pasta" ou "df_pasta_week").
+
+        Returns:
+            pd.DataFrame | None: Cópia da visão ou None se a tabela ainda não foi calculada.
+        """
+
+        df = self.__frame(key, AnalysisPcpData.pasta_pivot)
+
+        return df.copy() if df is not None else None
+
+    def __get_paes_week(self) -> pd.DataFrame | None:
+        """
+        Pães produzidos por semana, a partir das caixas por semana do cache principal.
+        """
+
+        caixas = self.cache.get("df_caixas_week")
+
+        if caixas is None:
+            return None
+
+        return AuxFuncPcp.adjust_prod(pd.read_json(StringIO(caixas), orient="split"))
+
+    def __set(self, key: str, df: pd.DataFrame) -> None:
+        # O DataFrame é salvo direto (pickle), sem conversão para JSON
+        self.cache.set(key, df)
+
+    def cache_pcp_data(self) -> None:
         """
         Armazena os dados do PCP no cache.
 
         Steps:
-        1. Obtém os dados do banco de dados.
-        2. Limpa os dados obtidos.
-        3. Realiza a análise dos dados.
-        4. Salva os dados no cache.
+        1. Obtém as batidas de massa e de pasta do banco de dados (apenas as batidas novas, as
+           demais estão no DB local).
+        2. Separa as batidas pela máquina (MASSA_MACHINES e PASTA_MACHINES).
+        3. Limpa e analisa cada parte e salva as tabelas no cache.
+        4. Publica uma nova versão das tabelas.
 
         Returns:
             None
@@ -48,40 +144,68 @@ class PcpDataCache(CacheManager):
         # Lê os dados do banco de dados
         data = self.__get_data()
 
-        # Limpa os dados
-        data_cleaned = self.__clean_data(data)
+        machine = data["Codigo_Maquina"].astype(str)
+        df_paes = self.__get_paes_week()
 
-        # Analisa os dados
-        df_sum = self.__get_analysis.get_massa_sum(data_cleaned)
-        df_week = self.__get_analysis.get_week_data(df_sum)
+        self.__cache_massa_data(data[machine.str.startswith(MASSA_MACHINES)], df_paes)
+        self.__cache_pasta_data(data[machine.str.startswith(PASTA_MACHINES)], df_paes)
 
-        # Salva os dados no cache
-        self.cache.set("df_sum", df_sum.to_json(date_format="iso", orient="split"))
-        self.cache.set("df_week", df_week.to_json(date_format="iso", orient="split"))
+        # Nova versão, os callbacks releem as tabelas
+        self.cache.set(PCP_VERSION_KEY, time())
 
-    def cache_pasta_data(self) -> None:
+    def __cache_massa_data(self, data: pd.DataFrame, df_paes: pd.DataFrame | None) -> None:
+        """
+        Limpa e analisa as batidas de massa (dia e semana com o total dos turnos e a análise de
+        consumo de pães) e salva as tabelas no cache.
         """
-        Realiza o cache dos dados relacionados à pasta.
+        # Limpa os dados
+        data_cleaned = self.__clean_data(data.reset_index(drop=True))
 
-        Lê os dados do banco de dados, limpa os dados, analisa os dados e salva os dados no cache.
+        # Analisa os dados
+        analysis = self.__get_analysis
+        df_sum = analysis.get_massa_sum(data_cleaned)
+        df_week = analysis.get_week_data(df_sum)
 
-        Parâmetros:
-        - self: A instância do objeto.
+        # Linhas de total dos turnos
+        df_sum = analysis.add_shift_total(df_sum, ["Data_Registro", "Fabrica"])
+        df_week = analysis.add_shift_total(df_week, ["year", "week", "Data_Semana", "Fabrica"])
 
-        Retorno:
-        - None
-        """
+        # Salva os dados no cache
+        self.__set("df_sum", df_sum)
+        self.__set("df_week", df_week)
 
-        # Lê os dados do banco de dados
-        data = self.__get_pasta_data()
+        # Análise de consumo de pães
+        if df_paes is not None:
+            self.__set("df_paes_week", df_paes)
+            self.__set("df_massa_analysis", analysis.get_massa_analysis(df_week, df_paes))
 
+    def __cache_pasta_data(self, data: pd.DataFrame, df_paes: pd.DataFrame | None) -> None:
+        """
+        Limpa e analisa as batidas de pasta (dia e semana com o total dos turnos e a análise de
+        consumo de pasta) e salva as tabelas no cache.
+        """
         # Limpa os dados
-        data_cleaned = self.__clean_pasta_data(data)
+        data_cleaned = self.__clean_pasta_data(data.reset_index(drop=True))
 
         # Analisa os dados
-        df_pasta = self.__get_analysis.get_pasta_analysis(data_cleaned)
-        df_pasta_week = self.__get_analysis.get_pasta_week_analysis(df_pasta)
+        analysis = self.__get_analysis
+        df_pasta = analysis.get_pasta_analysis(data_cleaned)
+        df_pasta_week = analysis.get_pasta_week_analysis(df_pasta)
 
-        # Salva os dados no cache
-        self.cache.set("df_pasta", df_pasta.to_json(date_format="iso", orient="split"))
-        self.cache.set("df_pasta_week", df_pasta_week.to_json(date_format="iso", orient="split"))
+        # Linhas de total dos turnos
+        df_pasta = analysis.add_shift_total(df_pasta, ["Data_Registro", "Fabrica", "Produto"])
+        df_pasta_week = analysis.add_shift_total(
+            df_pasta_week, ["year", "week", "Data_Semana", "Fabrica", "Produto"]
+        )
+
+        # Salva os dados no cache (formato longo, as visões por pasta são feitas sob demanda)
+        self.__set("df_pasta", df_pasta)
+        self.__set("df_pasta_week", df_pasta_week)
+
+        # Análise de consumo de pasta
+        if df_paes is not None:
+            self.__set("df_pasta_analysis", analysis.get_pasta_consumption(df_pasta_week, df_paes))
+
+
+# Instância usada pela página e pelos callbacks do PCP
+pcp_data = PcpDataCache(app)
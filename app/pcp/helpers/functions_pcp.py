@@ -2,8 +2,16 @@
 Funções que pode ser reaproveitadas em outros módulos.
 """
 
+import numpy as np
 import pandas as pd
-from pcp.helpers.types_pcp import PAO_POR_BANDEJA
+from pcp.helpers.types_pcp import PAO_POR_BANDEJA, TOTAL_SHIFT
+
+# ======================================= Dimensão Produtos ====================================== #
+# Código do produto é a posição do nome em PRODUCTS, -1 para produtos sem rendimento cadastrado
+PRODUCTS = pd.Index(list(PAO_POR_BANDEJA), name="PRODUTO")
+
+# Pães por bandeja de cada código, a última posição (código -1) fica sem rendimento
+PAES_POR_BANDEJA = np.append(np.fromiter(PAO_POR_BANDEJA.values(), dtype=float), np.nan)
 
 
 class AuxFuncPcp:
@@ -15,53 +23,59 @@ class AuxFuncPcp:
         pass
 
     @staticmethod
-    def adjust_prod(df: pd.DataFrame) -> pd.DataFrame:
+    def product_codes(produto: pd.Series) -> np.ndarray:
         """
-        Limpa os dados de produção.
+        Código de cada produto na dimensão de produtos (PRODUCTS).
+        Cada nome distinto é limpo e procurado uma única vez.
 
         Args:
-            df (pd.DataFrame): O DataFrame contendo os dados de produção.
+            produto (pd.Series): Nomes dos produtos, como lidos do Protheus.
 
         Returns:
-            pd.DataFrame: O DataFrame limpo.
+            np.ndarray: Código de cada linha, -1 para produtos fora da dimensão.
+        """
+
+        codes, names = pd.factorize(produto)
+        product = PRODUCTS.get_indexer(names.astype(str).str.strip())
+
+        # Nomes nulos (código -1 do factorize) também ficam fora da dimensão
+        return np.append(product, -1)[codes]
+
+    @staticmethod
+    def adjust_prod(df: pd.DataFrame) -> pd.DataFrame:
         """
-        # cSpell: words usuario emissao
-        # Remover colunas desnecessárias
-        df = df.drop(columns=["MAQUINA", "UNIDADE", "LOTE", "USUARIO"])
-        df.PRODUTO = df.PRODUTO.str.strip()
+        Calcula os pães produzidos por semana.
 
+        Args:
+            df (pd.DataFrame): Caixas por semana, produto e fábrica (CaixasStore.week).
+
+        Returns:
+            pd.DataFrame: year, week, Data_Semana, PRODUTO, FABRICA e QTD (pães).
+        """
         # ============================== Calcula Quantidade De Pães ============================== #
-        # Transforma caixas em bandejas
-        df.QTD = df.QTD * 10
-
-        # Transforma bandejas em pães
-        df.QTD = df.QTD * df.PRODUTO.map(PAO_POR_BANDEJA)
-
-        # ======================================== Agrupa ======================================== #
-        df = df.groupby(["FABRICA", "PRODUTO", "EMISSAO"]).QTD.sum().reset_index()
-
-        # Ajustar a data de yyyymmdd para o formato yyyy-mm-dd
-        df.EMISSAO = pd.to_datetime(df.EMISSAO, format="%Y%m%d")
-
-        # Nova coluna dia_semana, ajustando para começar no domingo
-        df["Data_Semana"] = (df.EMISSAO.dt.weekday + 1) % 7
-
-        # Nova coluna com a data da semana
-        df["Data_Semana"] = df.EMISSAO - pd.to_timedelta(df.Data_Semana, unit="d")
-
-        # Agrupar por semana, fabrica e produto
-        df = (
-            df.groupby(
-                [
-                    df.Data_Semana.dt.isocalendar().year,
-                    df.Data_Semana.dt.isocalendar().week,
-                    "Data_Semana",
-                    "PRODUTO",
-                    "FABRICA",
-                ]
-            )
-            .QTD.sum()
-            .reset_index()
-        )
-
-        return df
+        # Transforma caixas em bandejas e bandejas em pães (produtos sem rendimento ficam com 0)
+        qtd = df.QTD * 10 * PAES_POR_BANDEJA[AuxFuncPcp.product_codes(df.PRODUTO)]
+
+        return df.assign(
+            Data_Semana=pd.to_datetime(df.Data_Semana),
+            QTD=qtd.fillna(0),
+        )[["year", "week", "Data_Semana", "PRODUTO", "FABRICA", "QTD"]]
+
+    @staticmethod
+    def shift_view(df: pd.DataFrame, choice: str) -> pd.DataFrame:
+        """
+        Filtra uma tabela com as linhas de total dos turnos (AnalysisPcpData.add_shift_total).
+
+        Args:
+            df (pd.DataFrame): A tabela com a coluna Turno.
+            choice (str): "Turno" para as linhas por turno ou "Total" para o total dos turnos
+                (sem a coluna Turno).
+
+        Returns:
+            pd.DataFrame: As linhas da visão escolhida.
+        """
+
+        if choice == "Total":
+            return df[df["Turno"] == TOTAL_SHIFT].drop(columns="Turno")
+
+        return df[df["Turno"] != TOTAL_SHIFT]
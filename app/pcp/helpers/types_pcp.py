@@ -2,6 +2,9 @@
 Módulo para tipos do PCP
 """
 
+# Turno das linhas com o total dos turnos nas tabelas do PCP
+TOTAL_SHIFT = "Total"
+
 MASSADA_CHEIA = 153
 MASSADA_REPROCESSO = 114.75
 MASSADA_BOLINHA = 77
@@ -5,6 +5,7 @@ Módulo para tratar e salvar no DB local os dados dos últimos 6 meses.
 import pandas as pd
 from database.connection_local import ConnectionLocal
 from database.get_data import GetData
+from helpers.df_schema import apply_schema, log_memory_report
 from service.clean_data import CleanData
 from service.join_data import JoinData
 from service.service_info_ihm import ServiceInfoIHM
@@ -75,4 +76,8 @@ class BigData:
             # Lê os dados do DB
             df = conn.get_query("SELECT * FROM big_data")
 
-        return df
+        # O DB local guarda texto, reaplica os tipos compactos (df_big fica em memória)
+        df_typed = apply_schema(df)
+        log_memory_report("big_data", df, df_typed)
+
+        return df_typed
@@ -0,0 +1,115 @@
+"""
+Módulo com as caixas produzidas (entradas na câmara fria) lidas do Protheus.
+
+As caixas ficam no DB local com leitura incremental por D3_EMISSAO (FactStore) e retenção
+móvel. A cada atualização são calculadas as agregações usadas pelo gerenciamento (dia e turno)
+e pelo PCP (semana).
+"""
+
+# cSpell: words emissao
+from typing import Callable
+
+import pandas as pd
+from helpers.df_schema import TURNO_DTYPE
+from helpers.shift_clock import seconds_of_day, shift_of_seconds, week_calendar
+from service.fact_store import FactStore
+
+# Retenção das caixas, cobre o histórico do PCP (semestre iniciado até 12 meses atrás)
+CAIXAS_RETENTION = pd.DateOffset(years=1)
+
+# Dias relidos a cada atualização (estornos e apontamentos atrasados)
+CAIXAS_RESCAN = pd.Timedelta(days=1)
+
+# Chaves das agregações
+DAY_KEYS = ["EMISSAO", "TURNO", "FABRICA", "PRODUTO"]
+WEEK_KEYS = ["year", "week", "Data_Semana", "PRODUTO", "FABRICA"]
+
+
+def retention_start() -> str:
+    """
+    Retorna o primeiro dia da retenção das caixas.
+
+    Returns:
+        str: A data no formato do Protheus (YYYYMMDD).
+    """
+
+    return (pd.Timestamp.today().normalize() - CAIXAS_RETENTION).strftime("%Y%m%d")
+
+
+class CaixasStore:
+    """
+    Caixas produzidas com leitura incremental e agregações por dia, turno e semana.
+
+    Args:
+        fetch (Callable): Leitura do Protheus a partir de uma data (YYYYMMDD)
+            (ex.: GetData().get_protheus_caixas_data).
+    """
+
+    def __init__(self, fetch: Callable[[str], pd.DataFrame]):
+        self.__store = FactStore(
+            "protheus_caixas",
+            lambda since: fetch(since or retention_start()),
+            date_column="EMISSAO",
+            sort_columns=["EMISSAO", "HORA"],
+            first_day=retention_start,
+            rescan_window=CAIXAS_RESCAN,
+        )
+
+    @staticmethod
+    def day_shift(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Caixas por dia, turno, fábrica e produto.
+
+        Args:
+            df (pd.DataFrame): As caixas lidas do Protheus.
+
+        Returns:
+            pd.DataFrame: EMISSAO (YYYYMMDD), TURNO, FABRICA, PRODUTO e QTD (caixas).
+        """
+
+        # Caixas sem hora de apontamento ficam no primeiro turno do dia
+        seconds = seconds_of_day(df["HORA"].fillna("00:00:00"))
+
+        df = df.assign(
+            PRODUTO=df["PRODUTO"].str.strip(),
+            TURNO=pd.Categorical(shift_of_seconds(seconds), dtype=TURNO_DTYPE),
+        )
+
+        return df.groupby(DAY_KEYS, observed=True)["QTD"].sum().reset_index()
+
+    @staticmethod
+    def week(df_day: pd.DataFrame) -> pd.DataFrame:
+        """
+        Caixas por semana (iniciada no domingo), produto e fábrica.
+
+        Args:
+            df_day (pd.DataFrame): Caixas por dia (day_shift).
+
+        Returns:
+            pd.DataFrame: year e week (ISO da data inicial), Data_Semana, PRODUTO, FABRICA e QTD
+            (caixas).
+        """
+
+        # Semana (iniciada no domingo) de cada dia, pela dimensão calendário
+        df = pd.concat([df_day, week_calendar(df_day["EMISSAO"], "%Y%m%d")], axis=1)
+
+        return df.groupby(WEEK_KEYS)["QTD"].sum().reset_index()
+
+    def load(self) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Atualiza as caixas e retorna as agregações.
+
+        Returns:
+            tuple[pd.DataFrame, pd.DataFrame]: Caixas por dia e turno (day_shift) e por semana
+            (week).
+        """
+
+        df = self.__store.load()
+
+        # Sem dados locais e sem leitura do Protheus
+        if df.empty:
+            df = pd.DataFrame(columns=["PRODUTO", "QTD", "EMISSAO", "HORA", "FABRICA"])
+
+        df_day = self.day_shift(df)
+
+        return df_day, self.week(df_day)
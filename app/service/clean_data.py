@@ -9,7 +9,9 @@ from datetime import time
 # cSpell:words usuario, solucao, dayofweek, sabado
 import numpy as np
 import pandas as pd
-from helpers.my_types import PESO_BANDEJAS, PESO_SACO
+from helpers.df_schema import apply_schema, log_memory_report
+from helpers.discard_normalization import normalize_discard
+from helpers.shift_clock import seconds_of_day, shift_calendar
 
 
 class CleanData:
@@ -112,13 +114,13 @@ class CleanData:
         df = df[~mask]
 
         # Ajustar caso o turno "VES" passe de 00:00, para o dia anterior 23:59
-        mask = (
-            (df["turno"] == "VES")
-            & (df["hora_registro"] < time(0, 5, 0))
-            & (df["hora_registro"] > time(0, 0, 0))
+        data_hora = df["data_registro"] + pd.to_timedelta(
+            seconds_of_day(df["hora_registro"]), unit="s"
         )
+        data_producao = shift_calendar(data_hora, df["turno"])["data_producao"]
+        mask = data_producao.notna() & (data_producao != df["data_registro"])
 
-        df.loc[mask, "data_registro"] = df.loc[mask, "data_registro"] - pd.Timedelta(days=1)
+        df.loc[mask, "data_registro"] = data_producao[mask]
         df.loc[mask, "hora_registro"] = time(23, 59, 59)
 
         # Reordenar o dataframe
@@ -172,50 +174,33 @@ class CleanData:
         return df
 
     def __clean_prod_discard_data(self) -> pd.DataFrame:
+        """
+        Converts the tray weights into trays, assigns the shift by the record hour and sums the
+        discard by line, machine, date and shift.
+        """
 
-        # Cria uma cópia do dataframe
-        df = self.df_prod_discard.copy()
-
-        # Descartar coluna recno
-        df = df.drop(columns=["recno"])
-
-        # Arredondar valores para float com 3 casas decimais
-        df.bdj_vazias = df.bdj_vazias.round(3)
-        df.bdj_retrabalho = df.bdj_retrabalho.round(3)
-        df.descarte_paes_pasta = df.descarte_paes_pasta.round(3)
-        df.descarte_paes = df.descarte_paes.round(3)
-        df.descarte_pasta = df.descarte_pasta.round(3)
-
-        # Calcular descarte bandejas, caso o valor seja maior que 0
-        df.loc[df.bdj_vazias > 0, "bdj_vazias"] = (
-            (df.bdj_vazias - PESO_SACO) / PESO_BANDEJAS
-        ).round(0)
-        df.loc[df.bdj_retrabalho > 0, "bdj_retrabalho"] = (
-            (df.bdj_retrabalho - PESO_SACO) / PESO_BANDEJAS
-        ).round(0)
-
-        # Transforma em inteiro
-        df.bdj_vazias = df.bdj_vazias.astype(int)
-        df.bdj_retrabalho = df.bdj_retrabalho.astype(int)
-
-        # Se o valor for menor que 0, transforma em 0
-        df.loc[df.bdj_vazias < 0, "bdj_vazias"] = 0
-        df.loc[df.bdj_retrabalho < 0, "bdj_retrabalho"] = 0
-
-        # Definir cria coluna auxiliar com o turno (MAT, VES, NOT) muda a cada 8 horas (8, 16, 0)
-        df["turno"] = df.hora_registro.apply(lambda x: x.hour) // 8
-        df.turno = df.turno.map({0: "NOT", 1: "MAT", 2: "VES"})
-        df = df.drop(columns=["hora_registro"])
-
-        # Agrupar por turno e data e linha
-        df = (
-            df.groupby(["linha", "maquina_id", "data_registro", "turno"])
-            .sum()
-            .round(3)
-            .reset_index()
-        )
+        return normalize_discard(self.df_prod_discard)
 
-        return df
+    @staticmethod
+    def __apply_schema(df: pd.DataFrame, name: str) -> pd.DataFrame:
+        """
+        Applies the compact dtypes schema and logs the memory saved.
+
+        Args:
+            df (pd.DataFrame): The cleaned DataFrame.
+            name (str): The DataFrame name used in the log.
+
+        Returns:
+            pd.DataFrame: The DataFrame with categorical and small int columns.
+        """
+
+        if df.empty:
+            return df
+
+        df_typed = apply_schema(df)
+        log_memory_report(name, df, df_typed)
+
+        return df_typed
 
     def clean_data(self) -> tuple:
         """
@@ -258,4 +243,10 @@ class CleanData:
         if not self.df_prod_discard.empty:
             self.df_prod_discard = self.__clean_prod_discard_data()
 
+        # Tipos compactos (categorias e inteiros pequenos)
+        self.df_ihm = self.__apply_schema(self.df_ihm, "df_ihm")
+        self.df_info = self.__apply_schema(self.df_info, "df_info")
+        self.df_info_production = self.__apply_schema(self.df_info_production, "df_production")
+        self.df_prod_discard = self.__apply_schema(self.df_prod_discard, "df_prod_discard")
+
         return self.df_ihm, self.df_info, self.df_info_production, self.df_prod_discard
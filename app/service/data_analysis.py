@@ -2,11 +2,15 @@
 Modulo que faz a análise dos dados de paradas e produção.
 """
 
-from datetime import datetime
-
 import numpy as np
 import pandas as pd
 from helpers.my_types import CICLOS_ESPERADOS, IndicatorType
+from helpers.shift_clock import ShiftClock
+from service.discount_rules import DiscountRules
+from service.indicator_store import FROZEN_KEYS, IndicatorStore, source_fingerprint
+
+# Colunas que identificam cada registro de produção
+KEY_COLUMNS = ["maquina_id", "linha", "data_registro", "turno"]
 
 
 class DataAnalysis:
@@ -16,11 +20,22 @@ class DataAnalysis:
     Attributes:
     df_stops (pd.DataFrame): DataFrame with stops data.
     df_prod (pd.DataFrame): DataFrame with production data.
+    shift_clock (ShiftClock): Clock used for the current shift. Defaults to the system clock.
+    indicator_store (IndicatorStore): Store with the frozen closed shifts. When given, only the
+        shifts not frozen are calculated. Defaults to None (everything is calculated).
     """
 
-    def __init__(self, df_stops: pd.DataFrame, df_prod: pd.DataFrame):
+    def __init__(
+        self,
+        df_stops: pd.DataFrame,
+        df_prod: pd.DataFrame,
+        shift_clock: ShiftClock = None,
+        indicator_store: IndicatorStore = None,
+    ):
         self.df_stops = df_stops
         self.df_prod = df_prod
+        self.shift_clock = shift_clock or ShiftClock()
+        self.indicator_store = indicator_store
 
         # Dicionário com descontos de Eficiência
         self.desc_eff = {
@@ -59,6 +74,21 @@ class DataAnalysis:
         # Dicionário com o que afeta o reparo
         self.afeta_rep = ["Manutenção", "Troca de Produtos"]
 
+        # Motor de regras com os descontos de todos os indicadores
+        self.discount_rules = DiscountRules(
+            {
+                IndicatorType.EFFICIENCY: (self.desc_eff, self.not_eff),
+                IndicatorType.PERFORMANCE: (self.desc_perf, self.not_perf),
+                IndicatorType.REPAIR: (self.desc_rep, self.afeta_rep),
+            }
+        )
+
+        # Tabela base e indicadores de df_stops, calculados uma única vez
+        self.__base = None
+        self.__indicators = {}
+        self.__frozen = None
+        self.__fingerprint = None
+
     def get_discount(
         self,
         df: pd.DataFrame,
@@ -70,109 +100,191 @@ class DataAnalysis:
         Calcula o desconto de eficiência, performance ou reparo.
         """
 
-        # Cria uma coluna com o desconto padrão
-        df = df.copy()
-        df["desconto"] = 0
+        rules = DiscountRules({indicator: (desc_dict, skip_list)})
 
-        # Caso o motivo, problema ou causa não afete o indicador, o desconto é igual a tempo
-        mask = df[["motivo", "problema", "causa"]].apply(lambda x: x.isin(skip_list).any(), axis=1)
-        df.loc[mask, "desconto"] = 0 if indicator == IndicatorType.REPAIR else df["tempo"]
+        return rules.get_discount(df, indicator)
 
-        # Cria um dict para indicadores
-        indicator_dict = {
-            IndicatorType.EFFICIENCY: df,
-            IndicatorType.PERFORMANCE: df[~mask],
-            IndicatorType.REPAIR: df[mask],
-        }
+    def __get_frozen(self) -> dict[IndicatorType, pd.DataFrame]:
+        """
+        Lê uma única vez os turnos congelados do indicator_store.
+        """
 
-        df = indicator_dict[indicator].reset_index(drop=True)
+        if self.__frozen is None:
+            self.__frozen = self.indicator_store.get_frozen(self.get_source_fingerprint())
 
-        # Aplica o desconto de acordo com as colunas "motivo" ou "problema" ou "causa"
-        for key, value in desc_dict.items():
-            mask = (
-                df[["motivo", "problema", "causa"]]
-                .apply(lambda x, key=key: x.str.contains(key, case=False, na=False))
-                .any(axis=1)
-            )
-            df.loc[mask, "desconto"] = value
+        return self.__frozen
 
-        # Caso o desconto seja maior que o tempo, o desconto deve ser igual ao tempo
-        df.loc[:, "desconto"] = df[["desconto", "tempo"]].min(axis=1)
+    def get_source_fingerprint(self) -> pd.DataFrame:
+        """
+        Impressão dos dados de paradas e produção de cada turno, usada para saber se um turno
+        congelado mudou na origem.
 
-        # Calcula o excedente
-        df.loc[:, "excedente"] = (df["tempo"] - df["desconto"]).clip(lower=0)
+        Returns:
+            pd.DataFrame: Impressão por data, turno e linha (source_fingerprint).
+        """
 
-        return df
+        if self.__fingerprint is None:
+            self.__fingerprint = source_fingerprint(self.df_stops, self.df_prod)
 
-    def __get_elapsed_time(self, turno: str) -> int:
+        return self.__fingerprint
+
+    def __get_open_data(self) -> tuple[pd.DataFrame, pd.DataFrame]:
         """
-        Calcula o tempo decorrido do turno.
+        Retorna os dados de paradas e produção dos turnos que não estão congelados.
         """
 
-        # Agora
-        now = datetime.now()
+        if self.indicator_store is None:
+            return self.df_stops, self.df_prod
+
+        frozen = self.__get_frozen()[IndicatorType.EFFICIENCY]
+
+        if frozen.empty:
+            return self.df_stops, self.df_prod
+
+        keys = frozen[FROZEN_KEYS].drop_duplicates()
 
-        if turno == "MAT" and 8 <= now.hour < 16:
-            elapsed_time = now - datetime(now.year, now.month, now.day, 8, 0, 0)
-        elif turno == "VES" and 16 <= now.hour < 24:
-            elapsed_time = now - datetime(now.year, now.month, now.day, 16, 0, 0)
-        elif turno == "NOT" and 0 <= now.hour < 8:
-            elapsed_time = now - datetime(now.year, now.month, now.day, 0, 0, 0)
-        else:
-            return 480
+        def not_frozen(df: pd.DataFrame) -> pd.DataFrame:
+            mask = pd.merge(df[FROZEN_KEYS], keys, how="left", indicator=True)["_merge"]
+            return df[(mask == "left_only").to_numpy()]
 
-        return elapsed_time.total_seconds() / 60
+        return not_frozen(self.df_stops), not_frozen(self.df_prod)
 
-    def __get_expected_production_time(self, df: pd.DataFrame) -> pd.DataFrame:
+    def __merge_frozen(self, indicator: IndicatorType, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Calcula o tempo esperado de produção.
+        Une os turnos congelados ao indicador calculado, na ordem dos dados de produção.
         """
 
-        df["tempo_esperado"] = df.apply(
-            lambda row: (
-                np.floor(self.__get_elapsed_time(row["turno"]) - row["desconto"])
-                if row["data_registro"].date() == pd.to_datetime("today").date()
-                else 480 - row["desconto"]
-            ),
-            axis=1,
+        frozen = self.__get_frozen()[indicator]
+
+        if frozen.empty:
+            return df
+
+        df = pd.concat([frozen[df.columns], df], ignore_index=True)
+
+        # Posição de cada registro nos dados de produção
+        position = self.df_prod[KEY_COLUMNS].assign(position=range(len(self.df_prod)))
+        position = position.drop_duplicates(subset=KEY_COLUMNS)
+        position = pd.merge(df[KEY_COLUMNS], position, on=KEY_COLUMNS, how="left")["position"]
+
+        order = np.argsort(position.fillna(len(self.df_prod)).to_numpy(), kind="stable")
+
+        return df.iloc[order].reset_index(drop=True)
+
+    def __get_base_table(self) -> pd.DataFrame:
+        """
+        Cria a tabela base por máquina, linha, data e turno com tempo, desconto e excedente dos
+        três indicadores. As regras de desconto e o agrupamento são feitos uma única vez.
+        """
+
+        if self.__base is not None:
+            return self.__base
+
+        df, df_prod = self.__get_open_data()
+        tempo = df["tempo"].to_numpy()
+
+        # Colunas de cada indicador, zeradas onde a parada não entra no indicador
+        columns = {}
+        for indicator, (keep, desconto, excedente) in self.discount_rules.evaluate(df).items():
+            suffix = indicator.value
+            columns[f"tempo_{suffix}"] = np.where(keep, tempo, 0)
+            columns[f"desconto_{suffix}"] = np.where(keep, desconto, 0)
+            columns[f"excedente_{suffix}"] = np.where(keep, excedente, 0)
+
+        # Agrupa para ter o valor total de desconto
+        df = df[KEY_COLUMNS].assign(**columns)
+        df = df.groupby(KEY_COLUMNS, observed=True).sum().reset_index()
+
+        # Une com os dados de produção
+        df = pd.merge(df_prod, df, on=KEY_COLUMNS, how="left")
+
+        # Lida com valores nulos
+        num_cols = df.select_dtypes(include="number").columns
+        df[num_cols] = df[num_cols].fillna(0)
+
+        self.__base = df
+
+        return df
+
+    def __get_indicator_base(self, indicator: IndicatorType, excedente: str) -> pd.DataFrame:
+        """
+        Retorna a tabela base com as colunas do indicador e o tempo esperado de produção.
+        """
+
+        suffix = indicator.value
+        base = self.__get_base_table()
+
+        df = base[self.df_prod.columns].assign(
+            **{
+                "tempo": base[f"tempo_{suffix}"],
+                "desconto": base[f"desconto_{suffix}"],
+                excedente: base[f"excedente_{suffix}"],
+            }
         )
 
+        # Nova coluna para tempo esperado de produção
+        df["tempo_esperado"] = self.shift_clock.expected_production_time(df)
+
         return df
 
-    def get_eff_data(self) -> pd.DataFrame:
+    def __get_scheduled_stops(self) -> pd.DataFrame:
         """
-        Calcula o desconto de eficiência.
+        Retorna as datas, turnos e linhas com parada programada o turno inteiro.
         """
 
         df = self.df_stops
-        df_prod = self.df_prod
 
-        # Calcula o desconto de eficiência
-        df = self.get_discount(df, self.desc_eff, self.not_eff, IndicatorType.EFFICIENCY)
-        ciclo_ideal = CICLOS_ESPERADOS
+        # Datas e turnos onde a causa está em not_eff e o tempo é igual a 480
+        mask = (df["causa"].isin(["Sem Produção", "Backup"])) & (df["tempo"] == 480)
 
-        # Agrupa para ter o valor total de desconto
-        df = (
-            df.groupby(["maquina_id", "linha", "data_registro", "turno"], observed=False)
-            .agg(
-                tempo=("tempo", "sum"),
-                desconto=("desconto", "sum"),
-                excedente=("excedente", "sum"),
-            )
-            .reset_index()
+        return df[mask][["data_registro", "turno", "linha"]].assign(programada=True)
+
+    def __adjust_scheduled_stops(self, df: pd.DataFrame, column: str) -> pd.DataFrame:
+        """
+        Torna o indicador np.nan e o tempo esperado 0 onde a parada é programada.
+        """
+
+        # Merge dos dataframes
+        df = pd.merge(
+            df, self.__get_scheduled_stops(), how="left", on=["data_registro", "turno", "linha"]
         )
 
-        # Une os dois dataframes
-        df = pd.merge(df_prod, df, on=["maquina_id", "linha", "data_registro", "turno"], how="left")
+        # Se a parada for programada, o indicador é np.nan
+        df.loc[df["programada"] == 1, column] = np.nan
+        df.loc[df["programada"] == 1, "tempo_esperado"] = 0
 
-        # Lida com valores nulos
-        df = df.fillna(0)
+        # Remove a coluna de controle
+        return df.drop(columns="programada")
 
-        # Nova coluna para tempo esperado de produção
-        df = self.__get_expected_production_time(df)
+    def __get_indicator(self, indicator: IndicatorType) -> pd.DataFrame:
+        """
+        Retorna o DataFrame do indicador. Cada indicador é calculado uma única vez.
+        """
+
+        if indicator not in self.__indicators:
+            calc = {
+                IndicatorType.EFFICIENCY: self.__calc_eff_data,
+                IndicatorType.PERFORMANCE: self.__calc_perf_data,
+                IndicatorType.REPAIR: self.__calc_repair_data,
+            }
+            df = calc[indicator]()
+
+            # Turnos congelados não são recalculados
+            if self.indicator_store is not None:
+                df = self.__merge_frozen(indicator, df)
+
+            self.__indicators[indicator] = df
+
+        return self.__indicators[indicator].copy()
+
+    def __calc_eff_data(self) -> pd.DataFrame:
+        """
+        Calcula a eficiência a partir da tabela base.
+        """
+
+        df = self.__get_indicator_base(IndicatorType.EFFICIENCY, "excedente")
 
         # Nova coluna para produção esperada
-        df["producao_esperada"] = (df["tempo_esperado"] * ciclo_ideal) * 2
+        df["producao_esperada"] = (df["tempo_esperado"] * CICLOS_ESPERADOS) * 2
 
         # Nova coluna para eficiência
         df["eficiencia"] = (df["total_produzido"] / df["producao_esperada"]).round(3)
@@ -209,42 +321,12 @@ class DataAnalysis:
 
         return df
 
-    def get_perf_data(self) -> pd.DataFrame:
+    def __calc_perf_data(self) -> pd.DataFrame:
         """
-        Calcula o desconto de performance.
+        Calcula a performance a partir da tabela base.
         """
 
-        df = self.df_stops
-        df_prod = self.df_prod
-
-        # Dataframe com datas e turnos onde a causa está em not_eff e o tempo é igual a 480
-        mask = (df["causa"].isin(["Sem Produção", "Backup"])) & (df["tempo"] == 480)
-        paradas_programadas = df[mask][
-            ["data_registro", "turno", "linha"]
-        ]  # Para performance ser np.nan
-
-        # Calcula o desconto de performance e filtra linhas que não afetam a performance
-        df = self.get_discount(df, self.desc_perf, self.not_perf, IndicatorType.PERFORMANCE)
-
-        # Agrupa para ter o valor total de desconto
-        df = (
-            df.groupby(["maquina_id", "linha", "data_registro", "turno"], observed=False)
-            .agg(
-                tempo=("tempo", "sum"),
-                desconto=("desconto", "sum"),
-                afeta=("excedente", "sum"),
-            )
-            .reset_index()
-        )
-
-        # Une os dois dataframes
-        df = pd.merge(df_prod, df, on=["maquina_id", "linha", "data_registro", "turno"], how="left")
-
-        # Lida com valores nulos
-        df = df.fillna(0)
-
-        # Coluna com tempo esperado de produção
-        df = self.__get_expected_production_time(df)
+        df = self.__get_indicator_base(IndicatorType.PERFORMANCE, "afeta")
 
         # Coluna de Performance
         df["performance"] = (df["afeta"] / df["tempo_esperado"]).round(2)
@@ -253,18 +335,7 @@ class DataAnalysis:
         df["performance"] = df["performance"].replace([np.inf, -np.inf], np.nan).fillna(0)
 
         # ============================ Ajuste Para Paradas Programadas =========================== #
-        # Criar uma coluna de controle em paradas_programadas
-        paradas_programadas["programada"] = True
-
-        # Merge dos dataframes
-        df = pd.merge(df, paradas_programadas, how="left", on=["data_registro", "turno", "linha"])
-
-        # Se a parada for programada, a performance é np.nan
-        df.loc[df["programada"] == 1, "performance"] = np.nan
-        df.loc[df["programada"] == 1, "tempo_esperado"] = 0
-
-        # Remove a coluna de controle
-        df = df.drop(columns="programada")
+        df = self.__adjust_scheduled_stops(df, "performance")
 
         # Ordenar as colunas
         df = df[
@@ -285,42 +356,12 @@ class DataAnalysis:
 
         return df
 
-    def get_repair_data(self) -> pd.DataFrame:
+    def __calc_repair_data(self) -> pd.DataFrame:
         """
-        Calcula o desconto de reparo.
+        Calcula o reparo a partir da tabela base.
         """
 
-        df = self.df_stops
-        df_prod = self.df_prod
-
-        # Dataframe com datas e turnos onde a causa está em not_eff e o tempo é igual a 480
-        mask = (df["causa"].isin(["Sem Produção", "Backup"])) & (df["tempo"] == 480)
-        paradas_programadas = df[mask][
-            ["data_registro", "turno", "linha"]
-        ]  # Para reparos ser np.nan
-
-        # Calcula o desconto de reparo
-        df = self.get_discount(df, self.desc_rep, self.afeta_rep, IndicatorType.REPAIR)
-
-        # Agrupa para ter o valor total de desconto
-        df = (
-            df.groupby(["maquina_id", "linha", "data_registro", "turno"], observed=False)
-            .agg(
-                tempo=("tempo", "sum"),
-                desconto=("desconto", "sum"),
-                afeta=("excedente", "sum"),
-            )
-            .reset_index()
-        )
-
-        # Une os dois dataframes
-        df = pd.merge(df_prod, df, on=["maquina_id", "linha", "data_registro", "turno"], how="left")
-
-        # Lida com valores nulos
-        df = df.fillna(0)
-
-        # Coluna com tempo esperado de produção
-        df = self.__get_expected_production_time(df)
+        df = self.__get_indicator_base(IndicatorType.REPAIR, "afeta")
 
         # Coluna de Reparo
         df["reparo"] = (df["afeta"] / df["tempo_esperado"]).round(2)
@@ -329,18 +370,7 @@ class DataAnalysis:
         df["reparo"] = df["reparo"].replace([np.inf, -np.inf], np.nan).fillna(0)
 
         # ============================ Ajuste Para Paradas Programadas =========================== #
-        # Criar uma coluna de controle em paradas_programadas
-        paradas_programadas["programada"] = True
-
-        # Merge dos dataframes
-        df = pd.merge(df, paradas_programadas, how="left", on=["data_registro", "turno", "linha"])
-
-        # Se a parada for programada, a performance é np.nan
-        df.loc[df["programada"] == 1, "reparo"] = np.nan
-        df.loc[df["programada"] == 1, "tempo_esperado"] = 0
-
-        # Remove a coluna de controle
-        df = df.drop(columns="programada")
+        df = self.__adjust_scheduled_stops(df, "reparo")
 
         # Ordenar as colunas
         df = df[
@@ -360,3 +390,24 @@ class DataAnalysis:
         ]
 
         return df
+
+    def get_eff_data(self) -> pd.DataFrame:
+        """
+        Calcula o desconto de eficiência.
+        """
+
+        return self.__get_indicator(IndicatorType.EFFICIENCY)
+
+    def get_perf_data(self) -> pd.DataFrame:
+        """
+        Calcula o desconto de performance.
+        """
+
+        return self.__get_indicator(IndicatorType.PERFORMANCE)
+
+    def get_repair_data(self) -> pd.DataFrame:
+        """
+        Calcula o desconto de reparo.
+        """
+
+        return self.__get_indicator(IndicatorType.REPAIR)
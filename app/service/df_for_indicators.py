@@ -4,10 +4,11 @@ Data: 31/01/2024
 Este módulo é responsável por criar DataFrames para os indicadores.
 """
 
-import numpy as np
 import pandas as pd
+from helpers.df_schema import drop_categories
 from helpers.my_types import IndicatorType
 from service.data_analysis import DataAnalysis
+from service.indicator_store import IndicatorStore
 
 # cSpell: words eficiencia producao
 
@@ -27,6 +28,7 @@ class DFIndicators:
     Args:
         df_info_ihm (pd.DataFrame): DataFrame com os dados do IHM.
         df_prod (pd.DataFrame, optional): DataFrame com os dados de produção.
+        indicator_store (IndicatorStore, optional): Turnos congelados dos indicadores.
 
     Attributes:
         df_info_ihm (pd.DataFrame): DataFrame com os dados do IHM.
@@ -38,15 +40,21 @@ class DFIndicators:
 
     Methods:
         get_heatmap_data: Retorna os dados do heatmap para o indicador fornecido.
-        get_annotations: Retorna as anotações para os dados do heatmap.
         adjust_df_for_bar_lost: Ajusta o DataFrame fornecido para a perda de barra com base no
             indicador, turno e minutos trabalhados.
     """
 
-    def __init__(self, df_info_ihm: pd.DataFrame, df_prod: pd.DataFrame = pd.DataFrame()):
+    def __init__(
+        self,
+        df_info_ihm: pd.DataFrame,
+        df_prod: pd.DataFrame = pd.DataFrame(),
+        indicator_store: IndicatorStore = None,
+    ):
         self.df_info_ihm = df_info_ihm
         self.df_prod = df_prod
-        self.data_analysis = DataAnalysis(self.df_info_ihm, self.df_prod)
+        self.data_analysis = DataAnalysis(
+            self.df_info_ihm, self.df_prod, indicator_store=indicator_store
+        )
         self.indicator_functions = {
             IndicatorType.EFFICIENCY: self.data_analysis.get_eff_data,
             IndicatorType.PERFORMANCE: self.data_analysis.get_perf_data,
@@ -62,38 +70,56 @@ class DFIndicators:
             IndicatorType.PERFORMANCE: self.data_analysis.not_perf,
             IndicatorType.REPAIR: self.data_analysis.afeta_rep,
         }
+        self.__heatmaps = {}
 
-    def __adjust_heatmap_data(
-        self, indicator: IndicatorType, turn: str = None, main: bool = False
-    ) -> pd.DataFrame:
+    def __get_heatmap_source(self, indicator: IndicatorType) -> pd.DataFrame:
         """
-        Adjusts the heatmap data based on the given indicator, turn, and main flag.
+        Agrupa o indicador uma única vez por data, turno e linha, guardando soma e contagem.
+        As médias de cada heatmap são obtidas somando esses grupos.
 
         Parameters:
-            indicator (IndicatorType): The indicator type to adjust the data for.
-            turn (str, optional): The turn to filter the data for. Defaults to None.
-            main (bool, optional): Flag indicating whether the main grouping should be used.
-            Defaults to False.
+            indicator (IndicatorType): The indicator type.
 
         Returns:
-            pd.DataFrame: The adjusted dataframe with the heatmap data.
+            pd.DataFrame: DataFrame with data_registro, turno, linha, soma and contagem.
         """
 
-        # Dataframe com os dados do indicador
-        df = pd.DataFrame()
-
         # Busca o dataframe de acordo com o indicador
         df = self.indicator_functions[indicator]()
 
-        # Se for indicado um turno, filtra o dataframe
-        if turn:
-            df = df[df["turno"] == turn]
+        # Turno como texto para o índice dos heatmaps
+        df["turno"] = df["turno"].astype(object)
 
-        # Colunas para agrupar o dataframe
-        group_cols = ["data_registro", "turno"] if main else ["data_registro", "linha"]
+        df = (
+            df.groupby(["data_registro", "turno", "linha"])[indicator.value]
+            .agg(soma="sum", contagem="count")
+            .reset_index()
+        )
 
-        # Agrupa o dataframe e calcula a média
-        df = df.groupby(group_cols, observed=False)[indicator.value].mean().reset_index()
+        # As colunas do heatmap são as datas (sem hora)
+        df["data_registro"] = pd.to_datetime(df["data_registro"]).dt.date
+
+        return df
+
+    @staticmethod
+    def __pivot_heatmap(df: pd.DataFrame, index: str, index_values: list = None) -> pd.DataFrame:
+        """
+        Calcula a média por data e index e pivota com todas as datas do mês atual.
+
+        Parameters:
+            df (pd.DataFrame): Source from __get_heatmap_source (already filtered by turn).
+            index (str): Column used as the heatmap rows ("linha" or "turno").
+            index_values (list, optional): Fixed rows of the heatmap. Defaults to the values
+                present in the data.
+
+        Returns:
+            pd.DataFrame: The heatmap dataframe.
+        """
+
+        df = df.groupby(["data_registro", index])[["soma", "contagem"]].sum()
+
+        # Média dos grupos (contagem 0 resulta em NaN, como a média de valores nulos)
+        df = (df["soma"] / df["contagem"]).unstack("data_registro")
 
         # ====================== Garantir Que Todas Datas Estejam Presentes ====================== #
 
@@ -104,37 +130,16 @@ class DFIndicators:
         # Lista com todas as datas do mês atual
         date_range = [date.date() for date in pd.date_range(start_date, end_date, freq="D")]
 
-        # Encontra os valores únicos de turno ou linha e cria um novo index
-        if main:
-            unique_turnos = df["turno"].unique()
-            df.set_index(["data_registro", "turno"], inplace=True)
-            new_index = pd.MultiIndex.from_product(
-                [date_range, unique_turnos], names=["data_registro", "turno"]
-            )
-        else:
-            unique_lines = df["linha"].unique()
-            df.set_index(["data_registro", "linha"], inplace=True)
-            new_index = pd.MultiIndex.from_product(
-                [date_range, unique_lines], names=["data_registro", "linha"]
-            )
-
-        # Reindexa o dataframe
-        df = df.reindex(new_index).reset_index()
-
-        # ================================== Pivotar O Dataframe ================================= #
-
-        # Pivotar o dataframe
-        if main:
-            df = df.pivot(index="turno", columns="data_registro", values=indicator.value)
-            df = df.reindex(["NOT", "MAT", "VES"])
-        else:
-            df = df.pivot(index="linha", columns="data_registro", values=indicator.value)
+        df = df.reindex(index=index_values or df.index, columns=date_range)
+        df.index.name = index
+        df.columns.name = "data_registro"
 
         return df
 
     def get_heatmap_data(self, indicator: IndicatorType) -> tuple:
         """
         Retrieves heatmap data for the given indicator.
+        The five heatmaps are rolled up from a single grouping and memoized per indicator.
 
         Args:
             indicator (IndicatorType): The indicator type to retrieve data for.
@@ -144,84 +149,22 @@ class DFIndicators:
                 - noturno: Heatmap data for the night shift.
                 - matutino: Heatmap data for the morning shift.
                 - vespertino: Heatmap data for the afternoon shift.
+                - total: Heatmap data for all shifts.
                 - main: Heatmap data for the main shift.
         """
 
-        noturno = self.__adjust_heatmap_data(indicator, "NOT")
-        matutino = self.__adjust_heatmap_data(indicator, "MAT")
-        vespertino = self.__adjust_heatmap_data(indicator, "VES")
-        total = self.__adjust_heatmap_data(indicator)
-        main = self.__adjust_heatmap_data(indicator, main=True)
-
-        return noturno, matutino, vespertino, total, main
-
-    @staticmethod
-    def __annotations_list(df: pd.DataFrame) -> list:
-        """
-        Cria uma lista de anotações para o heatmap.
+        if indicator not in self.__heatmaps:
+            source = self.__get_heatmap_source(indicator)
 
-        Args:
-            df (pd.DataFrame): O dataframe com os dados do heatmap.
-
-        Returns:
-            list: Uma lista de anotações para o heatmap.
-        """
-
-        # Inicializa a lista de anotações
-        annotations = []
-
-        # Define a coluna para dia apenas
-        df.columns = pd.to_datetime(df.columns).day
-
-        # Loop sobre as linhas do dataframe
-        for (i, j), value in np.ndenumerate(df.values):
-            # Se o valor for diferente de NaN
-            if not np.isnan(value):
-                # Adiciona a anotação
-                annotations.append(
-                    {
-                        "x": df.columns[j],
-                        "y": df.index[i],
-                        "text": f"{value:.1%}",
-                        "xref": "x",
-                        "yref": "y",
-                        "showarrow": False,
-                        "font": {"size": 10, "color": "white"},
-                    }
-                )
-
-        return annotations
-
-    def get_annotations(self, indicator: IndicatorType) -> tuple:
-        """
-        Retrieves annotations for the heatmap data.
-
-        Args:
-            indicator (IndicatorType): The indicator type to retrieve annotations for.
-
-        Returns:
-            tuple: A tuple containing the annotations for different shifts:
-                - noturno: Annotations for the night shift.
-                - matutino: Annotations for the morning shift.
-                - vespertino: Annotations for the afternoon shift.
-                - main: Annotations for the main shift.
-        """
-
-        noturno, matutino, vespertino, total, main = self.get_heatmap_data(indicator)
+            self.__heatmaps[indicator] = (
+                self.__pivot_heatmap(source[source["turno"] == "NOT"], "linha"),
+                self.__pivot_heatmap(source[source["turno"] == "MAT"], "linha"),
+                self.__pivot_heatmap(source[source["turno"] == "VES"], "linha"),
+                self.__pivot_heatmap(source, "linha"),
+                self.__pivot_heatmap(source, "turno", ["NOT", "MAT", "VES"]),
+            )
 
-        noturno_annotations = self.__annotations_list(noturno)
-        matutino_annotations = self.__annotations_list(matutino)
-        vespertino_annotations = self.__annotations_list(vespertino)
-        total_annotations = self.__annotations_list(total)
-        main_annotations = self.__annotations_list(main)
-
-        return (
-            noturno_annotations,
-            matutino_annotations,
-            vespertino_annotations,
-            total_annotations,
-            main_annotations,
-        )
+        return tuple(df.copy() for df in self.__heatmaps[indicator])
 
     def adjust_df_for_bar_lost(
         self,
@@ -257,6 +200,9 @@ class DFIndicators:
         # Filtra por turno
         df = df[df["turno"] == turn] if turn != "TOT" else df
 
+        # Categorias não aceitam novos valores, os gráficos preenchem os nulos com texto
+        df = drop_categories(df)
+
         # Lidando com paradas de  5 minutos ou menos
         mask = (df["motivo"].isnull()) & (df["tempo"] <= 5)
         columns_to_fill = ["motivo", "problema", "causa"]
@@ -0,0 +1,159 @@
+"""
+Módulo com o motor de regras de desconto dos indicadores.
+
+O vocabulário das colunas motivo, problema e causa é codificado uma única vez (códigos das
+categorias ou factorize) e as regras de desconto e de não afetar o indicador são avaliadas
+apenas sobre os valores únicos, gerando arrays de consulta indexados pelos códigos.
+"""
+
+# cSpell: words excedente
+import numpy as np
+import pandas as pd
+from helpers.my_types import IndicatorType
+
+REASON_COLUMNS = ["motivo", "problema", "causa"]
+
+
+class DiscountRules:
+    """
+    Motor de regras vetorizado para o cálculo de desconto e excedente.
+
+    Args:
+        rules (dict[IndicatorType, tuple[dict[str, int], list[str]]]): Para cada indicador, o
+            dicionário de descontos e a lista do que não afeta (ou afeta, no caso de reparo).
+    """
+
+    def __init__(self, rules: dict[IndicatorType, tuple[dict[str, int], list[str]]]):
+        self.rules = rules
+
+    @staticmethod
+    def __encode(series: pd.Series) -> tuple[np.ndarray, pd.Index]:
+        """
+        Retorna os códigos de cada linha e o vocabulário da coluna. Nulos recebem código -1.
+        """
+
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series.cat.codes.to_numpy(), series.cat.categories
+
+        codes, vocab = pd.factorize(series)
+        return codes, pd.Index(vocab)
+
+    @staticmethod
+    def __compile(
+        vocab: pd.Index, desc_dict: dict[str, int], skip_list: list[str]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Avalia as regras sobre o vocabulário.
+
+        Returns:
+            tuple: Array booleano de skip e array com o índice da última chave de desconto
+            encontrada (-1 se nenhuma). Ambos têm um elemento extra no final para o código -1.
+        """
+
+        skip = np.zeros(len(vocab) + 1, dtype=bool)
+        skip[:-1] = vocab.isin(skip_list)
+
+        # A última chave do dicionário que combina prevalece, como no loop original
+        key_idx = np.full(len(vocab) + 1, -1, dtype=np.int64)
+        text = pd.Series(vocab.astype(str), dtype=object).str
+        for i, key in enumerate(desc_dict):
+            key_idx[:-1][text.contains(key, case=False, regex=False).to_numpy()] = i
+
+        return skip, key_idx
+
+    def __evaluate(
+        self,
+        encoded: list[tuple[np.ndarray, pd.Index]],
+        tempo: np.ndarray,
+        indicator: IndicatorType,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calcula, por linha, se a linha entra no indicador, o desconto e o excedente.
+        """
+
+        desc_dict, skip_list = self.rules[indicator]
+        desc_values = np.array([*desc_dict.values(), 0], dtype=np.int64)
+
+        skip_mask = np.zeros(len(tempo), dtype=bool)
+        key_row = np.full(len(tempo), -1, dtype=np.int64)
+
+        for codes, vocab in encoded:
+            skip, key_idx = self.__compile(vocab, desc_dict, skip_list)
+            skip_mask |= skip[codes]
+            key_row = np.maximum(key_row, key_idx[codes])
+
+        # Caso não afete o indicador o desconto é o tempo (exceto reparo)
+        desconto = np.where(skip_mask & (indicator != IndicatorType.REPAIR), tempo, 0)
+
+        # Desconto de acordo com motivo, problema ou causa
+        desconto = np.where(key_row >= 0, desc_values[key_row], desconto)
+
+        # Caso o desconto seja maior que o tempo, o desconto deve ser igual ao tempo
+        desconto = np.minimum(desconto, tempo)
+
+        # Eficiência usa todas as linhas, performance apenas as que afetam e reparo as que afetam
+        keep = {
+            IndicatorType.EFFICIENCY: np.ones(len(tempo), dtype=bool),
+            IndicatorType.PERFORMANCE: ~skip_mask,
+            IndicatorType.REPAIR: skip_mask,
+        }[indicator]
+
+        return keep, desconto, np.clip(tempo - desconto, 0, None)
+
+    def evaluate(
+        self, df: pd.DataFrame, indicators: list[IndicatorType] = None
+    ) -> dict[IndicatorType, tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Avalia as regras de vários indicadores codificando o vocabulário uma única vez.
+
+        Args:
+            df (pd.DataFrame): DataFrame de paradas com motivo, problema, causa e tempo.
+            indicators (list[IndicatorType], optional): Indicadores. Padrão: todos das regras.
+
+        Returns:
+            dict: Para cada indicador, os arrays keep (linha entra no indicador), desconto e
+            excedente, alinhados com as linhas de df.
+        """
+
+        encoded = [self.__encode(df[col]) for col in REASON_COLUMNS]
+        tempo = df["tempo"].to_numpy()
+
+        return {
+            indicator: self.__evaluate(encoded, tempo, indicator)
+            for indicator in (indicators or self.rules)
+        }
+
+    def get_discount(self, df: pd.DataFrame, indicator: IndicatorType) -> pd.DataFrame:
+        """
+        Calcula o desconto e o excedente para um indicador.
+
+        Args:
+            df (pd.DataFrame): DataFrame de paradas com motivo, problema, causa e tempo.
+            indicator (IndicatorType): O indicador.
+
+        Returns:
+            pd.DataFrame: DataFrame com as colunas desconto e excedente.
+        """
+
+        return self.get_discounts(df, [indicator])[indicator]
+
+    def get_discounts(
+        self, df: pd.DataFrame, indicators: list[IndicatorType] = None
+    ) -> dict[IndicatorType, pd.DataFrame]:
+        """
+        Calcula o desconto e o excedente de vários indicadores codificando o vocabulário uma vez.
+
+        Args:
+            df (pd.DataFrame): DataFrame de paradas com motivo, problema, causa e tempo.
+            indicators (list[IndicatorType], optional): Indicadores. Padrão: todos das regras.
+
+        Returns:
+            dict[IndicatorType, pd.DataFrame]: DataFrame com desconto e excedente por indicador.
+        """
+
+        return {
+            indicator: (
+                df.assign(desconto=desconto, excedente=excedente)[keep].reset_index(drop=True)
+            )
+            for indicator, (keep, desconto, excedente) in self.evaluate(df, indicators).items()
+        }
@@ -0,0 +1,149 @@
+"""
+Módulo com as tabelas de fatos do Protheus salvas no DB local.
+
+Os registros já lidos do Protheus ficam no DB local e em memória. A cada atualização são lidos
+apenas os registros a partir do último registro menos uma janela de releitura, que substitui os
+registros da janela para incluir correções e exclusões tardias. Registros anteriores ao início
+da retenção saem da tabela.
+"""
+
+from threading import Lock
+from typing import Callable
+
+import pandas as pd
+from database.connection_local import ConnectionLocal
+
+# Janela relida a cada atualização, para correções e exclusões feitas depois do apontamento
+RESCAN_WINDOW = pd.Timedelta(hours=24)
+
+
+class FactStore:
+    """
+    Tabela de registros do Protheus com leitura incremental.
+
+    Args:
+        table (str): Tabela do DB local.
+        fetch (Callable): Função de leitura do Protheus. Recebe since (data e hora, ou apenas a
+            data quando a tabela não tem coluna de hora) ou None para ler toda a retenção.
+        date_column (str): Coluna com a data do registro (YYYYMMDD).
+        hour_column (str, optional): Coluna com a hora do registro (HH:MM ou HH:MM:SS). Sem hora
+            a janela é relida por dias inteiros.
+        sort_columns (list[str], optional): Ordem dos registros. Padrão: data e hora.
+        first_day (Callable, optional): Retorna o primeiro dia da retenção (YYYYMMDD). Padrão:
+            sem retenção.
+        rescan_window (pd.Timedelta, optional): Janela relida a cada atualização.
+            Padrão: RESCAN_WINDOW.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        fetch: Callable[[tuple[str, str] | str], pd.DataFrame],
+        date_column: str,
+        hour_column: str = None,
+        sort_columns: list[str] = None,
+        first_day: Callable[[], str] = None,
+        rescan_window: pd.Timedelta = RESCAN_WINDOW,
+    ):
+        self.table = table
+        self.fetch = fetch
+        self.date_column = date_column
+        self.hour_column = hour_column
+        self.sort_columns = sort_columns or [c for c in (date_column, hour_column) if c]
+        self.first_day = first_day or (lambda: "")
+        self.rescan_window = rescan_window
+        self.__df = None
+        self.__lock = Lock()
+
+    def __key(self, df: pd.DataFrame) -> pd.Series:
+        key = df[self.date_column].astype(str)
+
+        if self.hour_column:
+            key = key + df[self.hour_column].astype(str)
+
+        return key
+
+    def __read_local(self) -> pd.DataFrame:
+        with ConnectionLocal() as conn:
+            try:
+                return conn.get_query(f"SELECT * FROM {self.table}")
+            except pd.io.sql.DatabaseError:
+                return pd.DataFrame()
+
+    def __since(self, df: pd.DataFrame) -> tuple[str, str] | str:
+        """
+        Data e hora a partir das quais os dados são relidos: o último registro menos a janela.
+        """
+
+        last = df.iloc[self.__key(df).argmax()]
+        last_date = str(last[self.date_column])
+
+        if not self.hour_column:
+            since = pd.to_datetime(last_date, format="%Y%m%d") - self.rescan_window
+            return since.strftime("%Y%m%d")
+
+        last_hour = str(last[self.hour_column])
+        since = pd.to_datetime(f"{last_date} {last_hour}") - self.rescan_window
+
+        # A hora mantém o formato do Protheus (HH:MM ou HH:MM:SS)
+        return since.strftime("%Y%m%d"), since.strftime("%H:%M:%S")[: len(last_hour)]
+
+    def __save(self, df_new: pd.DataFrame, since: tuple[str, str] | str, first_day: str) -> None:
+        with ConnectionLocal() as conn:
+            if since is None:
+                conn.save_df(df_new, self.table)
+                return
+
+            date_column = self.date_column
+            if self.hour_column:
+                date, hour = since
+                conn.execute(
+                    f"DELETE FROM {self.table} WHERE {date_column} < ? OR {date_column} > ? "
+                    f"OR ({date_column} = ? AND {self.hour_column} >= ?)",
+                    (first_day, date, date, hour),
+                )
+            else:
+                conn.execute(
+                    f"DELETE FROM {self.table} WHERE {date_column} < ? OR {date_column} >= ?",
+                    (first_day, since),
+                )
+            conn.update_db(df_new, self.table)
+
+    def load(self) -> pd.DataFrame:
+        """
+        Atualiza a tabela com os registros novos e retorna os registros da retenção.
+        Se a leitura falhar os dados já carregados são mantidos.
+
+        Returns:
+            pd.DataFrame: Cópia dos registros, como retornados pela leitura do Protheus.
+        """
+
+        with self.__lock:
+            if self.__df is None:
+                self.__df = self.__read_local()
+
+            # Registros anteriores à retenção saem da tabela
+            first_day = self.first_day()
+            df = self.__df
+            if not df.empty:
+                df = df[df[self.date_column].astype(str) >= first_day]
+
+            since = self.__since(df) if not df.empty else None
+
+            df_new = self.fetch(since)
+
+            if df_new is None:
+                return df.copy()
+
+            if since is None:
+                self.__df = df_new
+            else:
+                # Registros da janela são substituídos pelos relidos, na ordem da query
+                start = since if isinstance(since, str) else "".join(since)
+                df = pd.concat([df[self.__key(df) < start], df_new], ignore_index=True)
+                self.__df = df.sort_values(by=self.sort_columns, kind="stable", ignore_index=True)
+
+            self.__save(df_new, since, first_day)
+
+            # Cópia, a limpeza altera o DataFrame recebido
+            return self.__df.copy()
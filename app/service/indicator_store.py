@@ -0,0 +1,239 @@
+"""
+Módulo com a tabela de indicadores do mês salva no DB local.
+
+Os indicadores de turnos já encerrados não mudam, então são congelados no DB local e apenas os
+turnos abertos são recalculados a cada atualização do cache. Uma parada inserida manualmente
+invalida os turnos congelados da linha a partir da data da parada.
+
+Junto com os turnos congelados é salva a impressão dos dados de origem de cada turno (quantidade
+de registros e soma dos hashes das linhas de paradas e de produção). A cada atualização a
+impressão é recalculada e um turno cujos dados mudaram na origem (motivo editado na IHM,
+registros atrasados, uma máquina que chegou depois) volta a ser calculado.
+"""
+
+# cSpell: words eficiencia
+import sqlite3
+from threading import Lock
+
+import numpy as np
+import pandas as pd
+from database.connection_local import ConnectionLocal
+from helpers.df_schema import apply_schema
+from helpers.my_types import IndicatorType
+from helpers.shift_clock import ShiftClock
+
+# Tabela do DB local de cada indicador
+INDICATOR_TABLES = {
+    IndicatorType.EFFICIENCY: "ind_month_eficiencia",
+    IndicatorType.PERFORMANCE: "ind_month_performance",
+    IndicatorType.REPAIR: "ind_month_reparo",
+}
+
+# Colunas que identificam um turno congelado
+FROZEN_KEYS = ["data_registro", "turno", "linha"]
+
+# Tabela do DB local com a impressão dos dados de origem dos turnos congelados
+FINGERPRINT_TABLE = "ind_month_impressao"
+
+# Colunas da impressão (registros e soma dos hashes de paradas e produção)
+FINGERPRINT_COLUMNS = ["paradas_registros", "paradas_hash", "producao_registros", "producao_hash"]
+
+# Tempo após o fim do turno para que ele seja considerado final (apontamentos atrasados)
+FREEZE_DELAY = pd.Timedelta(hours=1)
+
+
+def _frozen_keys(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Chaves dos turnos com tipos simples, iguais nos dados lidos do DB local e nos dados de origem.
+    """
+
+    return pd.DataFrame(
+        {
+            "data_registro": pd.to_datetime(df["data_registro"]).to_numpy(),
+            "turno": df["turno"].astype(str).to_numpy(),
+            "linha": df["linha"].astype(int).to_numpy(),
+        }
+    )
+
+
+def source_fingerprint(df_stops: pd.DataFrame, df_prod: pd.DataFrame) -> pd.DataFrame:
+    """
+    Impressão dos dados de origem de cada turno: quantidade de registros e soma dos hashes das
+    linhas de paradas e de produção. Qualquer registro novo, removido ou alterado muda a
+    impressão do turno.
+
+    Args:
+        df_stops (pd.DataFrame): Paradas com data_registro, turno e linha.
+        df_prod (pd.DataFrame): Produção com data_registro, turno e linha.
+
+    Returns:
+        pd.DataFrame: FROZEN_KEYS e FINGERPRINT_COLUMNS (int64), uma linha por turno.
+    """
+
+    def fingerprint(df: pd.DataFrame, name: str) -> pd.DataFrame:
+        # Hash de cada linha pelo valor (independe da ordem das linhas e do índice), somado como
+        # int64 (com overflow) para ser salvo no DB local
+        hashes = pd.util.hash_pandas_object(df, index=False).to_numpy().view(np.int64)
+
+        return (
+            _frozen_keys(df)
+            .assign(**{f"{name}_registros": 1, f"{name}_hash": hashes})
+            .groupby(FROZEN_KEYS)
+            .sum()
+        )
+
+    stops = fingerprint(df_stops, "paradas")
+    prod = fingerprint(df_prod, "producao")
+
+    # Turnos sem paradas ou sem produção ficam com 0, sem passar por float
+    index = stops.index.union(prod.index)
+    df = pd.concat([stops.reindex(index, fill_value=0), prod.reindex(index, fill_value=0)], axis=1)
+
+    return df[FINGERPRINT_COLUMNS].reset_index()
+
+
+class IndicatorStore:
+    """
+    Tabela de indicadores por data, turno, linha e máquina com os turnos encerrados congelados.
+
+    Args:
+        shift_clock (ShiftClock, optional): Relógio de turnos. Padrão: o relógio do sistema.
+        freeze_delay (pd.Timedelta, optional): Tempo após o fim do turno para congelá-lo.
+            Padrão: FREEZE_DELAY.
+    """
+
+    # Versão das invalidações, usada para não salvar dados lidos antes de uma invalidação
+    version = 0
+    __lock = Lock()
+
+    def __init__(self, shift_clock: ShiftClock = None, freeze_delay: pd.Timedelta = FREEZE_DELAY):
+        self.shift_clock = shift_clock or ShiftClock()
+        self.freeze_delay = freeze_delay
+
+    def __month_start(self) -> pd.Timestamp:
+        return self.shift_clock.now().normalize().replace(day=1)
+
+    @staticmethod
+    def __adjust_types(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Reaplica os tipos perdidos ao salvar no DB local.
+        """
+
+        df["data_registro"] = pd.to_datetime(df["data_registro"])
+        df["hora_registro"] = pd.to_datetime(
+            df["hora_registro"], format="%H:%M:%S.%f", errors="coerce"
+        ).dt.time
+
+        return apply_schema(df)
+
+    def __read_month(self, conn: ConnectionLocal, table: str) -> pd.DataFrame:
+        month_start = self.__month_start().strftime("%Y-%m-%d")
+
+        try:
+            return conn.get_query(f"SELECT * FROM {table} WHERE data_registro >= '{month_start}'")
+        except pd.io.sql.DatabaseError:
+            return pd.DataFrame()
+
+    @staticmethod
+    def __unchanged_keys(stored: pd.DataFrame, current: pd.DataFrame) -> pd.DataFrame:
+        """
+        Turnos cuja impressão salva é igual à impressão atual dos dados de origem.
+        """
+
+        if stored.empty:
+            return pd.DataFrame(columns=FROZEN_KEYS)
+
+        stored = pd.concat([_frozen_keys(stored), stored[FINGERPRINT_COLUMNS]], axis=1)
+        df = stored.merge(current, on=FROZEN_KEYS + FINGERPRINT_COLUMNS, how="inner")
+
+        return df[FROZEN_KEYS]
+
+    def get_frozen(self, fingerprint: pd.DataFrame) -> dict[IndicatorType, pd.DataFrame]:
+        """
+        Lê os indicadores congelados do mês atual. Apenas os turnos cujos dados de origem não
+        mudaram desde que foram congelados são retornados, os demais são recalculados.
+
+        Args:
+            fingerprint (pd.DataFrame): Impressão atual dos dados de origem
+                (source_fingerprint).
+
+        Returns:
+            dict[IndicatorType, pd.DataFrame]: DataFrame congelado de cada indicador. Vazio se
+            ainda não existir a tabela.
+        """
+
+        frozen = {}
+
+        with ConnectionLocal() as conn:
+            keys = self.__unchanged_keys(self.__read_month(conn, FINGERPRINT_TABLE), fingerprint)
+
+            for indicator, table in INDICATOR_TABLES.items():
+                df = self.__read_month(conn, table)
+
+                if not df.empty:
+                    df = self.__adjust_types(df)
+                    mask = _frozen_keys(df).merge(keys, how="left", indicator=True)["_merge"]
+                    df = df[(mask == "both").to_numpy()].reset_index(drop=True)
+
+                frozen[indicator] = df
+
+        # Os três indicadores precisam ter os mesmos turnos congelados
+        if any(df.empty for df in frozen.values()):
+            frozen = {indicator: pd.DataFrame() for indicator in INDICATOR_TABLES}
+
+        return frozen
+
+    def save(
+        self,
+        indicators: dict[IndicatorType, pd.DataFrame],
+        version: int,
+        fingerprint: pd.DataFrame,
+    ) -> None:
+        """
+        Salva os turnos encerrados dos indicadores do mês e a impressão dos seus dados de origem.
+
+        Args:
+            indicators (dict[IndicatorType, pd.DataFrame]): Os DataFrames completos do mês.
+            version (int): A versão lida antes de buscar os dados. Se houve invalidação depois
+                disso os dados estão desatualizados e não são salvos.
+            fingerprint (pd.DataFrame): Impressão dos dados de origem usados no cálculo
+                (source_fingerprint).
+        """
+
+        with self.__lock:
+            if version != IndicatorStore.version:
+                return
+
+            with ConnectionLocal() as conn:
+                closed_keys = []
+                for indicator, df in indicators.items():
+                    closed = self.shift_clock.is_closed(df, self.freeze_delay)
+                    conn.save_df(df[closed], INDICATOR_TABLES[indicator])
+                    closed_keys.append(_frozen_keys(df[closed]))
+
+                keys = pd.concat(closed_keys).drop_duplicates()
+                conn.save_df(fingerprint.merge(keys, on=FROZEN_KEYS), FINGERPRINT_TABLE)
+
+    @classmethod
+    def invalidate(cls, line: int, date: str) -> None:
+        """
+        Remove os turnos congelados da linha a partir da data informada.
+        Usado quando uma parada é inserida retroativamente.
+
+        Args:
+            line (int): A linha da parada.
+            date (str): A data da parada (YYYY-MM-DD).
+        """
+
+        with cls.__lock:
+            cls.version += 1
+
+            with ConnectionLocal() as conn:
+                for table in [*INDICATOR_TABLES.values(), FINGERPRINT_TABLE]:
+                    try:
+                        conn.execute(
+                            f"DELETE FROM {table} WHERE linha = ? AND data_registro >= ?",
+                            (int(line), pd.to_datetime(date).strftime("%Y-%m-%d")),
+                        )
+                    except sqlite3.OperationalError:
+                        continue
@@ -4,7 +4,41 @@
     Módulo para unir os dados de cadastro, info e ocorrência
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
+from helpers.shift_clock import seconds_of_day
+
+# Data e hora nula em nanosegundos (NaT), registros sem data ou hora não entram no join
+NAT = np.iinfo(np.int64).min
+
+# Tolerância padrão entre o registro da info e o apontamento da IHM
+JOIN_TOLERANCE = pd.Timedelta("3 min 30 s")
+
+# Colunas usadas de cada DataFrame
+INFO_COLUMNS = [
+    "fabrica",
+    "linha",
+    "maquina_id",
+    "turno",
+    "status",
+    "contagem_total_ciclos",
+    "contagem_total_produzido",
+    "data_registro",
+    "hora_registro",
+]
+IHM_COLUMNS = [
+    "motivo",
+    "equipamento",
+    "problema",
+    "causa",
+    "os_numero",
+    "operador_id",
+    "data_registro",
+    "hora_registro",
+    "s_backup",
+]
 
 
 class JoinData:
@@ -14,99 +48,182 @@ class JoinData:
     Args:
         df_ihm (pd.DataFrame): The first dataframe to be joined.
         df_info (pd.DataFrame): The second dataframe to be joined.
+        tolerance (pd.Timedelta, optional): Maximum distance between the records.
+            Defaults to JOIN_TOLERANCE.
+        max_workers (int, optional): Number of threads used to join the machines.
+            Defaults to 1 (no threads).
 
     Returns:
         pd.DataFrame: The merged and processed dataframe.
     """
 
-    def __init__(self, df_ihm: pd.DataFrame, df_info: pd.DataFrame) -> None:
+    def __init__(
+        self,
+        df_ihm: pd.DataFrame,
+        df_info: pd.DataFrame,
+        tolerance: pd.Timedelta = JOIN_TOLERANCE,
+        max_workers: int = 1,
+    ) -> None:
         self.df_ihm = df_ihm
         self.df_info = df_info
+        self.tolerance = pd.Timedelta(tolerance).value
+        self.max_workers = max_workers
 
-    def join_data(self) -> pd.DataFrame:
+    @staticmethod
+    def __data_hora(df: pd.DataFrame) -> np.ndarray:
+        """
+        Une data_registro e hora_registro em nanosegundos (int64), NAT se a data ou a hora é
+        nula.
         """
-        Joins two dataframes, df_info and df_ihm, based on the 'data_hora' column.
-        The dataframes are sorted by 'data_hora' before merging.
-        The merge is performed using the 'maquina_id' column as the key.
-        The merge is done using the nearest timestamp within a tolerance of 1 minute and 10 seconds.
-        The resulting dataframe is then reordered and renamed to match the desired column names.
-        Finally, the index is reset and the resulting dataframe is returned.
 
-        Returns:
-            pd.DataFrame: The merged and processed dataframe.
+        data = pd.to_datetime(df["data_registro"]).to_numpy("datetime64[ns]").view(np.int64)
+        seconds = seconds_of_day(df["hora_registro"])
+
+        null = np.isnan(seconds) | (data == NAT)
+        nanos = (np.where(null, 0, seconds) * 1e9).round().astype(np.int64)
+
+        return np.where(null, NAT, data + nanos)
+
+    @staticmethod
+    def __machine_groups(df: pd.DataFrame) -> dict:
+        """
+        Retorna as posições das linhas de cada máquina.
         """
 
-        # Cria coluna com união de data e hora para df_ihm
-        self.df_ihm["data_hora"] = pd.to_datetime(
-            self.df_ihm["data_registro"].astype(str)
-            + " "
-            + self.df_ihm["hora_registro"].astype(str)
-        )
+        return df.groupby("maquina_id", observed=True, sort=False).indices
 
-        # Cria coluna com união de data e hora para df_info
-        self.df_info["data_hora"] = pd.to_datetime(
-            self.df_info["data_registro"].astype(str)
-            + " "
-            + self.df_info["hora_registro"].astype(str)
-        )
+    def __nearest(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """
+        Para cada horário de left encontra a posição do horário mais próximo em right dentro da
+        tolerância (-1 se nenhum). Empate fica com o registro anterior, como no merge_asof.
+        Right deve estar ordenado.
+        """
 
-        # Classifica os dataframes por data_hora
-        self.df_ihm = self.df_ihm.sort_values(by="data_hora")
-        self.df_info = self.df_info.sort_values(by="data_hora")
-
-        # Realiza o merge dos dataframes
-        df = pd.merge_asof(
-            self.df_info,
-            self.df_ihm,
-            on="data_hora",
-            by="maquina_id",
-            direction="nearest",
-            tolerance=pd.Timedelta("3 min 30 s"),
+        # Último registro <= left e primeiro registro >= left
+        backward = np.searchsorted(right, left, side="right") - 1
+        forward = np.searchsorted(right, left, side="left")
+
+        has_backward = backward >= 0
+        has_forward = forward < len(right)
+
+        dist_backward = np.where(has_backward, left - right[np.maximum(backward, 0)], np.inf)
+        dist_forward = np.where(
+            has_forward, right[np.minimum(forward, len(right) - 1)] - left, np.inf
         )
 
-        # Define o tipo para colunas de ciclos e produção
-        df["contagem_total_ciclos"] = df["contagem_total_ciclos"].astype("Int64")
-        df["contagem_total_produzido"] = df["contagem_total_produzido"].astype("Int64")
+        use_forward = dist_forward < dist_backward
+        match = np.where(use_forward, forward, backward)
+        dist = np.where(use_forward, dist_forward, dist_backward)
+
+        return np.where(dist <= self.tolerance, match, -1)
+
+    def __join_machine(
+        self, left_idx: np.ndarray, right_idx: np.ndarray, left_t: np.ndarray, right_t: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Faz o join de uma máquina.
+
+        Returns:
+            tuple: Posições das linhas de info e as posições correspondentes da IHM.
+        """
+
+        # Registros sem data ou hora ficam sem correspondência
+        left_idx = left_idx[left_t[left_idx] != NAT]
+        right_idx = right_idx[right_t[right_idx] != NAT]
+        right_t = right_t[right_idx]
+
+        # Os dados chegam ordenados por máquina e horário, só ordena se necessário
+        if len(right_t) > 1 and (np.diff(right_t) < 0).any():
+            order = np.argsort(right_t, kind="stable")
+            right_idx, right_t = right_idx[order], right_t[order]
 
-        # Reordenar as colunas, mantendo só as necessárias
-        df = df[
-            [
-                "fabrica",
-                "linha_x",
-                "maquina_id",
-                "turno",
-                "status",
-                "contagem_total_ciclos",
-                "contagem_total_produzido",
-                "data_registro_x",
-                "hora_registro_x",
-                "motivo",
-                "equipamento",
-                "problema",
-                "causa",
-                "os_numero",
-                "operador_id",
-                "data_registro_y",
-                "hora_registro_y",
-                "s_backup",
-            ]
+        match = self.__nearest(left_t[left_idx], right_t)
+
+        return left_idx, np.where(match >= 0, right_idx[np.maximum(match, 0)], -1)
+
+    def __get_indexer(self, left_t: np.ndarray, right_t: np.ndarray) -> np.ndarray:
+        """
+        Retorna, para cada linha de info, a posição da linha da IHM correspondente
+        (-1 se não houver).
+        """
+
+        indexer = np.full(len(left_t), -1, dtype=np.int64)
+        right_groups = self.__machine_groups(self.df_ihm)
+
+        jobs = [
+            (left_idx, right_groups[maq])
+            for maq, left_idx in self.__machine_groups(self.df_info).items()
+            if maq in right_groups
         ]
 
-        # Renomear as colunas
-        df = df.rename(
-            columns={
-                "linha_x": "linha",
-                "data_registro_x": "data_registro",
-                "hora_registro_x": "hora_registro",
-                "data_registro_y": "data_registro_ihm",
-                "hora_registro_y": "hora_registro_ihm",
+        def run(job):
+            return self.__join_machine(*job, left_t, right_t)
+
+        if self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(run, jobs))
+        else:
+            results = [run(job) for job in jobs]
+
+        for left_idx, right_idx in results:
+            indexer[left_idx] = right_idx
+
+        return indexer
+
+    def __get_order(self, left_t: np.ndarray) -> np.ndarray | None:
+        """
+        Retorna a ordem das linhas de info por linha, data e hora.
+        None se a info já está ordenada, como sai da limpeza dos dados.
+        """
+
+        linha = self.df_info["linha"].to_numpy(dtype=float, na_value=np.nan)
+
+        same_line = linha[1:] == linha[:-1]
+        if ((linha[1:] > linha[:-1]) | (same_line & (left_t[1:] >= left_t[:-1]))).all():
+            return None
+
+        return np.lexsort((left_t, linha))
+
+    def join_data(self) -> pd.DataFrame:
+        """
+        Joins two dataframes, df_info and df_ihm, based on the 'data_hora' column.
+        Each info record receives the IHM record of the same machine with the nearest timestamp
+        within the tolerance. Only the needed columns are taken from each dataframe and the
+        records are matched per machine, without sorting or copying the full dataframes.
+        The result is ordered by line, date and time and has a fresh index.
+
+        Returns:
+            pd.DataFrame: The merged and processed dataframe.
+        """
+
+        left_t = self.__data_hora(self.df_info)
+        right_t = self.__data_hora(self.df_ihm)
+
+        indexer = self.__get_indexer(left_t, right_t)
+
+        # Ordem final por linha, data e hora
+        order = self.__get_order(left_t)
+        if order is not None:
+            indexer = indexer[order]
+
+        # Monta o DataFrame apenas com as colunas necessárias
+        df = pd.DataFrame(
+            {
+                col: (
+                    self.df_info[col].array
+                    if order is None
+                    else self.df_info[col].array.take(order)
+                )
+                for col in INFO_COLUMNS
             }
         )
 
-        # Reordenar o dataframe
-        df = df.sort_values(by=["linha", "data_registro", "hora_registro"])
+        for col in IHM_COLUMNS:
+            name = f"{col}_ihm" if col in ("data_registro", "hora_registro") else col
+            df[name] = self.df_ihm[col].array.take(indexer, allow_fill=True)
 
-        # Reiniciar o index
-        df = df.reset_index(drop=True)
+        # Define o tipo para colunas de ciclos e produção
+        df["contagem_total_ciclos"] = df["contagem_total_ciclos"].astype("Int64")
+        df["contagem_total_produzido"] = df["contagem_total_produzido"].astype("Int64")
 
         return df
@@ -2,6 +2,7 @@
 
 import numpy as np
 import pandas as pd
+from helpers.discard_normalization import attach_discard
 
 
 class JoinDiscardProduction:
@@ -26,23 +27,16 @@ class JoinDiscardProduction:
         self.df_quality.data_registro = pd.to_datetime(self.df_quality.data_registro)
         self.df_production.data_registro = pd.to_datetime(self.df_production.data_registro)
 
-        # Classifica os DataFrames
-        self.df_quality = self.df_quality.sort_values(by="data_registro")
-        self.df_production = self.df_production.sort_values(by="data_registro")
-
-        # Junta os DataFrames pela data e turno
-        df = pd.merge(
-            self.df_production,
-            self.df_quality,
-            on=["linha", "maquina_id", "data_registro", "turno"],
-            how="left",
-        )
+        # Junta as bandejas descartadas pela data e turno (turnos sem descarte ficam com 0)
+        df = attach_discard(self.df_production, self.df_quality)
 
         # Renomear coluna total produzido
         df = df.rename(columns={"total_produzido": "total_produzido_sensor"})
 
-        # Preencher valores nulos
-        df = df.fillna(0)
+        # Preencher valores nulos apenas nos contadores que tiverem
+        for column in ["total_ciclos", "total_produzido_sensor"]:
+            if df[column].hasnans:
+                df[column] = df[column].fillna(0)
 
         # Calcula produção total
         mask = (df.total_ciclos - df.total_produzido_sensor) < 500
@@ -50,8 +44,11 @@ class JoinDiscardProduction:
         sensor = df.total_produzido_sensor - df.bdj_retrabalho
         df["total_produzido"] = np.where(mask, sensor, ciclos)
 
-        # Ordenar os valores
-        df = df.sort_values(by=["data_registro", "turno", "linha"])
+        # Ordenar os valores (turno em ordem alfabética, não na ordem das categorias)
+        df = df.sort_values(
+            by=["data_registro", "turno", "linha"],
+            key=lambda col: col.astype(str) if col.name == "turno" else col,
+        )
 
         # Reordenar as colunas
         df = df[
@@ -70,10 +67,8 @@ class JoinDiscardProduction:
             ]
         ]
 
-        # Definir como int
-        df.total_produzido = df.total_produzido.astype(int)
-        df.total_produzido_sensor = df.total_produzido_sensor.astype(int)
-        df.bdj_vazias = df.bdj_vazias.astype(int)
-        df.bdj_retrabalho = df.bdj_retrabalho.astype(int)
+        # Definir como int (contadores cabem em int32)
+        df.total_produzido = df.total_produzido.astype("int32")
+        df.total_produzido_sensor = df.total_produzido_sensor.astype("int32")
 
         return df
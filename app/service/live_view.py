@@ -0,0 +1,158 @@
+"""
+Módulo com os dados do painel ao vivo (maquina_tela).
+
+Os dados de cada linha são reduzidos a um vetor compacto com o texto e a cor de cada campo. O
+layout dos cards é montado apenas quando as linhas mudam e o navegador atualiza somente as
+células que mudaram (assets/grafana.js).
+
+A tabela é lida por um único poller no servidor (LiveSnapshot), agendado no scheduler principal.
+Os clientes apenas leem o snapshot compartilhado, assim a carga no banco não depende do número
+de navegadores abertos.
+"""
+
+# cSpell: words eficiencia produto
+import logging
+import os
+from threading import Lock
+from time import time
+
+import numpy as np
+import pandas as pd
+from database.get_data import GetData
+from helpers.color_scale import value_colors
+
+# Campos exibidos por linha, na ordem do vetor
+LIVE_FIELDS = [
+    "status",
+    "produto",
+    "eficiencia_15min",
+    "ciclos",
+    "producao",
+    "eficiencia",
+    "tempo_parada",
+    "parada",
+]
+
+# Campos com tooltip (o texto completo aparece no tooltip)
+TOOLTIP_FIELDS = ["produto", "parada"]
+
+# Ciclos esperados em 15 minutos e produção esperada no turno
+CICLOS_15_MIN = 150
+PRODUCAO_TURNO = 7200
+
+# Tempo de parada máximo para exibir em verde
+TEMPO_PARADA_OK = 20
+
+# Intervalo de leitura da maquina_tela em segundos (configurável pela variável de ambiente)
+LIVE_POLL_SECONDS = int(os.getenv("LIVE_POLL_SECONDS", "30"))
+
+
+def _int_text(values: np.ndarray, suffix: str = "") -> np.ndarray:
+    return np.char.add(np.round(values).astype(int).astype(str), suffix)
+
+
+def build_live_vector(df: pd.DataFrame) -> dict:
+    """
+    Monta o vetor do painel ao vivo.
+
+    Args:
+        df (pd.DataFrame): Dados da tabela maquina_tela.
+
+    Returns:
+        dict: Dicionário com campos (nomes dos campos), linhas (número de cada linha), textos,
+        cores e tooltips, com uma lista por linha na ordem dos campos.
+    """
+
+    df = df[df["linha"] != 0].sort_values(by="linha")
+
+    running = (df["status"] == "true").to_numpy()
+    eff_15_min = np.round(df["ciclo_15_min"].astype(float).to_numpy() / CICLOS_15_MIN * 100)
+    ciclos = np.round(df["ciclo_1_min"].astype(float).to_numpy() * 10)
+    producao = df["total_produzido"].astype(float).to_numpy()
+    eficiencia = df["eficiencia"].astype(float).to_numpy()
+    tempo_parada = df["tempo_parada"].astype(float).to_numpy()
+    produto = df["produto_nome"].astype(str).to_numpy()
+    parada = df["parada_nome"].astype(str).to_numpy()
+
+    texts = pd.DataFrame(
+        {
+            "status": np.where(running, "Rodando", "Parada"),
+            "produto": produto,
+            "eficiencia_15min": _int_text(eff_15_min, "%"),
+            "ciclos": _int_text(ciclos, "%"),
+            "producao": _int_text(producao),
+            "eficiencia": _int_text(eficiencia, "%"),
+            "tempo_parada": _int_text(tempo_parada),
+            "parada": np.char.upper(parada.astype(str)),
+        }
+    )
+
+    colors = pd.DataFrame(
+        {
+            "status": np.where(running, "green", "red"),
+            "produto": None,
+            "eficiencia_15min": value_colors(eff_15_min, 100),
+            "ciclos": value_colors(ciclos, 100),
+            "producao": value_colors(producao, PRODUCAO_TURNO),
+            "eficiencia": value_colors(eficiencia, 100),
+            "tempo_parada": np.where(tempo_parada < TEMPO_PARADA_OK, "green", "red"),
+            "parada": None,
+        }
+    )
+
+    tooltips = pd.DataFrame({"produto": produto, "parada": parada})
+
+    return {
+        "campos": LIVE_FIELDS,
+        "linhas": df["linha"].astype(int).tolist(),
+        "textos": texts[LIVE_FIELDS].astype(object).to_numpy().tolist(),
+        "cores": colors[LIVE_FIELDS].astype(object).to_numpy().tolist(),
+        "tooltips": tooltips[TOOLTIP_FIELDS].astype(object).to_numpy().tolist(),
+    }
+
+
+class LiveSnapshot:
+    """
+    Snapshot compartilhado do painel ao vivo.
+
+    O poller (refresh) lê a maquina_tela uma vez por intervalo e guarda o vetor do painel com
+    uma versão. Os callbacks dos clientes leem apenas o snapshot em memória.
+    """
+
+    def __init__(self):
+        self.__get_data = GetData()
+        self.__lock = Lock()
+        self.__snapshot = None
+
+    def refresh(self) -> None:
+        """
+        Lê a maquina_tela e atualiza o snapshot.
+        Em caso de erro o snapshot anterior é mantido.
+        """
+
+        try:
+            data = build_live_vector(self.__get_data.get_maq_tela())
+        # pylint: disable=W0718
+        except Exception as err:
+            logging.error("Erro ao atualizar o painel ao vivo: %s", err)
+            return
+
+        data["versao"] = time()
+
+        with self.__lock:
+            self.__snapshot = data
+
+    def get(self) -> dict | None:
+        """
+        Retorna o snapshot atual. Na primeira chamada, antes do primeiro ciclo do poller, faz a
+        leitura imediatamente.
+        """
+
+        if self.__snapshot is None:
+            self.refresh()
+
+        with self.__lock:
+            return self.__snapshot
+
+
+live_snapshot = LiveSnapshot()
@@ -7,7 +7,9 @@ import warnings
 
 import numpy as np
 import pandas as pd
+from helpers.df_schema import apply_schema
 from helpers.my_types import TEMPO_AJUSTE
+from helpers.shift_clock import ShiftClock, shift_calendar
 
 warnings.simplefilter(action="ignore", category=FutureWarning)
 
@@ -18,10 +20,13 @@ class ServiceInfoIHM:
 
     Args:
         df (pd.DataFrame): The input DataFrame containing machine information.
+        shift_clock (ShiftClock, optional): Clock used for the current shift.
+            Defaults to the system clock.
     """
 
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, shift_clock: ShiftClock = None):
         self.df = df
+        self.shift_clock = shift_clock or ShiftClock()
 
     @staticmethod
     def __identify_changes(df: pd.DataFrame, column: str) -> pd.Series:
@@ -66,8 +71,7 @@ class ServiceInfoIHM:
 
         return df
 
-    @staticmethod
-    def __group_and_calc_time(df: pd.DataFrame) -> pd.DataFrame:
+    def __group_and_calc_time(self, df: pd.DataFrame) -> pd.DataFrame:
         # Agrupa as mudanças
         df = (
             df.groupby(["group"])
@@ -111,50 +115,30 @@ class ServiceInfoIHM:
         )
 
         # =============== Atualização Para Hora Final No Caso De Mudança De Turno =============== #
-        # Dicionário com o horário de término de cada turno
-        turno_end_time = {
-            "NOT": pd.to_timedelta("08:01:00"),
-            "MAT": pd.to_timedelta("16:01:00"),
-            "VES": pd.to_timedelta("00:01:00"),
-        }
-
-        # Nova coluna com o horário de término do turno
-        df["turno_end_time"] = df["turno"].map(turno_end_time)
+        # Horário de término do turno (com 1 minuto de tolerância)
+        turno_end = shift_calendar(df["data_hora"], df["turno"])["fim_turno"] + pd.Timedelta("1m")
 
         # Determina a data e hora atual
-        now = pd.Timestamp.now()
+        now = self.shift_clock.now()
 
         # Nova coluna para indicar se a data é a mesma do dia atual
         df["is_today"] = pd.to_datetime(df["data_hora"]).dt.date == now.date()
 
         # Determina o turno atual com base na hora atual
-        if now.hour in range(0, 8):
-            current_shift = "NOT"
-        elif now.hour in range(8, 16):
-            current_shift = "MAT"
-        else:
-            current_shift = "VES"
+        current_shift = self.shift_clock.shift_of(now)
 
         # Atualiza a hora final caso haja mudança de turno e o turno não seja o turno atual
         mask = (df["turno"] != df["turno"].shift(-1)) & ~(
             (df["is_today"]) & (df["turno"] == current_shift)
         )
 
-        df["data_hora_final"] = np.where(
-            mask & (df["turno"] == "VES"),
-            (df["data_hora"].dt.normalize() + pd.DateOffset(days=1)) + df["turno_end_time"],
-            np.where(
-                mask,
-                df["data_hora"].dt.normalize() + df["turno_end_time"],
-                df["data_hora_final"],
-            ),
-        )
+        df["data_hora_final"] = np.where(mask, turno_end, df["data_hora_final"])
 
         # Se a data_hora_final for nula, atualiza com a data_hora + 1 minuto
         df["data_hora_final"] = df["data_hora_final"].fillna(df["data_hora"] + pd.Timedelta("1m"))
 
         # Remove coluna auxiliar
-        df = df.drop(columns=["turno_end_time", "is_today"])
+        df = df.drop(columns=["is_today"])
 
         # Caso a data_hora_final seja nula, remove a linha
         df = df.dropna(subset=["data_hora_final"]).reset_index(drop=True)
@@ -284,6 +268,9 @@ class ServiceInfoIHM:
             ]
         )
 
+        # O status volta como texto após os np.where, reaplica os tipos compactos
+        df_joined = apply_schema(df_joined)
+
         return df_joined
 
     def get_time_working(self, df: pd.DataFrame) -> pd.Series:
@@ -302,7 +289,7 @@ class ServiceInfoIHM:
 
         # Agrupa por máquina e turno
         df = (
-            df.groupby(["maquina_id", "linha", "turno", "data_registro", "status"], observed=False)[
+            df.groupby(["maquina_id", "linha", "turno", "data_registro", "status"], observed=True)[
                 "tempo"
             ]
             .sum()
@@ -0,0 +1,180 @@
+"""
+Testes das tabelas de fatos do Protheus com leitura incremental.
+"""
+
+import pandas as pd
+import pytest
+from database.connection_local import ConnectionLocal
+from pcp.backend.pcp_fact_store import PcpFactStore
+from service.fact_store import FactStore
+
+TABLE = "test_batidas"
+WINDOW = pd.Timedelta(hours=2)
+
+
+@pytest.fixture(autouse=True)
+def local_db(tmp_path, monkeypatch):
+    monkeypatch.setattr("database.connection_local.DB_LOCAL", str(tmp_path / "local.db"))
+
+
+class FakeProtheus:
+    """
+    Leitura do Protheus sobre um DataFrame, com os filtros da query (since ou retenção).
+    """
+
+    def __init__(self, df: pd.DataFrame, first_day: str = "00000000"):
+        self.df = df
+        self.first_day = first_day
+        self.calls = []
+        self.fail = False
+
+    def fetch(self, since: tuple[str, str] = None) -> pd.DataFrame | None:
+        self.calls.append(since)
+
+        if self.fail:
+            return None
+
+        key = self.df["Data_Registro"] + self.df["Hora_Registro"]
+        start = self.first_day if since is None else "".join(since)
+
+        return self.df[key >= start].reset_index(drop=True)
+
+
+def batidas(rows: list[tuple[str, str, str, float]]) -> pd.DataFrame:
+    return pd.DataFrame(
+        rows, columns=["Data_Registro", "Codigo_Maquina", "Hora_Registro", "Quantidade"]
+    )
+
+
+ROWS = [
+    ("20240101", "AMS001", "08:00:00", 153.0),
+    ("20240101", "AMS001", "12:00:00", 153.0),
+    ("20240102", "AMS001", "08:00:00", 77.0),
+    ("20240102", "AMS001", "09:00:00", 153.0),
+]
+
+
+def make_store(protheus: FakeProtheus, first_day: str = "") -> FactStore:
+    return FactStore(
+        TABLE,
+        protheus.fetch,
+        date_column="Data_Registro",
+        hour_column="Hora_Registro",
+        sort_columns=["Data_Registro", "Codigo_Maquina", "Hora_Registro"],
+        first_day=lambda: first_day,
+        rescan_window=WINDOW,
+    )
+
+
+def read_local() -> pd.DataFrame:
+    with ConnectionLocal() as conn:
+        df = conn.get_query(f"SELECT * FROM {TABLE}")
+
+    return df.sort_values(by=["Data_Registro", "Hora_Registro"], ignore_index=True)
+
+
+def test_first_load_reads_everything_and_saves_locally():
+    protheus = FakeProtheus(batidas(ROWS))
+
+    df = make_store(protheus).load()
+
+    assert protheus.calls == [None]
+    pd.testing.assert_frame_equal(df, batidas(ROWS))
+    pd.testing.assert_frame_equal(read_local(), batidas(ROWS))
+
+
+def test_next_load_starts_from_the_watermark_minus_the_window():
+    protheus = FakeProtheus(batidas(ROWS))
+    make_store(protheus).load()
+
+    # Nova instância: os dados vêm do DB local e apenas a janela é relida
+    make_store(protheus).load()
+
+    assert protheus.calls[-1] == ("20240102", "07:00:00")
+
+
+def test_incremental_load_applies_corrections_and_deletions_in_the_window():
+    protheus = FakeProtheus(batidas(ROWS))
+    store = make_store(protheus)
+    store.load()
+
+    # Correção e exclusão dentro da janela e uma batida nova
+    protheus.df = batidas(
+        [
+            ROWS[0],
+            ROWS[1],
+            ("20240102", "AMS001", "08:00:00", 118.0),
+            ("20240102", "AMS001", "10:00:00", 153.0),
+        ]
+    )
+
+    df = store.load()
+
+    pd.testing.assert_frame_equal(df, protheus.df)
+    pd.testing.assert_frame_equal(read_local(), protheus.df)
+
+
+def test_rows_before_the_window_are_not_reread():
+    protheus = FakeProtheus(batidas(ROWS))
+    store = make_store(protheus)
+    store.load()
+
+    # Alteração fora da janela não é relida
+    changed = batidas(ROWS)
+    changed.loc[0, "Quantidade"] = 0.0
+    protheus.df = changed
+
+    df = store.load()
+
+    assert df.loc[0, "Quantidade"] == 153.0
+
+
+def test_rows_before_retention_are_pruned():
+    protheus = FakeProtheus(batidas(ROWS))
+    make_store(protheus).load()
+
+    df = make_store(protheus, first_day="20240102").load()
+
+    pd.testing.assert_frame_equal(df, batidas(ROWS[2:]))
+    pd.testing.assert_frame_equal(read_local(), batidas(ROWS[2:]))
+
+
+def test_failed_fetch_keeps_the_loaded_data():
+    protheus = FakeProtheus(batidas(ROWS))
+    store = make_store(protheus)
+    store.load()
+
+    protheus.fail = True
+    df = store.load()
+
+    pd.testing.assert_frame_equal(df, batidas(ROWS))
+    pd.testing.assert_frame_equal(read_local(), batidas(ROWS))
+
+
+def test_failed_first_fetch_returns_empty():
+    protheus = FakeProtheus(batidas(ROWS))
+    protheus.fail = True
+
+    assert make_store(protheus).load().empty
+
+
+def test_load_returns_a_copy():
+    protheus = FakeProtheus(batidas(ROWS))
+    store = make_store(protheus)
+
+    store.load()["Quantidade"] = 0.0
+
+    protheus.fail = True
+    assert (store.load()["Quantidade"] > 0).all()
+
+
+def test_pcp_store_prunes_rows_before_the_semester(monkeypatch):
+    protheus = FakeProtheus(batidas(ROWS))
+    make_store(protheus).load()
+
+    monkeypatch.setattr("pcp.backend.pcp_fact_store.semester_start", lambda: "20240102")
+    df = PcpFactStore(TABLE, protheus.fetch, rescan_window=WINDOW).load()
+
+    pd.testing.assert_frame_equal(df, batidas(ROWS[2:]))
+    pd.testing.assert_frame_equal(read_local(), batidas(ROWS[2:]))
+    assert protheus.calls[-1] == ("20240102", "07:00:00")
@@ -0,0 +1,135 @@
+"""
+Testes dos indicadores do mês congelados no DB local.
+"""
+
+from datetime import datetime, time
+
+import pandas as pd
+import pytest
+from helpers.my_types import IndicatorType
+from helpers.shift_clock import ShiftClock
+from service.indicator_store import IndicatorStore, source_fingerprint
+
+# Agora dos testes: o MAT de 10/01 está aberto, os turnos de 09/01 estão encerrados
+NOW = datetime(2024, 1, 10, 12, 0)
+
+
+@pytest.fixture(autouse=True)
+def local_db(tmp_path, monkeypatch):
+    monkeypatch.setattr("database.connection_local.DB_LOCAL", str(tmp_path / "local.db"))
+
+
+def make_indicator(keys: list[tuple[str, str, int]]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "maquina_id": [f"TMF{linha:03d}" for _, _, linha in keys],
+            "linha": [linha for _, _, linha in keys],
+            "data_registro": pd.to_datetime([data for data, _, _ in keys]),
+            "hora_registro": time(8, 0),
+            "turno": [turno for _, turno, _ in keys],
+            "valor": 0.5,
+        }
+    )
+
+
+def make_source(keys: list[tuple[str, str, int]], causa: str = "Ajustes") -> pd.DataFrame:
+    df = make_indicator(keys).drop(columns="valor")
+    df["causa"] = causa
+    return df
+
+
+KEYS = [
+    ("2024-01-09", "MAT", 1),
+    ("2024-01-09", "MAT", 2),
+    ("2024-01-10", "MAT", 1),
+]
+
+
+def save(store: IndicatorStore, df_stops: pd.DataFrame, df_prod: pd.DataFrame) -> None:
+    df = make_indicator(KEYS)
+    store.save(
+        {indicator: df for indicator in IndicatorType},
+        IndicatorStore.version,
+        source_fingerprint(df_stops, df_prod),
+    )
+
+
+def frozen_keys(frozen: dict[IndicatorType, pd.DataFrame]) -> list[tuple]:
+    df = frozen[IndicatorType.EFFICIENCY]
+    if df.empty:
+        return []
+    return sorted(
+        zip(df["data_registro"].dt.strftime("%Y-%m-%d"), df["turno"].astype(str), df["linha"])
+    )
+
+
+def test_closed_shifts_are_frozen():
+    store = IndicatorStore(ShiftClock(lambda: NOW))
+    df_stops, df_prod = make_source(KEYS), make_source(KEYS)
+    save(store, df_stops, df_prod)
+
+    frozen = store.get_frozen(source_fingerprint(df_stops, df_prod))
+
+    assert frozen_keys(frozen) == [("2024-01-09", "MAT", 1), ("2024-01-09", "MAT", 2)]
+    assert frozen[IndicatorType.EFFICIENCY]["hora_registro"].iloc[0] == time(8, 0)
+
+
+def test_shift_within_freeze_delay_is_not_frozen():
+    store = IndicatorStore(ShiftClock(lambda: datetime(2024, 1, 9, 16, 30)))
+    df_stops, df_prod = make_source(KEYS), make_source(KEYS)
+    save(store, df_stops, df_prod)
+
+    assert not frozen_keys(store.get_frozen(source_fingerprint(df_stops, df_prod)))
+
+
+def test_edited_stop_reason_unfreezes_the_shift():
+    store = IndicatorStore(ShiftClock(lambda: NOW))
+    df_stops, df_prod = make_source(KEYS), make_source(KEYS)
+    save(store, df_stops, df_prod)
+
+    df_stops.loc[1, "causa"] = "Manutenção"
+
+    frozen = store.get_frozen(source_fingerprint(df_stops, df_prod))
+
+    assert frozen_keys(frozen) == [("2024-01-09", "MAT", 1)]
+
+
+def test_late_rows_unfreeze_the_shift():
+    store = IndicatorStore(ShiftClock(lambda: NOW))
+    df_stops, df_prod = make_source(KEYS), make_source(KEYS)
+    save(store, df_stops, df_prod)
+
+    # Registro de uma máquina que chegou depois do turno congelado
+    late = make_source([("2024-01-09", "MAT", 2)])
+    df_prod = pd.concat([df_prod, late], ignore_index=True)
+
+    frozen = store.get_frozen(source_fingerprint(df_stops, df_prod))
+
+    assert frozen_keys(frozen) == [("2024-01-09", "MAT", 1)]
+
+
+def test_invalidate_removes_the_line_from_the_date():
+    store = IndicatorStore(ShiftClock(lambda: NOW))
+    df_stops, df_prod = make_source(KEYS), make_source(KEYS)
+    save(store, df_stops, df_prod)
+
+    IndicatorStore.invalidate(1, "2024-01-09")
+
+    frozen = store.get_frozen(source_fingerprint(df_stops, df_prod))
+
+    assert frozen_keys(frozen) == [("2024-01-09", "MAT", 2)]
+
+
+def test_save_after_invalidate_is_ignored():
+    store = IndicatorStore(ShiftClock(lambda: NOW))
+    df_stops, df_prod = make_source(KEYS), make_source(KEYS)
+    version = IndicatorStore.version
+
+    IndicatorStore.invalidate(1, "2024-01-09")
+    store.save(
+        {indicator: make_indicator(KEYS) for indicator in IndicatorType},
+        version,
+        source_fingerprint(df_stops, df_prod),
+    )
+
+    assert not frozen_keys(store.get_frozen(source_fingerprint(df_stops, df_prod)))
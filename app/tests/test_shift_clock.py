@@ -0,0 +1,150 @@
+"""
+Testes do calendário de turnos.
+"""
+
+from datetime import datetime, time
+
+import numpy as np
+import pandas as pd
+from helpers.discard_normalization import normalize_discard
+from helpers.shift_clock import (
+    ShiftClock,
+    seconds_of_day,
+    shift_calendar,
+    shift_of_seconds,
+    week_calendar,
+)
+from pcp.backend.clean_pcp_data import CleanPcpData
+from service.join_data import JoinData
+
+
+def test_seconds_of_day_null_time_is_nan():
+    seconds = seconds_of_day(pd.Series(["08:00:00", None, "17:00:00"]))
+
+    np.testing.assert_array_equal(seconds, [28800, np.nan, 61200])
+
+
+def test_seconds_of_day_all_null():
+    seconds = seconds_of_day(pd.Series([None, None], dtype=object))
+
+    assert np.isnan(seconds).all()
+
+
+def test_shift_of_seconds_null_time_has_no_shift():
+    turno = shift_of_seconds(np.array([0, 28800, np.nan, 61200]))
+
+    assert list(turno) == ["NOT", "MAT", None, "VES"]
+
+
+def test_pcp_last_second_of_the_day_is_not():
+    df = pd.DataFrame(
+        {
+            "Data_Registro": ["20240102", "20240102", "20240102"],
+            "Hora_Registro": ["16:00:00", "23:59:58", "23:59:59"],
+        }
+    )
+
+    df = getattr(CleanPcpData, "_CleanPcpData__parse_registro")(df)
+
+    assert list(df["Turno"]) == ["VES", "VES", "NOT"]
+    assert df["Data_Registro"].iloc[2] == pd.Timestamp("2024-01-02")
+
+
+def test_shift_calendar_null_time():
+    data_hora = pd.Series(pd.to_datetime(["2024-01-02 09:00", None]))
+
+    df = shift_calendar(data_hora)
+
+    assert df["turno"].iloc[0] == "MAT"
+    assert pd.isna(df["turno"].iloc[1])
+    assert pd.isna(df["data_producao"].iloc[1])
+
+
+def test_normalize_discard_drops_null_time():
+    df = pd.DataFrame(
+        {
+            "linha": [1, 1],
+            "maquina_id": ["TMF001", "TMF001"],
+            "data_registro": pd.to_datetime(["2024-01-02", "2024-01-02"]),
+            "hora_registro": ["17:00:00", None],
+            "bdj_vazias": [0.0, 5.0],
+            "bdj_retrabalho": [0.0, 0.0],
+            "descarte_paes_pasta": [1.0, 1.0],
+            "descarte_paes": [0.0, 0.0],
+            "descarte_pasta": [0.0, 0.0],
+        }
+    )
+
+    df_discard = normalize_discard(df)
+
+    assert list(df_discard["turno"]) == ["VES"]
+    assert df_discard["descarte_paes_pasta"].iloc[0] == 1.0
+
+
+def test_join_data_null_time_has_no_match():
+    df_info = pd.DataFrame(
+        {
+            "fabrica": 1,
+            "linha": [1, 1],
+            "maquina_id": "TMF001",
+            "turno": "MAT",
+            "status": "true",
+            "contagem_total_ciclos": [10, 20],
+            "contagem_total_produzido": [9, 18],
+            "data_registro": pd.to_datetime(["2024-01-02", "2024-01-02"]),
+            "hora_registro": [None, time(9, 0)],
+        }
+    )
+    df_ihm = pd.DataFrame(
+        {
+            "maquina_id": "TMF001",
+            "motivo": ["Ajustes", "Refeição"],
+            "equipamento": None,
+            "problema": ["a", "b"],
+            "causa": ["a", "b"],
+            "os_numero": None,
+            "operador_id": ["1", "2"],
+            "data_registro": pd.to_datetime(["2024-01-02", "2024-01-02"]),
+            "hora_registro": [time(9, 1), None],
+            "s_backup": None,
+        }
+    )
+
+    df = JoinData(df_ihm, df_info).join_data()
+
+    assert pd.isna(df["motivo"].iloc[0])
+    assert df["motivo"].iloc[1] == "Ajustes"
+
+
+def test_week_calendar_null_date_has_no_week():
+    dates = pd.Series(pd.to_datetime(["2026-01-05", None, "2026-03-10"]), index=[10, 11, 12])
+
+    df = week_calendar(dates)
+
+    assert list(df.index) == [10, 11, 12]
+    assert df["week"].iloc[0] == 1
+    assert df.iloc[1].isna().all()
+    assert df["Data_Semana"].iloc[2] == pd.Timestamp("2026-03-08")
+
+
+def test_week_calendar_null_text_date_is_dropped_by_groupby():
+    dates = pd.Series(["20260105", None, "20260106"])
+
+    df = pd.concat([pd.DataFrame({"QTD": [1, 2, 3]}), week_calendar(dates, "%Y%m%d")], axis=1)
+
+    assert df.groupby(["year", "week", "Data_Semana"])["QTD"].sum().tolist() == [4]
+
+
+def test_expected_production_time():
+    df = pd.DataFrame(
+        {
+            "data_registro": pd.to_datetime(["2024-01-10"] * 3 + ["2024-01-09"]),
+            "turno": ["NOT", "MAT", "VES", "VES"],
+            "desconto": [0, 10, 10, 10],
+        }
+    )
+
+    # Às 10:30 o NOT já terminou, o MAT está aberto e o VES ainda não começou
+    expected = ShiftClock(lambda: datetime(2024, 1, 10, 10, 30)).expected_production_time(df)
+
+    np.testing.assert_array_equal(expected, [480, 140, 470, 470])